@@ -0,0 +1,488 @@
+"""
+CSS/JS minification and precompressed static asset bundles
+
+minify_css and minify_js are small tokenizers: strings, comments, url(),
+template literals and regex literals are recognised as whole tokens so their
+contents are never touched, and whitespace is only dropped where removing it
+cannot join two tokens or change where JavaScript inserts semicolons.
+
+build_assets minifies every .css/.js file under ASSET_SOURCE_DIR into
+ASSET_OUTPUT_DIR with a content hash in the filename, plus .gz and (when the
+brotli package is installed) .br variants, and writes a manifest.json mapping
+source paths to the hashed files. PrecompressedStaticFiles serves that
+directory and picks the precompressed file the client's Accept-Encoding
+allows. Run `python -m app.assets` to build from the command line.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli not installed; only .gz variants are produced
+    brotli = None
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _resolve_dir(value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else (BACKEND_DIR / path).resolve()
+
+
+ASSET_SOURCE_DIR = _resolve_dir(os.getenv("ASSET_SOURCE_DIR", "static/src"))
+ASSET_OUTPUT_DIR = _resolve_dir(os.getenv("ASSET_OUTPUT_DIR", "static/assets"))
+ASSET_PUBLIC_PREFIX = os.getenv("ASSET_PUBLIC_PREFIX", "/static/assets").rstrip("/")
+# Files smaller than this are not worth a compressed copy
+ASSET_COMPRESS_MIN_BYTES = int(os.getenv("ASSET_COMPRESS_MIN_BYTES", "256"))
+
+ASSET_EXTENSIONS = {".css", ".js"}
+# Preferred order when a client accepts several encodings
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+# ============================================================================
+# CSS
+# ============================================================================
+
+# Whitespace around these never matters in CSS
+_CSS_TIGHT = set("{};,>~")
+_CSS_TOKEN = re.compile(
+    r"""
+    (?P<comment>/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+  | (?P<url>url\(\s*(?:[^)'"\s\\]|\\.)*\s*\))
+  | (?P<space>\s+)
+  | (?P<other>[^\s"'/{};,>~:]+|[{};,>~:/])
+    """,
+    re.S | re.X | re.I
+)
+
+
+def minify_css(css: str) -> str:
+    """Minify a stylesheet; /*! ... */ license comments are kept"""
+    out: List[str] = []
+    pending_space = False
+    for match in _CSS_TOKEN.finditer(css):
+        kind, text = match.lastgroup, match.group()
+        if kind == "space":
+            pending_space = True
+            continue
+        if kind == "comment":
+            if text.startswith("/*!"):
+                out.append(text)
+            # A comment separates tokens like whitespace does
+            pending_space = True
+            continue
+        if kind == "url":
+            text = "url(" + text[4:-1].strip() + ")"
+
+        if pending_space and out:
+            previous = out[-1][-1]
+            # "a :hover" and "a:hover" are different selectors, so only the space after ":" goes;
+            # likewise "and (" must keep its space, but the inside of parentheses need not
+            if (
+                previous not in _CSS_TIGHT and previous not in ":(" and text[0] not in _CSS_TIGHT
+                and text[0] != ")" and not out[-1].startswith("/*!")
+            ):
+                out.append(" ")
+        pending_space = False
+
+        if text == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(text)
+    return "".join(out).strip()
+
+
+# ============================================================================
+# JavaScript
+# ============================================================================
+
+_JS_WORD = re.compile(r"[A-Za-z0-9_$\\\u0080-\uffff]")
+# After these keywords a "/" starts a regex literal, not a division
+_JS_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+    "case", "do", "else", "yield", "await"
+}
+_JS_PUNCTUATORS = sorted(
+    [
+        ">>>=", "...", "===", "!==", "**=", "<<=", ">>=", ">>>", "&&=", "||=", "??=",
+        "=>", "==", "!=", "<=", ">=", "&&", "||", "??", "?.", "++", "--", "+=", "-=", "*=", "/=",
+        "%=", "&=", "|=", "^=", "<<", ">>", "**"
+    ],
+    key=len,
+    reverse=True
+)
+
+
+# An integer literal: a "." right after it would be read as its decimal point
+_JS_INTEGER = re.compile(r"[0-9][0-9_]*")
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(_JS_WORD.match(char))
+
+
+def _scan_string(source: str, start: int) -> int:
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == quote or char == "\n":
+            return i + 1
+        i += 1
+    return i
+
+
+def _scan_template(source: str, start: int) -> int:
+    """End of a `template`, skipping over ${...} expressions (which may nest templates)"""
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "`":
+            return i + 1
+        if source.startswith("${", i):
+            i = _scan_braces(source, i + 2)
+            continue
+        i += 1
+    return i
+
+
+def _scan_braces(source: str, i: int) -> int:
+    depth = 1
+    while i < len(source) and depth:
+        char = source[i]
+        if char in "'\"":
+            i = _scan_string(source, i)
+            continue
+        if char == "`":
+            i = _scan_template(source, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        i += 1
+    return i
+
+
+def _scan_regex(source: str, start: int) -> int:
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            break
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < len(source) and _is_word_char(source[i]):
+                i += 1  # flags
+            return i
+        i += 1
+    return i
+
+
+def _js_tokens(source: str) -> List[Tuple[str, str, bool]]:
+    """(kind, text, newline_before) for every significant token"""
+    tokens: List[Tuple[str, str, bool]] = []
+    i = 0
+    newline = False
+    length = len(source)
+    while i < length:
+        char = source[i]
+        if char in " \t\r\n\f\v\u00a0\ufeff\u2028\u2029":
+            if char in "\n\r\u2028\u2029":
+                newline = True
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = length if end == -1 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            text = source[i:end]
+            if text.startswith("/*!"):
+                tokens.append(("comment", text, newline))
+                newline = False
+            elif "\n" in text:
+                newline = True
+            i = end
+            continue
+
+        if char in "'\"":
+            end, kind = _scan_string(source, i), "string"
+        elif char == "`":
+            end, kind = _scan_template(source, i), "string"
+        elif _is_word_char(char) or (char == "." and i + 1 < length and source[i + 1].isdigit()):
+            end = i + 1
+            while end < length and (_is_word_char(source[end]) or (source[end] == "." and source[i].isdigit())):
+                end += 1
+            kind = "word"
+        elif char == "/" and _regex_allowed(tokens):
+            end, kind = _scan_regex(source, i), "regex"
+        else:
+            end = i + 1
+            for punctuator in _JS_PUNCTUATORS:
+                if source.startswith(punctuator, i):
+                    end = i + len(punctuator)
+                    break
+            kind = "punct"
+
+        tokens.append((kind, source[i:end], newline))
+        newline = False
+        i = end
+    return tokens
+
+
+def _regex_allowed(tokens: List[Tuple[str, str, bool]]) -> bool:
+    for kind, text, _ in reversed(tokens):
+        if kind == "comment":
+            continue
+        if kind == "word":
+            return text in _JS_REGEX_KEYWORDS
+        if kind in ("string", "regex"):
+            return False
+        return text not in (")", "]", "}", "++", "--")
+    return True
+
+
+def _needs_newline(previous: Tuple[str, str, bool], current: Tuple[str, str, bool]) -> bool:
+    """Whether dropping a line break here could change automatic semicolon insertion"""
+    prev_kind, prev_text, _ = previous
+    kind, text, _ = current
+    ends_statement = prev_kind in ("word", "string", "regex") or prev_text in (")", "]", "}", "++", "--")
+    starts_statement = (
+        kind in ("word", "string", "regex") or text in ("(", "[", "{", "+", "-", "++", "--", "!", "~", "/", "#")
+    )
+    return ends_statement and starts_statement
+
+
+def minify_js(js: str) -> str:
+    """Minify a script; /*! ... */ license comments and a leading #! line are kept"""
+    if js.startswith("#!"):
+        shebang, _, rest = js.partition("\n")
+        minified = minify_js(rest)
+        return f"{shebang.rstrip()}\n{minified}" if minified else shebang.rstrip()
+    out: List[str] = []
+    previous: Optional[Tuple[str, str, bool]] = None
+    for token in _js_tokens(js):
+        kind, text, newline = token
+        if previous is not None:
+            prev_text = previous[1]
+            if newline and _needs_newline(previous, token):
+                out.append("\n")
+            elif (
+                (_is_word_char(prev_text[-1]) and _is_word_char(text[0]))
+                or (prev_text[-1] in "+-" and text[0] == prev_text[-1])
+                or (prev_text[-1] == "/" and text[0] in "/*")
+                or (text[0] == "." and previous[0] == "word" and _JS_INTEGER.fullmatch(prev_text))
+                or previous[0] == "comment"
+            ):
+                out.append(" ")
+        out.append(text)
+        previous = token
+    return "".join(out).strip()
+
+
+def minify(content: str, extension: str) -> str:
+    if extension == ".css":
+        return minify_css(content)
+    if extension == ".js":
+        return minify_js(content)
+    raise ValueError(f"Unsupported asset type: {extension}")
+
+
+# ============================================================================
+# Bundles
+# ============================================================================
+
+def supported_encodings() -> List[str]:
+    return [encoding for encoding, _ in PRECOMPRESSED_ENCODINGS if encoding != "br" or brotli is not None]
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output byte-for-byte reproducible
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def build_asset(source: Path, relative: str, output_dir: Path) -> Dict[str, Any]:
+    """Minify one file and write its hashed and precompressed copies"""
+    original = source.read_text(encoding="utf-8")
+    minified = minify(original, source.suffix.lower()).encode("utf-8")
+    digest = hashlib.sha256(minified).hexdigest()[:12]
+
+    relative_path = Path(relative)
+    hashed = relative_path.with_name(f"{relative_path.stem}.{digest}{relative_path.suffix}")
+    target = output_dir / hashed
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        target.write_bytes(minified)
+
+    entry = {
+        "file": hashed.as_posix(),
+        "url": f"{ASSET_PUBLIC_PREFIX}/{hashed.as_posix()}",
+        "original_size": len(original.encode("utf-8")),
+        "minified_size": len(minified),
+        "encodings": {}
+    }
+    if len(minified) >= ASSET_COMPRESS_MIN_BYTES:
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding == "br" and brotli is None:
+                continue
+            compressed_path = target.with_name(target.name + suffix)
+            if not compressed_path.exists():
+                compressed = _compress(minified, encoding)
+                if len(compressed) >= len(minified):
+                    continue
+                compressed_path.write_bytes(compressed)
+            entry["encodings"][encoding] = compressed_path.stat().st_size
+    return entry
+
+
+def build_assets(source_dir: Path = ASSET_SOURCE_DIR, output_dir: Path = ASSET_OUTPUT_DIR) -> Dict[str, Any]:
+    """Build every .css/.js file under source_dir and write the manifest"""
+    source_dir, output_dir = Path(source_dir), Path(output_dir)
+    if not source_dir.is_dir():
+        raise FileNotFoundError(f"Asset source directory not found: {source_dir}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    assets = {}
+    errors = {}
+    for source in sorted(source_dir.rglob("*")):
+        if not source.is_file() or source.suffix.lower() not in ASSET_EXTENSIONS:
+            continue
+        relative = source.relative_to(source_dir).as_posix()
+        try:
+            assets[relative] = build_asset(source, relative, output_dir)
+        except (OSError, UnicodeDecodeError) as e:
+            errors[relative] = str(e)
+
+    manifest = {
+        "built_at": datetime.utcnow().isoformat(),
+        "encodings": supported_encodings(),
+        "assets": assets,
+        "errors": errors
+    }
+    # Written last, so readers never see a manifest pointing at missing files
+    manifest_path = output_dir / "manifest.json"
+    temp_path = manifest_path.with_suffix(".json.tmp")
+    temp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(temp_path, manifest_path)
+    return manifest
+
+
+def load_manifest(output_dir: Path = ASSET_OUTPUT_DIR) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((Path(output_dir) / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================================================
+# Serving
+# ============================================================================
+
+def accepted_encodings(header: Optional[str]) -> Set[str]:
+    """Encodings from an Accept-Encoding header, minus those with q=0"""
+    accepted = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in PRECOMPRESSED_ENCODINGS)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves built assets, preferring a .br/.gz sibling the client accepts"""
+
+    async def get_response(self, path: str, scope) -> Response:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted or path.endswith(suffix):
+                continue
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None:
+                continue
+            media_type = self._media_type(path)
+            response = self.file_response(full_path, stat_result, scope)
+            response.headers["Content-Encoding"] = encoding
+            if media_type:
+                response.headers["Content-Type"] = media_type
+            return self._with_cache_headers(path, response)
+
+        response = await super().get_response(path, scope)
+        return self._with_cache_headers(path, response)
+
+    @staticmethod
+    def _media_type(path: str) -> Optional[str]:
+        if path.endswith(".css"):
+            return "text/css; charset=utf-8"
+        if path.endswith(".js"):
+            return "text/javascript; charset=utf-8"
+        return None
+
+    @staticmethod
+    def _with_cache_headers(path: str, response: Response) -> Response:
+        response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304):
+            if path.endswith("manifest.json"):
+                response.headers["Cache-Control"] = "no-cache"
+            else:
+                # Built files carry a content hash, so they never change
+                response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minify CSS/JS and write hashed, precompressed bundles")
+    parser.add_argument("--source", default=str(ASSET_SOURCE_DIR), help="directory with .css/.js sources")
+    parser.add_argument("--output", default=str(ASSET_OUTPUT_DIR), help="directory for built assets")
+    args = parser.parse_args()
+
+    result = build_assets(Path(args.source), Path(args.output))
+    for name, asset in result["assets"].items():
+        sizes = ", ".join(f"{encoding} {size}" for encoding, size in asset["encodings"].items())
+        print(f"{name} -> {asset['file']} ({asset['original_size']} -> {asset['minified_size']} bytes{'; ' + sizes if sizes else ''})")
+    for name, error in result["errors"].items():
+        print(f"{name}: {error}")
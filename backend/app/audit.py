@@ -0,0 +1,414 @@
+"""
+SEO performance audit engine
+
+Fetches rendered pages from AUDIT_BASE_URL (the Next.js frontend by default),
+then fetches the resources each page references and measures what a browser
+would download: HTML and total payload, image/script/stylesheet weight,
+render-blocking resources, compression and cache headers. Pages are audited
+concurrently on one pooled httpx client. Paint timings need a real browser and
+are not reported.
+"""
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+try:
+    import brotli  # noqa: F401  (lets httpx decode br responses)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+AUDIT_BASE_URL = os.getenv("AUDIT_BASE_URL", "http://127.0.0.1:3000").rstrip("/")
+AUDIT_CONCURRENCY = int(os.getenv("AUDIT_CONCURRENCY", "4"))
+AUDIT_TIMEOUT_SECONDS = float(os.getenv("AUDIT_TIMEOUT_SECONDS", "15"))
+AUDIT_MAX_RESOURCES = int(os.getenv("AUDIT_MAX_RESOURCES", "60"))
+
+MOBILE_USER_AGENT = (
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36 SEOAudit/1.0"
+)
+DESKTOP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) SEOAudit/1.0"
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MIN_COMPRESSIBLE_BYTES = 1024
+LONG_CACHE_SECONDS = 7 * 24 * 3600
+LARGE_IMAGE_BYTES = 200 * 1024
+PAGE_WEIGHT_BUDGET = 1600 * 1024
+LEGACY_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp")
+
+# How much a regression has to move before it is flagged
+SCORE_REGRESSION_POINTS = 5
+WEIGHT_REGRESSION_RATIO = 0.10
+
+
+@dataclass
+class PageAssets:
+    title: str = ""
+    meta_description: str = ""
+    canonical: str = ""
+    lang: str = ""
+    viewport: str = ""
+    h1_count: int = 0
+    stylesheets: List[Dict[str, Any]] = field(default_factory=list)
+    scripts: List[Dict[str, Any]] = field(default_factory=list)
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    fixed_width_elements: int = 0
+
+
+class _PageParser(HTMLParser):
+    """Collects the resources and head tags an audit needs from one HTML document"""
+
+    FIXED_WIDTH = re.compile(r"(?:^|;)\s*(?:min-)?width\s*:\s*(\d{3,})px", re.I)
+
+    def __init__(self):
+        super().__init__()
+        self.assets = PageAssets()
+        self._in_head = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value or "") for name, value in attrs}
+        if tag == "html":
+            self.assets.lang = attributes.get("lang", "")
+        elif tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1":
+            self.assets.h1_count += 1
+        elif tag == "meta":
+            name = attributes.get("name", "").lower()
+            if name == "description":
+                self.assets.meta_description = attributes.get("content", "")
+            elif name == "viewport":
+                self.assets.viewport = attributes.get("content", "")
+        elif tag == "link" and attributes.get("href"):
+            rel = attributes.get("rel", "").lower().split()
+            if "canonical" in rel:
+                self.assets.canonical = attributes["href"]
+            elif "stylesheet" in rel:
+                media = attributes.get("media", "all").lower()
+                self.assets.stylesheets.append({
+                    "url": attributes["href"],
+                    "render_blocking": self._in_head and media in ("", "all", "screen") and "disabled" not in attributes
+                })
+        elif tag == "script" and attributes.get("src"):
+            deferred = "async" in attributes or "defer" in attributes or attributes.get("type") == "module"
+            self.assets.scripts.append({
+                "url": attributes["src"],
+                "render_blocking": self._in_head and not deferred
+            })
+        elif tag == "img" and attributes.get("src") and not attributes["src"].startswith("data:"):
+            self.assets.images.append({
+                "url": attributes["src"],
+                "alt": "alt" in attributes,
+                "dimensions": bool(attributes.get("width") and attributes.get("height")),
+                "lazy": attributes.get("loading") == "lazy",
+                "srcset": bool(attributes.get("srcset"))
+            })
+
+        match = self.FIXED_WIDTH.search(attributes.get("style", ""))
+        if match and int(match.group(1)) > 480:
+            self.assets.fixed_width_elements += 1
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._in_head = False
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.assets.title += data.strip()
+
+
+def parse_page(html: str) -> PageAssets:
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.assets
+
+
+def _max_age(cache_control: str) -> Optional[int]:
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else None
+
+
+def _resource_record(url: str, kind: str, response: Optional[httpx.Response], error: Optional[str] = None) -> Dict[str, Any]:
+    if response is None:
+        return {"url": url, "kind": kind, "status": None, "error": error, "transfer_size": 0, "content_size": 0}
+    return {
+        "url": url,
+        "kind": kind,
+        "status": response.status_code,
+        "content_type": response.headers.get("content-type", "").split(";")[0],
+        "content_encoding": response.headers.get("content-encoding", ""),
+        "cache_control": response.headers.get("cache-control", ""),
+        "transfer_size": response.num_bytes_downloaded,
+        "content_size": len(response.content)
+    }
+
+
+class PerformanceAuditor:
+    """Runs page audits against a base URL with bounded concurrency"""
+
+    def __init__(
+        self,
+        base_url: str = AUDIT_BASE_URL,
+        concurrency: int = AUDIT_CONCURRENCY,
+        timeout: float = AUDIT_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.transport = transport
+
+    def _client(self, user_agent: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=self.transport,
+            headers={"User-Agent": user_agent, "Accept-Encoding": ACCEPT_ENCODING},
+            limits=httpx.Limits(max_connections=self.concurrency * 4, max_keepalive_connections=self.concurrency * 2)
+        )
+
+    async def audit_pages(self, page_urls: List[str], mobile: bool = False) -> List[Dict[str, Any]]:
+        """Audit several pages concurrently; results keep the input order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._client(MOBILE_USER_AGENT if mobile else DESKTOP_USER_AGENT) as client:
+            async def run(page_url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._audit_page(client, page_url)
+
+            return await asyncio.gather(*(run(page_url) for page_url in page_urls))
+
+    async def audit_page(self, page_url: str, mobile: bool = False) -> Dict[str, Any]:
+        return (await self.audit_pages([page_url], mobile=mobile))[0]
+
+    async def _fetch_resource(self, client: httpx.AsyncClient, url: str, kind: str) -> Dict[str, Any]:
+        try:
+            response = await client.get(url)
+            return _resource_record(url, kind, response)
+        except httpx.HTTPError as e:
+            return _resource_record(url, kind, None, error=str(e) or e.__class__.__name__)
+
+    async def _audit_page(self, client: httpx.AsyncClient, page_url: str) -> Dict[str, Any]:
+        path = page_url if page_url.startswith("/") else f"/{page_url}"
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+        except httpx.HTTPError as e:
+            return {
+                "page_url": path,
+                "status_code": None,
+                "error": f"Could not fetch {self.base_url}{path}: {str(e) or e.__class__.__name__}"
+            }
+        load_time = (time.perf_counter() - started) * 1000
+
+        page_record = _resource_record(path, "document", response)
+        assets = parse_page(response.text) if "html" in page_record["content_type"] else PageAssets()
+
+        resource_refs = (
+            [(item["url"], "stylesheet", item["render_blocking"]) for item in assets.stylesheets]
+            + [(item["url"], "script", item["render_blocking"]) for item in assets.scripts]
+            + [(item["url"], "image", False) for item in assets.images]
+        )
+        unique_refs: Dict[str, tuple] = {}
+        for url, kind, blocking in resource_refs:
+            absolute = urljoin(str(response.url), url)
+            if absolute not in unique_refs:
+                unique_refs[absolute] = (kind, blocking)
+        refs = list(unique_refs.items())[:AUDIT_MAX_RESOURCES]
+
+        fetch_started = time.perf_counter()
+        resources = await asyncio.gather(*(self._fetch_resource(client, url, kind) for url, (kind, _) in refs))
+        for resource, (_, (_, blocking)) in zip(resources, refs):
+            resource["render_blocking"] = blocking
+        resources_time = (time.perf_counter() - fetch_started) * 1000
+
+        report = build_report(path, response.status_code, page_record, assets, list(resources))
+        report["load_time"] = round(load_time + resources_time)
+        report["ttfb"] = round(response.elapsed.total_seconds() * 1000)
+        return report
+
+
+def _score(deductions: List[float]) -> int:
+    return max(0, min(100, round(100 - sum(deductions))))
+
+
+def build_report(
+    page_url: str,
+    status_code: int,
+    page: Dict[str, Any],
+    assets: PageAssets,
+    resources: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Turn fetched page + resource records into metrics, scores and recommendations"""
+    weights = {"image": 0, "script": 0, "stylesheet": 0}
+    for resource in resources:
+        weights[resource["kind"]] = weights.get(resource["kind"], 0) + resource["transfer_size"]
+    total_transfer = page["transfer_size"] + sum(resource["transfer_size"] for resource in resources)
+
+    render_blocking = [resource["url"] for resource in resources if resource.get("render_blocking")]
+
+    uncompressed = [
+        record["url"] for record in [page] + resources
+        if record.get("status") == 200
+        and record.get("content_type", "").startswith(COMPRESSIBLE_TYPES)
+        and record["content_size"] >= MIN_COMPRESSIBLE_BYTES
+        and not record.get("content_encoding")
+    ]
+    weak_cache = [
+        resource["url"] for resource in resources
+        if resource.get("status") == 200
+        and ("no-store" in resource.get("cache_control", "") or (_max_age(resource.get("cache_control", "")) or 0) < LONG_CACHE_SECONDS)
+    ]
+    failed = [resource["url"] for resource in resources if resource.get("status") is None or resource["status"] >= 400]
+    large_images = [
+        resource["url"] for resource in resources
+        if resource["kind"] == "image" and resource["transfer_size"] > LARGE_IMAGE_BYTES
+    ]
+    legacy_images = [
+        item["url"] for item in assets.images
+        if urlsplit(item["url"]).path.lower().endswith(LEGACY_IMAGE_EXTENSIONS) and not item["srcset"]
+    ]
+    images_missing_alt = [item["url"] for item in assets.images if not item["alt"]]
+    images_missing_dimensions = [item["url"] for item in assets.images if not item["dimensions"]]
+    images_not_lazy = [item["url"] for item in assets.images[1:] if not item["lazy"]]
+
+    mobile_issues = mobile_issues_for(assets)
+
+    performance_score = _score([
+        min(30, len(render_blocking) * 6),
+        min(25, max(0, total_transfer - PAGE_WEIGHT_BUDGET) / PAGE_WEIGHT_BUDGET * 25),
+        min(15, len(large_images) * 5),
+        min(10, len(legacy_images) * 2),
+        min(10, len(images_not_lazy) * 2),
+        min(10, len(uncompressed) * 5)
+    ])
+    accessibility_score = _score([
+        min(40, len(images_missing_alt) * 10),
+        0 if assets.lang else 20,
+        0 if assets.title else 20,
+        0 if assets.viewport else 20
+    ])
+    best_practices_score = _score([
+        min(30, len(uncompressed) * 10),
+        min(25, len(weak_cache) * 3),
+        min(30, len(failed) * 10),
+        min(15, len(images_missing_dimensions) * 3)
+    ])
+    seo_score = _score([
+        0 if status_code == 200 else 50,
+        0 if assets.title else 25,
+        0 if assets.meta_description else 20,
+        0 if assets.canonical else 10,
+        0 if assets.h1_count == 1 else 10,
+        0 if assets.lang else 5
+    ])
+
+    recommendations: List[Dict[str, Any]] = []
+
+    def recommend(kind: str, impact: str, message: str, urls: List[str]):
+        if urls:
+            recommendations.append({"type": kind, "impact": impact, "message": message, "count": len(urls), "urls": urls[:20]})
+
+    recommend("error", "high", "Fix resources that failed to load", failed)
+    recommend("warning", "high", "Defer or inline render-blocking scripts and stylesheets", render_blocking)
+    recommend("warning", "high", "Compress large images (over 200KB)", large_images)
+    recommend("warning", "medium", "Enable gzip/brotli compression for text resources", uncompressed)
+    recommend("warning", "medium", "Serve WebP/AVIF variants with srcset instead of JPEG/PNG", legacy_images)
+    recommend("info", "medium", "Set long-lived Cache-Control on static assets", weak_cache)
+    recommend("info", "low", "Lazy-load offscreen images", images_not_lazy)
+    recommend("info", "low", "Add width/height to images to avoid layout shift", images_missing_dimensions)
+    recommend("warning", "medium", "Add alt text to images", images_missing_alt)
+    if total_transfer > PAGE_WEIGHT_BUDGET:
+        recommendations.append({
+            "type": "warning",
+            "impact": "high",
+            "message": f"Page weight {total_transfer // 1024}KB exceeds the {PAGE_WEIGHT_BUDGET // 1024}KB budget",
+            "count": 1,
+            "urls": []
+        })
+
+    return {
+        "page_url": page_url,
+        "status_code": status_code,
+        "html_size": page["content_size"],
+        "html_transfer_size": page["transfer_size"],
+        "total_transfer_size": total_transfer,
+        "image_weight": weights["image"],
+        "script_weight": weights["script"],
+        "stylesheet_weight": weights["stylesheet"],
+        "request_count": 1 + len(resources),
+        "render_blocking_count": len(render_blocking),
+        "render_blocking": render_blocking,
+        "uncompressed_resources": uncompressed,
+        "weak_cache_resources": weak_cache,
+        "failed_resources": failed,
+        # Paint timings need a browser; a fetch-based audit cannot measure them
+        "first_contentful_paint": None,
+        "largest_contentful_paint": None,
+        "cumulative_layout_shift": None,
+        "first_input_delay": None,
+        "performance_score": performance_score,
+        "accessibility_score": accessibility_score,
+        "best_practices_score": best_practices_score,
+        "seo_score": seo_score,
+        "recommendations": recommendations,
+        "mobile_issues": mobile_issues,
+        "resources": resources
+    }
+
+
+def mobile_issues_for(assets: PageAssets) -> List[Dict[str, str]]:
+    issues = []
+    viewport = assets.viewport.replace(" ", "").lower()
+    if not viewport:
+        issues.append({"type": "viewport", "description": "Viewport meta tag missing", "severity": "error"})
+    elif "width=device-width" not in viewport:
+        issues.append({"type": "viewport", "description": "Viewport does not use width=device-width", "severity": "error"})
+    elif "user-scalable=no" in viewport or "maximum-scale=1" in viewport:
+        issues.append({"type": "viewport", "description": "Viewport disables zooming", "severity": "warning"})
+    if assets.fixed_width_elements:
+        issues.append({
+            "type": "content_width",
+            "description": f"{assets.fixed_width_elements} element(s) use fixed widths wider than 480px",
+            "severity": "warning"
+        })
+    return issues
+
+
+def find_regressions(current: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Compare a report against the previous one for the same page"""
+    if not previous:
+        return []
+    regressions = []
+    for metric in ("performance_score", "accessibility_score", "best_practices_score", "seo_score"):
+        before, after = previous.get(metric), current.get(metric)
+        if before is not None and after is not None and before - after >= SCORE_REGRESSION_POINTS:
+            regressions.append({"metric": metric, "previous": before, "current": after})
+    for metric in ("total_transfer_size", "image_weight", "script_weight", "stylesheet_weight"):
+        before, after = previous.get(metric), current.get(metric)
+        if before and after is not None and (after - before) / before > WEIGHT_REGRESSION_RATIO:
+            regressions.append({"metric": metric, "previous": before, "current": after})
+    for metric in ("render_blocking_count",):
+        before, after = previous.get(metric), current.get(metric)
+        if before is not None and after is not None and after > before:
+            regressions.append({"metric": metric, "previous": before, "current": after})
+    return regressions
+
+
+performance_auditor = PerformanceAuditor()
@@ -0,0 +1,198 @@
+"""
+Response compression
+
+CompressionMiddleware compresses API responses with Brotli (when the brotli
+package is installed) or gzip, whichever the client's Accept-Encoding
+prefers, for bodies of at least COMPRESSION_MIN_BYTES whose content type is
+in COMPRESSION_CONTENT_TYPES. Responses that are already encoded or
+streamed (file downloads, precompressed assets) are sent as they are.
+
+Compressed bodies of 200 responses not marked no-store/private are kept in a small LRU keyed
+by a digest of the uncompressed body, so identical payloads (sitemap, blog
+lists, calculator results for the same chart) are compressed once.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.assets import accepted_encodings
+from app.tracing import span
+
+try:
+    import brotli
+except ImportError:  # brotli not installed; gzip only
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Entries ending in "/" match a whole family, e.g. text/
+COMPRESSION_CONTENT_TYPES = tuple(
+    value.strip().lower() for value in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "text/,application/json,application/javascript,application/xml,application/rss+xml,image/svg+xml"
+    ).split(",") if value.strip()
+)
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(8 * 1024 * 1024)))
+# Bodies above this are compressed in the threadpool instead of on the event loop
+COMPRESSION_THREAD_MIN_BYTES = 256 * 1024
+
+
+def compressible_type(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if not media_type:
+        return False
+    return any(
+        media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+        for allowed in COMPRESSION_CONTENT_TYPES
+    )
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies bounded by total size"""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+compressed_body_cache = CompressedBodyCache()
+
+
+def _cacheable(status: int, headers: Headers) -> bool:
+    cache_control = headers.get("cache-control", "").lower()
+    return status == 200 and "no-store" not in cache_control and "private" not in cache_control
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing buffered (non-streaming) responses"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES, cache: CompressedBodyCache = compressed_body_cache):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not compressible_type(headers.get("content-type")):
+                    await send(message)
+                    return
+                # Hold the start message until the body shows whether to compress
+                start_message = message
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(body, encoding, start)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, body: bytes, encoding: str, start) -> bytes:
+        with span("compress", **{"compression.encoding": encoding, "compression.bytes": len(body)}) as current:
+            key = None
+            if _cacheable(start["status"], Headers(raw=start["headers"])):
+                key = (encoding, hashlib.blake2b(body, digest_size=20).digest())
+                cached = self.cache.get(key)
+                current.set_attribute("cache.hit", cached is not None)
+                if cached is not None:
+                    return cached
+
+            if len(body) >= COMPRESSION_THREAD_MIN_BYTES:
+                compressed = await run_in_threadpool(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+
+            if key is not None:
+                self.cache.put(key, compressed)
+            return compressed
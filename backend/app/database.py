@@ -3,12 +3,16 @@ Database configuration and session management
 Supports SQLite for testing and PostgreSQL/MySQL for production
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, inspect, text
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+import logging
 import os
-from typing import Generator
+from typing import Generator, List
+
+logger = logging.getLogger(__name__)
 
 # Database URL configuration
 DATABASE_URL = os.getenv(
@@ -66,5 +70,36 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def add_missing_columns(bind=None) -> List[str]:
+    """Add model columns (and their indexes) that existing tables lack
+
+    create_all() only creates missing tables, so databases made before an
+    additive migration in migrations/ would otherwise fail on every query
+    touching the new column. Columns that cannot be added in place (NOT NULL
+    without a server default) are logged and left to the migration.
+    Returns "table.column" for each column added.
+    """
+    bind = bind or engine
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing]
+            for column in missing:
+                if column.primary_key or (not column.nullable and column.server_default is None and column.computed is None):
+                    logger.warning("Column %s.%s is missing; apply its migration", table.name, column.name)
+                    continue
+                ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                connection.execute(text(f"ALTER TABLE {bind.dialect.identifier_preparer.format_table(table)} ADD COLUMN {ddl}"))
+                added.append(f"{table.name}.{column.name}")
+            names = {column.name for column in missing}
+            for index in table.indexes:
+                if names.intersection(column.name for column in index.columns):
+                    index.create(connection, checkfirst=True)
+    return added
+
 # Metadata for database operations
 metadata = MetaData()
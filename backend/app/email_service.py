@@ -2,6 +2,7 @@
 Email service for sending booking confirmations and notifications
 """
 
+import logging
 import smtplib
 import os
 from email.mime.text import MIMEText
@@ -10,10 +11,13 @@ from typing import Optional
 from datetime import datetime
 
 from app.models import Booking, User, UserVerification
+from app.tracing import span
 import secrets
 import uuid
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -25,36 +29,41 @@ class EmailService:
     
     def send_email(self, to_email: str, subject: str, html_content: str, text_content: Optional[str] = None):
         """Send email using SMTP"""
-        if not self.smtp_username or not self.smtp_password:
-            print(f"Email not configured. Would send to {to_email}: {subject}")
-            return False
-        
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
-            
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
-            
-            return True
-        except Exception as e:
-            print(f"Failed to send email: {e}")
-            return False
+        with span("email.send", **{"server.address": self.smtp_server}) as current:
+            if not self.smtp_username or not self.smtp_password:
+                logger.info("Email not configured. Would send to %s: %s", to_email, subject)
+                current.set_attribute("email.sent", False)
+                return False
+
+            try:
+                msg = MIMEMultipart('alternative')
+                msg['Subject'] = subject
+                msg['From'] = f"{self.from_name} <{self.from_email}>"
+                msg['To'] = to_email
+
+                # Add text content
+                if text_content:
+                    text_part = MIMEText(text_content, 'plain')
+                    msg.attach(text_part)
+
+                # Add HTML content
+                html_part = MIMEText(html_content, 'html')
+                msg.attach(html_part)
+
+                # Send email
+                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                server.starttls()
+                server.login(self.smtp_username, self.smtp_password)
+                server.send_message(msg)
+                server.quit()
+
+                current.set_attribute("email.sent", True)
+                return True
+            except Exception as e:
+                logger.error("Failed to send email: %s", e)
+                current.record_exception(e)
+                current.set_attribute("email.sent", False)
+                return False
     
     def send_booking_confirmation(self, booking: Booking):
         """Send booking confirmation email"""
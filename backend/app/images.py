@@ -0,0 +1,506 @@
+"""
+Image optimization pipeline
+
+Generates resized AVIF/WebP variants for site images (files under public/ and
+uploads/) into a content-addressed cache directory served at
+IMAGE_PUBLIC_PREFIX. The cache key is the SHA-256 of the source bytes, so
+re-saving the same file never re-encodes it, and a manifest.json next to the
+variants records what was generated. Bulk jobs fan out to a process pool
+because encoding is CPU bound.
+
+Services, pages and blogs keep a copy of their image's manifest in a
+*_manifest column (written when the image is optimized), so serializing a
+row never touches the filesystem or hashes the source.
+
+Pillow is optional: without it, images keep being served as uploaded and
+optimize calls fail with a clear error.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from fastapi.staticfiles import StaticFiles
+
+from app.database import SessionLocal
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow not installed
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _resolve_dir(value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else (BACKEND_DIR / path).resolve()
+
+
+IMAGE_SOURCE_DIRS = [
+    _resolve_dir(part.strip())
+    for part in os.getenv("IMAGE_SOURCE_DIRS", "../public,uploads").split(",") if part.strip()
+]
+IMAGE_CACHE_DIR = _resolve_dir(os.getenv("IMAGE_CACHE_DIR", "static/optimized"))
+IMAGE_PUBLIC_PREFIX = os.getenv("IMAGE_PUBLIC_PREFIX", "/static/optimized").rstrip("/")
+IMAGE_VARIANT_WIDTHS = [
+    int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,960,1280,1920").split(",") if width.strip()
+]
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+IMAGE_OPTIMIZE_WORKERS = int(os.getenv("IMAGE_OPTIMIZE_WORKERS", str(min(4, os.cpu_count() or 1))))
+IMAGE_LOCAL_HOSTS = {
+    host.strip().lower()
+    for host in os.getenv("IMAGE_LOCAL_HOSTS", "astroarupshastri.com,www.astroarupshastri.com,localhost").split(",")
+    if host.strip()
+}
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff"}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+FORMAT_EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg", "png": "png"}
+DEFAULT_SIZES = "100vw"
+
+
+def supported_formats() -> List[str]:
+    """Output formats this Pillow build can encode, best compression first"""
+    if Image is None:
+        return []
+    from PIL import features
+
+    formats = []
+    for name in ("avif", "webp"):
+        try:
+            if features.check_module(name):
+                formats.append(name)
+        except ValueError:  # older Pillow without AVIF support
+            continue
+    return formats
+
+
+def resolve_source(image_ref: Optional[str]) -> Optional[Path]:
+    """Map an image URL/path as stored on a model to a local source file
+
+    Remote images on other hosts, data/blob URLs and paths escaping the source
+    directories resolve to None.
+    """
+    if not image_ref:
+        return None
+    parts = urlsplit(image_ref.strip())
+    if parts.scheme and parts.scheme not in ("http", "https"):
+        return None
+    if parts.scheme and (parts.hostname or "").lower() not in IMAGE_LOCAL_HOSTS:
+        return None
+
+    relative = unquote(parts.path).lstrip("/")
+    if not relative or Path(relative).suffix.lower() not in IMAGE_EXTENSIONS:
+        return None
+
+    for base in IMAGE_SOURCE_DIRS:
+        candidate = (base / relative).resolve()
+        if candidate.is_relative_to(base) and candidate.is_file():
+            return candidate
+    return None
+
+
+def inspect_image(path: Path) -> Dict[str, Any]:
+    """File size and pixel dimensions of a source image (dimensions need Pillow)"""
+    info: Dict[str, Any] = {"file_size": path.stat().st_size, "width": None, "height": None}
+    if Image is not None:
+        try:
+            with Image.open(path) as image:
+                info["width"], info["height"] = image.size
+        except OSError:
+            pass
+    return info
+
+
+class _ImageSourceParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.images: List[Dict[str, str]] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "img":
+            return
+        attributes = dict(attrs)
+        if attributes.get("src"):
+            self.images.append({
+                "src": attributes["src"],
+                "alt": attributes.get("alt") or "",
+                "title": attributes.get("title") or ""
+            })
+
+
+def extract_image_sources(html: Optional[str]) -> List[Dict[str, str]]:
+    """<img> src/alt/title attributes found in rich-text HTML, in document order"""
+    if not html:
+        return []
+    parser = _ImageSourceParser()
+    parser.feed(html)
+    parser.close()
+    return parser.images
+
+
+def content_key(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:24]
+
+
+def _atomic_write(path: Path, write) -> None:
+    # Unique per call: threads of one process may write the same variant at once
+    fd, name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp = Path(name)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def optimize_image_file(
+    source: str,
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+    cache_dir: str,
+    key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Encode every width/format variant of one source file and write its manifest
+
+    Module level so it can run in a worker process. Returns the cached manifest
+    without re-encoding when the same options were already applied.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed; image optimization is unavailable")
+
+    source_path = Path(source)
+    key = key or content_key(source_path)
+    target_dir = Path(cache_dir) / key
+    manifest_path = target_dir / "manifest.json"
+    options = {"widths": sorted(widths), "formats": formats, "quality": quality}
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("options") == options:
+            manifest["cached"] = True
+            return manifest
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(source_path) as opened:
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        width, height = image.size
+
+        targets = [w for w in sorted(widths) if w < width]
+        if not widths or width <= max(widths):
+            targets.append(width)
+
+        variants: Dict[str, List[Dict[str, Any]]] = {fmt: [] for fmt in formats}
+        for target_width in targets:
+            target_height = max(1, round(height * target_width / width))
+            resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+            for fmt in formats:
+                filename = f"w{target_width}-q{quality}.{FORMAT_EXTENSIONS[fmt]}"
+                save_kwargs: Dict[str, Any] = {"quality": quality}
+                if fmt == "webp":
+                    save_kwargs["method"] = 6
+                elif fmt == "jpeg":
+                    save_kwargs.update(optimize=True, progressive=True)
+                frame = resized.convert("RGB") if fmt == "jpeg" else resized
+                _atomic_write(target_dir / filename, lambda tmp: frame.save(tmp, format=fmt.upper(), **save_kwargs))
+                variants[fmt].append({
+                    "width": target_width,
+                    "height": target_height,
+                    "file": filename,
+                    "size": (target_dir / filename).stat().st_size
+                })
+
+    manifest = {
+        "key": key,
+        "source": str(source_path),
+        "width": width,
+        "height": height,
+        "original_size": source_path.stat().st_size,
+        "options": options,
+        "variants": variants,
+        "created_at": datetime.utcnow().isoformat()
+    }
+    # The manifest is written last so readers never see a partial variant set
+    _atomic_write(manifest_path, lambda tmp: tmp.write_text(json.dumps(manifest)))
+    manifest["cached"] = False
+    return manifest
+
+
+def _variant_url(key: str, filename: str) -> str:
+    return f"{IMAGE_PUBLIC_PREFIX}/{key}/{filename}"
+
+
+def picture_from_manifest(manifest: Dict[str, Any], src: str, sizes: str = DEFAULT_SIZES) -> Dict[str, Any]:
+    """Shape a manifest as <picture> data: one <source> per format plus the original as <img> src
+
+    A format is left out when its full-size variant is not smaller than the
+    source file, so a well-compressed JPEG is never swapped for a heavier
+    WebP (and the smaller widths of that format are not stretched instead).
+    """
+    original_size = manifest["original_size"]
+    formats = [
+        fmt for fmt, variants in manifest["variants"].items()
+        if variants and variants[-1]["size"] < original_size
+    ]
+    # What a browser taking the first <source> downloads at full width
+    best = manifest["variants"][formats[0]][-1] if formats else None
+    return {
+        "src": src,
+        "width": manifest["width"],
+        "height": manifest["height"],
+        "sizes": sizes,
+        "sources": [
+            {
+                "type": MIME_TYPES[fmt],
+                "srcset": ", ".join(
+                    f"{_variant_url(manifest['key'], variant['file'])} {variant['width']}w"
+                    for variant in manifest["variants"][fmt]
+                )
+            }
+            for fmt in formats
+        ],
+        "original_size": original_size,
+        "optimized_src": _variant_url(manifest["key"], best["file"]) if best else src,
+        "optimized_size": best["size"] if best else original_size
+    }
+
+
+def row_manifest(image_ref: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a manifest stored on a model row, tagged with the image it belongs to"""
+    return {
+        "src": image_ref,
+        "key": manifest["key"],
+        "width": manifest["width"],
+        "height": manifest["height"],
+        "original_size": manifest["original_size"],
+        "variants": manifest["variants"]
+    }
+
+
+def stored_picture(image_ref: Optional[str], manifest: Optional[Dict[str, Any]], sizes: str = DEFAULT_SIZES) -> Optional[Dict[str, Any]]:
+    """<picture> data from a row's stored manifest, if it was made for the row's current image"""
+    if not image_ref or not manifest or manifest.get("src") != image_ref:
+        return None
+    return picture_from_manifest(manifest, image_ref, sizes)
+
+
+# model attribute holding an image URL -> attribute holding its manifest
+IMAGE_MANIFEST_COLUMNS = {
+    "Service": ("image_url", "image_manifest"),
+    "Page": ("banner_image", "banner_image_manifest"),
+    "Blog": ("featured_image", "featured_image_manifest"),
+}
+
+
+def store_row_manifests(db, image_ref: str, manifest: Dict[str, Any]) -> int:
+    """Copy a manifest onto every service, page and blog using the image; returns rows updated"""
+    from app import models  # app.models imports this module
+
+    stored = row_manifest(image_ref, manifest)
+    updated = 0
+    for model_name, (image_column, manifest_column) in IMAGE_MANIFEST_COLUMNS.items():
+        model = getattr(models, model_name)
+        updated += db.query(model).filter(getattr(model, image_column) == image_ref).update(
+            {manifest_column: stored}, synchronize_session=False
+        )
+    return updated
+
+
+class ImagePipeline:
+    """Front door to the variant cache for request handlers and admin jobs"""
+
+    def __init__(
+        self,
+        cache_dir: Path = IMAGE_CACHE_DIR,
+        widths: List[int] = IMAGE_VARIANT_WIDTHS,
+        quality: int = IMAGE_QUALITY,
+        workers: int = IMAGE_OPTIMIZE_WORKERS
+    ):
+        self.cache_dir = cache_dir
+        self.widths = widths
+        self.quality = quality
+        self.workers = workers
+        self._keys: Dict[Tuple[str, int, int], str] = {}
+        self._manifests: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def options(self, settings: Optional[Dict[str, Any]] = None) -> Tuple[List[int], List[str], int]:
+        """Translate the admin image optimization settings into pipeline options"""
+        settings = settings or {}
+        max_width = int(settings.get("max_width") or max(self.widths))
+        widths = [w for w in self.widths if w <= max_width] or [max_width]
+        if max_width not in widths and max_width < max(self.widths):
+            widths.append(max_width)
+
+        available_formats = supported_formats()
+        requested = settings.get("format", "auto")
+        if requested in ("jpeg", "png"):
+            formats = [requested]
+        elif requested == "webp":
+            formats = ["webp"]
+        else:
+            formats = available_formats or ["jpeg"]
+
+        quality = int(settings.get("quality") or self.quality)
+        return sorted(widths), formats, max(1, min(quality, 100))
+
+    def _key_for(self, path: Path) -> str:
+        stat = path.stat()
+        memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        key = self._keys.get(memo_key)
+        if key is None:
+            key = content_key(path)
+            with self._lock:
+                self._keys[memo_key] = key
+        return key
+
+    def manifest_for_key(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Read the manifest of a content key, if variants were generated"""
+        if not key:
+            return None
+        manifest_path = self.cache_dir / key / "manifest.json"
+        try:
+            mtime = manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = self._manifests.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        manifest = json.loads(manifest_path.read_text())
+        with self._lock:
+            self._manifests[key] = (mtime, manifest)
+        return manifest
+
+    def manifest_for(self, image_ref: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up existing variants for an image without doing any encoding
+
+        Hashes the source the first time it is seen; request paths should
+        use the manifest stored on the row (stored_picture) instead.
+        """
+        path = resolve_source(image_ref)
+        if path is None:
+            return None
+        return self.manifest_for_key(self._key_for(path))
+
+    def picture(self, image_ref: Optional[str], sizes: str = DEFAULT_SIZES,
+                key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Responsive variants for an image reference (or a known content key), or None if not optimized yet"""
+        try:
+            manifest = self.manifest_for_key(key) if key else self.manifest_for(image_ref)
+        except (OSError, ValueError):
+            return None
+        return picture_from_manifest(manifest, image_ref, sizes) if manifest else None
+
+    def optimize(self, image_ref: str, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generate variants for one image in the current process"""
+        if not self.available:
+            raise RuntimeError("Pillow is not installed; image optimization is unavailable")
+        path = resolve_source(image_ref)
+        if path is None:
+            raise ValueError(f"Image not found in local media: {image_ref}")
+        widths, formats, quality = self.options(settings)
+        return optimize_image_file(str(path), widths, formats, quality, str(self.cache_dir), self._key_for(path))
+
+    def optimize_quietly(self, image_ref: Optional[str]) -> None:
+        """Background-task wrapper: optimize, store the manifest on the rows using
+        the image, skip missing/remote images and never raise"""
+        if not image_ref or not self.available or resolve_source(image_ref) is None:
+            return
+        try:
+            manifest = self.optimize(image_ref)
+        except Exception as e:
+            logger.warning("Image optimization failed for %s: %s", image_ref, e)
+            return
+        db = SessionLocal()
+        try:
+            store_row_manifests(db, image_ref, manifest)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Could not store image variants for %s: %s", image_ref, e)
+        finally:
+            db.close()
+
+    def bulk_optimize(
+        self,
+        image_refs: Iterable[str],
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Optimize many images on a process pool; returns {ref: manifest or {"error": ...}}"""
+        if not self.available:
+            raise RuntimeError("Pillow is not installed; image optimization is unavailable")
+        widths, formats, quality = self.options(settings)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        jobs: Dict[str, Path] = {}
+        for image_ref in dict.fromkeys(image_refs):
+            path = resolve_source(image_ref)
+            if path is None:
+                results[image_ref] = {"error": f"Image not found in local media: {image_ref}"}
+            else:
+                jobs[image_ref] = path
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            for image_ref, path in jobs.items():
+                try:
+                    results[image_ref] = optimize_image_file(
+                        str(path), widths, formats, quality, str(self.cache_dir), self._key_for(path)
+                    )
+                except Exception as e:
+                    results[image_ref] = {"error": str(e)}
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            futures = {
+                executor.submit(
+                    optimize_image_file, str(path), widths, formats, quality, str(self.cache_dir), self._key_for(path)
+                ): image_ref
+                for image_ref, path in jobs.items()
+            }
+            for future in as_completed(futures):
+                image_ref = futures[future]
+                try:
+                    results[image_ref] = future.result()
+                except Exception as e:
+                    results[image_ref] = {"error": str(e)}
+        return results
+
+
+class VariantStaticFiles(StaticFiles):
+    """Serves the variant cache; variant files are content-addressed so they never change"""
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        if not str(full_path).endswith("manifest.json"):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,55 @@
+"""
+Native JSON columns
+
+JSONData maps to the JSON type of each backend (SQLite JSON1 text, MySQL
+JSON, PostgreSQL JSONB), so chart/analysis data is stored and returned as
+Python objects rather than strings that every endpoint has to re-parse.
+Rows written as JSON text before the switch read back the same way.
+
+json_text() extracts one member as text, for use in generated columns and
+filters, e.g. Computed(json_text("planetary_positions", "Mars")).
+"""
+
+from sqlalchemy import JSON, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+JSONData = JSON().with_variant(JSONB(), "postgresql")
+
+
+class json_text(ColumnElement):
+    """`column->>'$.key...'` in the dialect's own syntax; column is a plain name
+    so the expression also works inside CREATE TABLE"""
+
+    # column/path are not part of a cache key
+    inherit_cache = False
+    type = String()
+
+    def __init__(self, column: str, *path: str):
+        self.column = column
+        self.path = path
+
+
+def _quoted(compiler, name: str) -> str:
+    return compiler.preparer.quote(name)
+
+
+def _json_path(path) -> str:
+    return "'$" + "".join(f'."{key}"' for key in path) + "'"
+
+
+@compiles(json_text)
+def _json_text_default(element, compiler, **kw):
+    return f"json_extract({_quoted(compiler, element.column)}, {_json_path(element.path)})"
+
+
+@compiles(json_text, "mysql")
+def _json_text_mysql(element, compiler, **kw):
+    return f"json_unquote(json_extract({_quoted(compiler, element.column)}, {_json_path(element.path)}))"
+
+
+@compiles(json_text, "postgresql")
+def _json_text_postgresql(element, compiler, **kw):
+    keys = ",".join(element.path)
+    return f"({_quoted(compiler, element.column)} #>> '{{{keys}}}')"
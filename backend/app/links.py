@@ -0,0 +1,393 @@
+"""
+Link index and broken-link checker
+
+Page and blog HTML is parsed when it is saved, and every <a href> (plus a
+page's anchor_link) is stored in the links table as a source -> target edge.
+Internal targets are resolved immediately against published page/blog slugs,
+the frontend's static routes, public files and the redirect tables, so the
+broken-link count is a cheap indexed query. External targets are verified by
+ExternalLinkChecker, which pools connections and rate limits per host.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+import httpx
+from sqlalchemy.orm import Session, undefer_group
+
+from app.images import IMAGE_SOURCE_DIRS
+from app.models import Blog, Link, Page
+from app.redirects import normalize_path, redirect_resolver
+
+LINK_LOCAL_HOSTS = {
+    host.strip().lower()
+    for host in os.getenv("LINK_LOCAL_HOSTS", "astroarupshastri.com,www.astroarupshastri.com,localhost").split(",")
+    if host.strip()
+}
+LINK_STATIC_ROUTES = {
+    normalize_path(route)
+    for route in os.getenv(
+        "LINK_STATIC_ROUTES",
+        "/,/about,/blog,/book-appointment,/contact,/free-reports,/horoscope,/kolkata-astrology,/login,"
+        "/panchang,/profile,/register,/reset-password,/verify-email,/services,/services/consultation,"
+        "/services/kundli-matching,/services/online-reports,/services/voice-report,/calculators,"
+        "/calculators/ascendant,/calculators/dosha,/calculators/gemstone,/calculators/horoscope-matching,"
+        "/calculators/kundli,/calculators/moon-sign,/calculators/numerology,/calculators/rudraksha"
+    ).split(",")
+    if route.strip()
+}
+LINK_CHECK_CONCURRENCY = int(os.getenv("LINK_CHECK_CONCURRENCY", "8"))
+LINK_CHECK_PER_HOST_RPS = float(os.getenv("LINK_CHECK_PER_HOST_RPS", "2"))
+LINK_CHECK_TIMEOUT_SECONDS = float(os.getenv("LINK_CHECK_TIMEOUT_SECONDS", "10"))
+LINK_RECHECK_HOURS = float(os.getenv("LINK_RECHECK_HOURS", "24"))
+
+SKIPPED_SCHEMES = ("mailto", "tel", "javascript", "data", "sms")
+MAX_REDIRECT_HOPS = 5
+REINDEX_BATCH_SIZE = 200
+
+STATUS_OK = "ok"
+STATUS_REDIRECT = "redirect"
+STATUS_BROKEN = "broken"
+STATUS_ERROR = "error"
+STATUS_UNCHECKED = "unchecked"
+
+
+class _AnchorParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.links: List[Tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+
+def extract_links(html: Optional[str]) -> List[Tuple[str, str]]:
+    """(href, anchor text) pairs for every <a href> in an HTML fragment"""
+    if not html:
+        return []
+    parser = _AnchorParser()
+    parser.feed(html)
+    parser.close()
+    return [(href.strip(), text) for href, text in parser.links if href and href.strip()]
+
+
+def classify_target(href: str) -> Optional[Tuple[bool, str]]:
+    """(is_internal, normalized target) for a link, or None for links that are not checked
+
+    Internal targets are normalized paths; external ones are absolute URLs
+    without the fragment.
+    """
+    parts = urlsplit(href)
+    if parts.scheme.lower() in SKIPPED_SCHEMES:
+        return None
+    if not parts.scheme and not parts.netloc:
+        if not parts.path:
+            return None  # same-page fragment or query
+        path = parts.path if parts.path.startswith("/") else f"/{parts.path}"
+        return True, normalize_path(unquote(path))
+    if parts.scheme.lower() not in ("http", "https", ""):
+        return None
+    if (parts.hostname or "").lower() in LINK_LOCAL_HOSTS:
+        return True, normalize_path(unquote(parts.path or "/"))
+    scheme = parts.scheme.lower() or "https"
+    return False, urlunsplit((scheme, parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def source_path(source_type: str, slug: str) -> str:
+    return f"/blog/{slug}" if source_type == "blog" else f"/{slug}"
+
+
+class InternalResolver:
+    """Resolves internal paths against one snapshot of published slugs"""
+
+    def __init__(self, db: Session):
+        self.pages = {slug for (slug,) in db.query(Page.slug).filter(Page.is_published == True)}
+        self.blogs = {slug for (slug,) in db.query(Blog.slug).filter(Blog.is_published == True)}
+        if redirect_resolver.needs_reload():
+            redirect_resolver.load(db)
+
+    def _exists(self, path: str) -> bool:
+        if path in LINK_STATIC_ROUTES:
+            return True
+        if path.startswith("/blog/") and path[len("/blog/"):] in self.blogs:
+            return True
+        if path.strip("/") in self.pages:
+            return True
+        relative = path.lstrip("/")
+        for base in IMAGE_SOURCE_DIRS:
+            candidate = (base / relative).resolve()
+            if candidate.is_relative_to(base) and candidate.is_file():
+                return True
+        return False
+
+    def resolve(self, path: str) -> Tuple[str, Optional[str]]:
+        """(status, final target) following redirects a few hops"""
+        current = path
+        for hop in range(MAX_REDIRECT_HOPS + 1):
+            if self._exists(current):
+                return (STATUS_OK, None) if hop == 0 else (STATUS_REDIRECT, current)
+            match = redirect_resolver.resolve(current)
+            if match is None:
+                return STATUS_BROKEN, current if hop else None
+            target = classify_target(match.to_url)
+            if target is None or not target[0]:
+                # Redirected off-site; the redirect itself is what we can vouch for
+                return STATUS_REDIRECT, match.to_url
+            current = target[1]
+        return STATUS_BROKEN, current
+
+
+def index_source(
+    db: Session,
+    source_type: str,
+    source,
+    resolver: Optional[InternalResolver] = None,
+    commit: bool = True
+) -> List[Link]:
+    """Re-index the outgoing links of one page or blog post (replaces its old rows)
+
+    Bulk callers pass one resolver for all sources and commit themselves.
+    """
+    found = extract_links(source.content)
+    if source_type == "page" and getattr(source, "anchor_link", None):
+        found.append((source.anchor_link, source.anchor_text or ""))
+
+    # Keep earlier results for external URLs so a save does not force a recheck
+    external = [t[1] for t in (classify_target(href) for href, _ in found) if t and not t[0]]
+    known = {}
+    if external:
+        for row in db.query(Link).filter(
+            Link.is_internal == False, Link.target_url.in_(external), Link.last_checked_at != None
+        ):
+            known.setdefault(row.target_url, row)
+        known = {
+            url: (row.status, row.status_code, row.resolved_url, row.error, row.last_checked_at)
+            for url, row in known.items()
+        }
+
+    remove_source(db, source_type, source.id, commit=False)
+
+    resolver = resolver or InternalResolver(db)
+    from_path = source_path(source_type, source.slug)
+    links = []
+    seen = set()
+    for href, text in found:
+        target = classify_target(href)
+        if target is None or (target[0], target[1]) in seen:
+            continue
+        seen.add((target[0], target[1]))
+        is_internal, target_url = target
+        link = Link(
+            source_type=source_type,
+            source_id=source.id,
+            source_url=from_path,
+            href=href[:1000],
+            target_url=target_url[:1000],
+            anchor_text=text[:500],
+            is_internal=is_internal,
+            status=STATUS_UNCHECKED
+        )
+        if is_internal:
+            link.status, link.resolved_url = resolver.resolve(target_url)
+            link.last_checked_at = datetime.utcnow()
+        elif target_url in known:
+            link.status, link.status_code, link.resolved_url, link.error, link.last_checked_at = known[target_url]
+        db.add(link)
+        links.append(link)
+
+    if commit:
+        db.commit()
+    return links
+
+
+def remove_source(db: Session, source_type: str, source_id: int, commit: bool = True) -> None:
+    db.query(Link).filter(Link.source_type == source_type, Link.source_id == source_id).delete(synchronize_session=False)
+    if commit:
+        db.commit()
+
+
+def refresh_internal_targets(
+    db: Session,
+    paths: Optional[Iterable[str]] = None,
+    statuses: Optional[Iterable[str]] = None
+) -> int:
+    """Re-resolve internal links, e.g. after a slug, publish state or redirect changed
+
+    With no paths every internal link (optionally only those in some statuses)
+    is re-resolved; it is all in-memory lookups so this stays cheap even for
+    the whole index.
+    """
+    query = db.query(Link).filter(Link.is_internal == True)
+    if statuses is not None:
+        query = query.filter(Link.status.in_(list(statuses)))
+    if paths is not None:
+        normalized = list({normalize_path(path) for path in paths if path})
+        if not normalized:
+            return 0
+        query = query.filter(Link.target_url.in_(normalized))
+
+    resolver = InternalResolver(db)
+    updated = 0
+    now = datetime.utcnow()
+    for link in query.yield_per(500):
+        status, resolved = resolver.resolve(link.target_url)
+        if (status, resolved) != (link.status, link.resolved_url):
+            updated += 1
+        link.status, link.resolved_url, link.last_checked_at = status, resolved, now
+    db.commit()
+    return updated
+
+
+def sync_source_links(db: Session, source_type: str, source, old_path: Optional[str] = None) -> None:
+    """Called after a page/blog is saved: re-index its links and links pointing at it"""
+    index_source(db, source_type, source)
+    refresh_internal_targets(db, [source_path(source_type, source.slug), old_path])
+
+
+def drop_source_links(db: Session, source_type: str, source_id: int, path: str) -> None:
+    """Called after a page/blog is deleted"""
+    remove_source(db, source_type, source_id)
+    refresh_internal_targets(db, [path])
+
+
+def redirects_changed(db: Session) -> int:
+    """Redirect edits only affect links that were broken or already redirected"""
+    redirect_resolver.invalidate()
+    return refresh_internal_targets(db, statuses=[STATUS_BROKEN, STATUS_REDIRECT])
+
+
+def reindex_all(db: Session) -> Dict[str, int]:
+    pages = db.query(Page).options(undefer_group("content")).all()
+    blogs = db.query(Blog).options(undefer_group("content")).all()
+    # One snapshot of slugs for the whole run; sources are committed in batches
+    resolver = InternalResolver(db)
+    count = 0
+    sources = [("page", page) for page in pages] + [("blog", blog) for blog in blogs]
+    for position, (source_type, source) in enumerate(sources, start=1):
+        count += len(index_source(db, source_type, source, resolver, commit=False))
+        if position % REINDEX_BATCH_SIZE == 0:
+            db.commit()
+    db.commit()
+    return {"pages": len(pages), "blogs": len(blogs), "links": count}
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host to at most `rate` per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ExternalLinkChecker:
+    """Checks external URLs concurrently over a pooled client, politely per host"""
+
+    def __init__(
+        self,
+        concurrency: int = LINK_CHECK_CONCURRENCY,
+        per_host_rps: float = LINK_CHECK_PER_HOST_RPS,
+        timeout: float = LINK_CHECK_TIMEOUT_SECONDS
+    ):
+        self.concurrency = max(1, concurrency)
+        self.per_host_rps = per_host_rps
+        self.timeout = timeout
+
+    async def _check(self, client: httpx.AsyncClient, limiter: HostRateLimiter, url: str) -> Dict[str, Any]:
+        await limiter.wait(urlsplit(url).hostname or "")
+        try:
+            response = await client.head(url)
+            if response.status_code in (403, 405, 501):
+                # Some servers reject HEAD; a streamed GET avoids downloading the body
+                await limiter.wait(urlsplit(url).hostname or "")
+                async with client.stream("GET", url) as streamed:
+                    response = streamed
+        except httpx.HTTPError as e:
+            return {"status": STATUS_ERROR, "status_code": None, "error": str(e) or e.__class__.__name__, "resolved_url": None}
+
+        final_url = str(response.url)
+        if response.status_code >= 400:
+            status = STATUS_BROKEN
+        elif final_url.rstrip("/") != url.rstrip("/"):
+            status = STATUS_REDIRECT
+        else:
+            status = STATUS_OK
+        return {
+            "status": status,
+            "status_code": response.status_code,
+            "error": None,
+            "resolved_url": final_url if status == STATUS_REDIRECT else None
+        }
+
+    async def check_urls(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = HostRateLimiter(self.per_host_rps)
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; AstroArupShastri-LinkChecker/1.0)"},
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        ) as client:
+            async def run(url: str) -> Tuple[str, Dict[str, Any]]:
+                async with semaphore:
+                    return url, await self._check(client, limiter, url)
+
+            return dict(await asyncio.gather(*(run(url) for url in urls)))
+
+    async def check_index(self, db: Session, force: bool = False) -> Dict[str, int]:
+        """Check external links that are unchecked or older than LINK_RECHECK_HOURS"""
+        query = db.query(Link.target_url).filter(Link.is_internal == False)
+        if not force:
+            cutoff = datetime.utcnow() - timedelta(hours=LINK_RECHECK_HOURS)
+            query = query.filter((Link.last_checked_at == None) | (Link.last_checked_at < cutoff))
+        urls = [url for (url,) in query.distinct()]
+
+        results = await self.check_urls(urls)
+        now = datetime.utcnow()
+        counts = {STATUS_OK: 0, STATUS_REDIRECT: 0, STATUS_BROKEN: 0, STATUS_ERROR: 0}
+        for url, result in results.items():
+            counts[result["status"]] += 1
+            db.query(Link).filter(Link.is_internal == False, Link.target_url == url).update({
+                Link.status: result["status"],
+                Link.status_code: result["status_code"],
+                Link.resolved_url: result["resolved_url"],
+                Link.error: result["error"],
+                Link.last_checked_at: now
+            }, synchronize_session=False)
+        db.commit()
+        return {"checked": len(results), **counts}
+
+
+external_link_checker = ExternalLinkChecker()
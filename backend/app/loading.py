@@ -0,0 +1,63 @@
+"""
+Relationship loading profiles
+
+Each profile is a tuple of loader options naming the relationships an
+endpoint's response (or the e-mail it sends) reads, so they are fetched
+with the rows instead of lazily, one query per row. Many-to-one
+relationships use joinedload (a single JOIN, safe with LIMIT/OFFSET);
+relationships a response must never touch use raiseload, which turns an
+accidental lazy load into an error instead of a silent N+1.
+
+    db.query(Booking).options(*BOOKING_RESPONSE)
+
+booking_summary_query() is the flat booking list projection: booking
+columns plus service name and price from one joined SELECT.
+"""
+
+from typing import Mapping, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query, Session, joinedload, raiseload
+
+from app.models import Booking, Service, Testimonial
+from app.serialization import FastJSONResponse
+
+# BookingResponse nests the service; confirmation/update e-mails read service.name
+BOOKING_RESPONSE = (joinedload(Booking.service),)
+
+# TestimonialResponse only carries user_id
+TESTIMONIAL_RESPONSE = (raiseload(Testimonial.user),)
+
+BOOKING_SUMMARY_COLUMNS = (
+    Booking.id,
+    Booking.user_id,
+    Booking.service_id,
+    Service.name.label("service_name"),
+    Service.price.label("service_price"),
+    Booking.booking_date,
+    Booking.booking_time,
+    Booking.status,
+    Booking.customer_name,
+    Booking.customer_email,
+    Booking.customer_phone,
+    Booking.created_at,
+)
+
+
+def check_booking_fields(fields: Optional[str]) -> None:
+    """Booking lists accept fields=summary only"""
+    if fields not in (None, "summary"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields must be 'summary' or omitted"
+        )
+
+
+def booking_summary_query(db: Session) -> Query:
+    return db.query(*BOOKING_SUMMARY_COLUMNS).join(Service, Booking.service_id == Service.id)
+
+
+def booking_summary_response(rows, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+    """Rows from booking_summary_query() serialized as BookingSummary items"""
+    names = [column.key for column in BOOKING_SUMMARY_COLUMNS]
+    return FastJSONResponse(content=[dict(zip(names, row)) for row in rows], headers=dict(headers or {}))
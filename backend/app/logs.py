@@ -0,0 +1,229 @@
+"""
+Structured logging
+
+configure_logging() routes every stdlib logger (app.*, uvicorn, sqlalchemy)
+through one bounded in-memory queue. Callers only format the message and
+enqueue it; a QueueListener thread writes JSON lines (LOG_FORMAT=json) or
+plain text to stdout. When the queue is full, records are dropped and
+counted instead of blocking the event loop.
+
+Every record carries the current request id. RequestIdMiddleware takes it
+from an incoming X-Request-ID header (or generates one), stores it in a
+context variable that follows the request into the threadpool, and echoes
+it on the response.
+
+Levels are LOG_LEVEL plus per-logger overrides in LOG_LEVELS
+("app.routers.blogs=DEBUG,sqlalchemy.engine=WARNING"). DEBUG records on hot
+paths are sampled: only LOG_DEBUG_SAMPLE_RATE of them are kept, or the rate
+passed per call with extra=sampled(0.01).
+
+    logger = logging.getLogger(__name__)
+    logger.info("Booking created", extra={"booking_id": booking.id})
+"""
+
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.serialization import dumps
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Loggers that install their own handlers; their records are sent to ours instead
+CAPTURED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# LogRecord attributes (and uvicorn's ANSI-coloured duplicate message);
+# anything else on a record came from extra= and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "sample_rate", "color_message"
+}
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def sampled(rate: float) -> Dict[str, float]:
+    """extra= for a hot-path record kept with probability `rate`"""
+    return {"sample_rate": rate}
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """"a=DEBUG,b.c=WARNING" -> {"a": "DEBUG", "b.c": "WARNING"}"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class ContextFilter(logging.Filter):
+    """Adds request_id and applies debug sampling; runs in the caller's thread"""
+
+    def __init__(self, debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        if rate is None and record.levelno <= logging.DEBUG:
+            rate = self.debug_sample_rate
+        if rate is not None and rate < 1.0 and random.random() >= rate:
+            return False
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra= fields become top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.levelno >= logging.WARNING:
+            entry["where"] = f"{record.module}:{record.lineno}"
+        return dumps(entry).decode()
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or erroring"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render args and the traceback here (frames do not outlive the call);
+        # the listener thread does the JSON formatting and the write
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure_logging(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, fmt: str = LOG_FORMAT,
+                      queue_size: int = LOG_QUEUE_SIZE, stream=None) -> None:
+    """Install the queue handler on the root logger (idempotent)"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    _queue_handler.addFilter(ContextFilter())
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, output)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+
+    for name in CAPTURED_LOGGERS:
+        captured = logging.getLogger(name)
+        captured.handlers = []
+        captured.propagate = True
+    for name, logger_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
+
+class RequestIdMiddleware:
+    """ASGI middleware binding a request id to the request's logs and response"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        request_id = incoming if incoming and _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
@@ -0,0 +1,299 @@
+"""
+Event-loop lag and stall monitor
+
+The async handlers do blocking DB, bcrypt and SMTP work on the event loop,
+and while one of them runs every other request on the worker waits.
+LoopLagMonitor measures that continuously and names the culprit:
+
+- A task on the loop sleeps for LOOP_MONITOR_INTERVAL_MS and records how
+  late it wakes up. `lag` is a time-weighted moving average (used by load
+  shedding) and every sample goes into the event_loop_lag_seconds histogram.
+- A watchdog thread notices when the loop has not woken the task for
+  LOOP_MONITOR_STALL_MS beyond the interval. It then samples the loop
+  thread's Python stack and looks up the request the running task is
+  serving (registered by LoopMonitorMiddleware). When the loop comes back,
+  the stall is recorded with its full duration.
+
+Recent stalls (with stacks) and the routes that stalled the loop most are
+kept per worker and served by the admin API (/api/admin/event-loop), along
+with threadpool and in-flight counts; counters go to /metrics. With
+LOOP_MONITOR_LOG_SECONDS set, the top offenders of each period are logged.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.metrics import Gauge, registry, route_label
+
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_MONITOR_STALL_MS = float(os.getenv("LOOP_MONITOR_STALL_MS", "200"))
+LOOP_MONITOR_KEEP = int(os.getenv("LOOP_MONITOR_KEEP", "100"))
+LOOP_MONITOR_LOG_SECONDS = float(os.getenv("LOOP_MONITOR_LOG_SECONDS", "0"))
+
+# Weight of one interval's sample in the moving average
+LAG_SMOOTHING = 0.3
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_STACK_DEPTH = 40
+TOP_OFFENDERS = 5
+
+logger = logging.getLogger(__name__)
+
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer scheduled every interval", buckets=LAG_BUCKETS
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total", "Event-loop stalls by the route being served", ("route",)
+)
+event_loop_stall_seconds_total = registry.counter(
+    "event_loop_stall_seconds_total", "Time the event loop was stalled, by the route being served", ("route",)
+)
+
+
+def format_stack(frame) -> List[str]:
+    """module:function:line entries, outermost first"""
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        qualname = getattr(code, "co_qualname", code.co_name)
+        stack.append(f"{frame.f_globals.get('__name__', '?')}:{qualname}:{frame.f_lineno}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class Stall:
+    """One period in which the loop did not run its timer"""
+
+    def __init__(self, method: Optional[str], route: str, path: Optional[str], stack: List[str], in_flight: int,
+                 started_at: Optional[datetime] = None):
+        self.started_at = started_at or datetime.utcnow()
+        self.method = method
+        self.route = route
+        self.path = path
+        self.stack = stack
+        self.in_flight = in_flight
+        self.duration = 0.0
+
+    def to_dict(self, stack: bool = True) -> Dict[str, object]:
+        entry = {
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "method": self.method,
+            "route": self.route,
+            "path": self.path,
+            "in_flight": self.in_flight,
+        }
+        if stack:
+            entry["stack"] = self.stack
+        return entry
+
+
+class Offenders:
+    """Stall count and time per route"""
+
+    def __init__(self):
+        self.routes: Dict[str, List[float]] = {}
+
+    def add(self, stall: Stall) -> None:
+        entry = self.routes.setdefault(stall.route, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += stall.duration
+        entry[2] = max(entry[2], stall.duration)
+
+    def top(self, limit: int = TOP_OFFENDERS) -> List[Dict[str, object]]:
+        ranked = sorted(self.routes.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"route": route, "stalls": int(count), "total_ms": round(total * 1000, 2), "max_ms": round(longest * 1000, 2)}
+            for route, (count, total, longest) in ranked
+        ]
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag and attributes stalls to the request being served"""
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL_MS / 1000, stall_threshold: float = LOOP_MONITOR_STALL_MS / 1000,
+                 keep: int = LOOP_MONITOR_KEEP, log_interval: float = LOOP_MONITOR_LOG_SECONDS):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.log_interval = log_interval
+        self.lag = 0.0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.stalls: "deque[Stall]" = deque(maxlen=keep)
+        self.offenders = Offenders()
+        self._period_offenders = Offenders()
+        self._logged_at = time.monotonic()
+        # asyncio task -> ASGI scope of the request it serves (LoopMonitorMiddleware)
+        self.active: Dict[asyncio.Task, dict] = {}
+        self._pending: Optional[Stall] = None
+        self._lock = threading.Lock()
+        self._heartbeat = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._limiter = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def record(self, lag: float, elapsed: float) -> None:
+        lag = max(lag, 0.0)
+        # A sleep that woke 1 s late stands for ten 100 ms intervals, not one
+        weight = min(1.0, LAG_SMOOTHING * elapsed / self.interval)
+        self.lag += (lag - self.lag) * weight
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        event_loop_lag_seconds.observe(lag)
+
+        with self._lock:
+            stall, self._pending = self._pending, None
+        if stall is not None:
+            stall.duration = lag
+            self.stalls.append(stall)
+            self.offenders.add(stall)
+            self._period_offenders.add(stall)
+            event_loop_stalls_total.inc(stall.route)
+            event_loop_stall_seconds_total.inc(stall.route, amount=lag)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            self.record(now - started - self.interval, now - started)
+            if self.log_interval and time.monotonic() - self._logged_at >= self.log_interval:
+                self.log_offenders()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.stall_threshold / 4):
+            beat = self._heartbeat
+            if self._pending is None and time.perf_counter() - beat - self.interval >= self.stall_threshold:
+                stall = self.capture(since=beat + self.interval)
+                with self._lock:
+                    # Dropped if the loop woke up meanwhile; record() would not see it
+                    if self._heartbeat == beat:
+                        self._pending = stall
+
+    def capture(self, since: Optional[float] = None) -> Stall:
+        """What the loop thread is doing right now (called from the watchdog)
+
+        `since` is the perf_counter() time the loop was due to run the timer.
+        """
+        frame = sys._current_frames().get(self._loop_thread)
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        scope = self.active.get(task) if task is not None else None
+        if scope is not None:
+            method, route, path = scope.get("method"), route_label(scope, 200), scope.get("path")
+        else:
+            method, route, path = None, "(no request)", None
+        started_at = datetime.utcnow() - timedelta(seconds=time.perf_counter() - since) if since is not None else None
+        return Stall(method, route, path, format_stack(frame) if frame is not None else [], len(self.active), started_at)
+
+    def log_offenders(self) -> None:
+        self._logged_at = time.monotonic()
+        period, self._period_offenders = self._period_offenders, Offenders()
+        if period.routes:
+            top = period.top()
+            logger.warning(
+                "Event loop stalled by %s (%d ms over %d stalls) in the last %g s",
+                top[0]["route"], top[0]["total_ms"], top[0]["stalls"], self.log_interval,
+                extra={"offenders": top},
+            )
+
+    def start(self) -> None:
+        """Start measuring on the running loop (call from the lifespan handler)"""
+        if self._task is not None and not self._task.done():
+            return
+        from anyio.to_thread import current_default_thread_limiter
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._limiter = current_default_thread_limiter()
+        self._heartbeat = time.perf_counter()
+        self._task = self._loop.create_task(self._run(), name="loop-lag-monitor")
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def saturation(self) -> Dict[str, int]:
+        busy, size = (self._limiter.borrowed_tokens, int(self._limiter.total_tokens)) if self._limiter else (0, 0)
+        return {"in_flight": len(self.active), "threadpool_busy": busy, "threadpool_size": size}
+
+    def reset(self) -> None:
+        self.stalls.clear()
+        self.offenders = Offenders()
+        self.max_lag = 0.0
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self.running,
+            "lag_ms": round(self.lag * 1000, 2),
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "samples": self.samples,
+            "stalls": len(self.stalls),
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            **self.saturation(),
+        }
+
+
+loop_monitor = LoopLagMonitor()
+
+
+def _collect_loop():
+    lag = Gauge("event_loop_lag_smoothed_seconds", "Moving average of event-loop lag")
+    lag.set(loop_monitor.lag)
+    threads = Gauge("threadpool_threads", "Threadpool (run_in_threadpool / sync handlers) threads by state", ("state",))
+    saturation = loop_monitor.saturation()
+    threads.set(saturation["threadpool_busy"], "busy")
+    threads.set(saturation["threadpool_size"] - saturation["threadpool_busy"], "idle")
+    return [lag, threads]
+
+
+registry.add_collector(_collect_loop)
+
+
+class LoopMonitorMiddleware:
+    """ASGI middleware telling the monitor which request each task is serving"""
+
+    def __init__(self, app, monitor: LoopLagMonitor = loop_monitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        self.monitor.active[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.active.pop(task, None)
@@ -0,0 +1,314 @@
+"""
+Prometheus metrics
+
+A small in-process registry (counters, gauges, histograms with labels)
+rendered in the Prometheus text exposition format on GET /metrics.
+MetricsMiddleware records per-route request counts, latency and in-flight
+requests, plus the number of queries and DB time of each request (from
+app.querylog); instrument_engine() adds DB pool checkout wait. Cache hit ratios and pool usage are read from the
+caches and engine when the endpoint is scraped.
+
+Routes are labelled with their path template (/api/blogs/{blog_id}), so
+label cardinality stays bounded. Counts are per worker process; Prometheus
+sums them across workers. Set METRICS_TOKEN to require
+`Authorization: Bearer <token>` on the endpoint.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.responses import Response
+
+from app.querylog import begin_query_log, end_query_log
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_PATH = "/metrics"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Starlette appends "; charset=utf-8" to text/ media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count) in self._values.items())
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Metrics plus collectors that produce gauges at scrape time"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+http_requests_in_flight.set(0)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",), QUERY_COUNT_BUCKETS
+)
+db_time_per_request_seconds = registry.histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per HTTP request", ("route",)
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a connection from the pool", buckets=POOL_WAIT_BUCKETS
+)
+
+def route_label(scope, status_code: int) -> str:
+    """The matched route's path template; static mounts and the like share one label"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path:
+        return path
+    return "unmatched" if status_code == 404 else "other"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, latency, in-flight and queries per request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        # Shared with QueryLogMiddleware; filled by app.querylog.instrument_queries
+        log, token = begin_query_log()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            end_query_log(token)
+            route = route_label(scope, status_code)
+            method = scope["method"]
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            db_queries_per_request.observe(log.count, route)
+            db_time_per_request_seconds.observe(log.total_time, route)
+
+
+def instrument_engine(engine) -> None:
+    """Time pool checkouts and report pool usage for `engine`
+
+    Per-request query counts need app.querylog.instrument_queries(engine) as well.
+    """
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+    def collect_pool():
+        gauge = Gauge("db_pool_connections", "Pooled DB connections by state", ("state",))
+        if hasattr(pool, "checkedout"):
+            gauge.set(pool.checkedout(), "checked_out")
+        if hasattr(pool, "checkedin"):
+            gauge.set(pool.checkedin(), "idle")
+        if hasattr(pool, "overflow"):
+            gauge.set(max(pool.overflow(), 0), "overflow")
+        return [gauge]
+
+    registry.add_collector(collect_pool)
+
+
+_caches: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict]) -> None:
+    """Export hits/misses/hit ratio from a cache whose stats() reports hits and misses"""
+    _caches[name] = stats
+
+
+def _collect_caches():
+    hits = Counter("cache_hits_total", "Cache hits", ("cache",))
+    misses = Counter("cache_misses_total", "Cache misses", ("cache",))
+    ratio = Gauge("cache_hit_ratio", "Cache hits / lookups since start", ("cache",))
+    entries = Gauge("cache_entries", "Entries currently cached", ("cache",))
+    for name, stats in sorted(_caches.items()):
+        values = stats()
+        hit_count, miss_count = values.get("hits", 0), values.get("misses", 0)
+        hits.inc(name, amount=hit_count)
+        misses.inc(name, amount=miss_count)
+        ratio.set(hit_count / (hit_count + miss_count) if hit_count + miss_count else 0.0, name)
+        if "entries" in values:
+            entries.set(values["entries"], name)
+    return [hits, misses, ratio, entries]
+
+
+registry.add_collector(_collect_caches)
+
+
+def metrics_response(authorization: Optional[str] = None) -> Response:
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        return Response("Unauthorized\n", status_code=401, media_type="text/plain")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
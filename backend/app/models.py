@@ -2,10 +2,12 @@
 SQLAlchemy models for the astrology website
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Enum, Index, Computed
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
+from app.images import stored_picture
+from app.json_columns import JSONData, json_text
 import enum
 from datetime import datetime
 
@@ -52,7 +54,7 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     username = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
-    full_name = Column(String(255), nullable=False)
+    full_name = Column(String(255), index=True, nullable=False)
     phone = Column(String(20))
     role = Column(Enum(UserRole), default=UserRole.USER)
     is_active = Column(Boolean, default=False)  # Changed to False for email verification
@@ -81,6 +83,7 @@ class Service(Base):
     duration_minutes = Column(Integer, default=60)
     is_active = Column(Boolean, default=True)
     image_url = Column(String(500))
+    image_manifest = Column(JSONData)  # Variants of image_url, written when it is optimized
     features = Column(Text)  # JSON string of features
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -88,6 +91,11 @@ class Service(Base):
     # Relationships
     bookings = relationship("Booking", back_populates="service")
 
+    @property
+    def image_variants(self):
+        """Responsive AVIF/WebP variants of image_url, once optimized"""
+        return stored_picture(self.image_url, self.image_manifest)
+
 # Booking Model
 class Booking(Base):
     __tablename__ = "bookings"
@@ -119,11 +127,13 @@ class Page(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, index=True, nullable=False)
-    content = Column(Text, nullable=False)
+    # Large text is deferred: undefer_group("content") where the body is needed
+    content = deferred(Column(Text, nullable=False), group="content")
     excerpt = Column(Text)
     anchor_text = Column(String(255))  # Internal linking anchor text
     anchor_link = Column(String(500))  # URL for the anchor text
     banner_image = Column(String(500))  # Banner/hero image for the page
+    banner_image_manifest = Column(JSONData)  # Variants of banner_image, written when it is optimized
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
@@ -132,6 +142,11 @@ class Page(Base):
     # Relationships
     seo = relationship("SEO", back_populates="page", uselist=False)
 
+    @property
+    def banner_image_variants(self):
+        """Responsive AVIF/WebP variants of banner_image, once optimized"""
+        return stored_picture(self.banner_image, self.banner_image_manifest)
+
 # Blog Model
 class Blog(Base):
     __tablename__ = "blogs"
@@ -140,8 +155,9 @@ class Blog(Base):
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, index=True, nullable=False)
     description = Column(Text, nullable=False)
-    content = Column(Text)  # Rich HTML content from Quill editor
+    content = deferred(Column(Text), group="content")  # Rich HTML content from Quill editor (deferred)
     featured_image = Column(String(500))
+    featured_image_manifest = Column(JSONData)  # Variants of featured_image, written when it is optimized
     is_published = Column(Boolean, default=False)
     published_at = Column(DateTime)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -152,6 +168,11 @@ class Blog(Base):
     # Relationships
     seo = relationship("SEO", back_populates="blog", uselist=False)
 
+    @property
+    def featured_image_variants(self):
+        """Responsive AVIF/WebP variants of featured_image, once optimized"""
+        return stored_picture(self.featured_image, self.featured_image_manifest)
+
 # FAQ Model
 class FAQ(Base):
     __tablename__ = "faqs"
@@ -196,6 +217,19 @@ class Redirect(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+# Redirect Rule Model (pattern-based redirects, e.g. /blog/:slug -> /articles/:slug)
+class RedirectRule(Base):
+    __tablename__ = "redirect_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    pattern = Column(String(500), nullable=False, unique=True)
+    replacement = Column(String(500), nullable=False)
+    redirect_type = Column(Integer, default=301)  # 301, 302, 307, 308
+    is_active = Column(Boolean, default=True)
+    description = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
 # Panchang Model
 class Panchang(Base):
     __tablename__ = "panchang"
@@ -261,6 +295,146 @@ class SEO(Base):
     page = relationship("Page", back_populates="seo")
     blog = relationship("Blog", back_populates="seo")
 
+# SEO Meta Model (per-path meta tags managed from the SEO admin, keyed by normalized URL path)
+class SEOMeta(Base):
+    __tablename__ = "seo_meta"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_url = Column(String(500), nullable=False, unique=True, index=True)
+    title = Column(String(255))
+    meta_description = Column(String(500))
+    meta_keywords = Column(String(500))
+    canonical_url = Column(String(500))
+    robots = Column(String(100), default="index, follow")
+    og_title = Column(String(255))
+    og_description = Column(String(500))
+    og_image = Column(String(500))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# SEO Schema Model (JSON-LD blocks attached to a path)
+class SEOSchema(Base):
+    __tablename__ = "seo_schemas"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_url = Column(String(500), nullable=False, index=True)
+    schema_type = Column(String(100))
+    schema_data = Column(Text, nullable=False)  # JSON-LD structured data
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# SEO URL Model (custom slugs and canonical control per path)
+class SEOUrl(Base):
+    __tablename__ = "seo_urls"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_url = Column(String(500), nullable=False, unique=True, index=True)
+    custom_slug = Column(String(255))
+    canonical_url = Column(String(500))
+    redirect_from = Column(Text)  # JSON array of old paths
+    redirect_to = Column(String(500))
+    redirect_type = Column(Integer, default=301)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# Sitemap Entry Model
+class SitemapEntry(Base):
+    __tablename__ = "sitemap_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(500), nullable=False, unique=True, index=True)
+    last_modified = Column(DateTime)
+    change_frequency = Column(String(20), default="weekly")
+    priority = Column(Float, default=0.5)
+    page_type = Column(String(50), default="page")
+    include_images = Column(Boolean, default=False)
+    include_categories = Column(Boolean, default=False)
+    include_tags = Column(Boolean, default=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# SEO Setting Model (global key/value settings, values stored as JSON)
+class SEOSetting(Base):
+    __tablename__ = "seo_settings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(100), nullable=False, unique=True, index=True)
+    value = Column(Text)  # JSON encoded value
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# SEO Image Model (media tracked by the SEO admin image optimizer)
+class SEOImage(Base):
+    __tablename__ = "seo_images"
+
+    id = Column(Integer, primary_key=True, index=True)
+    image_url = Column(String(500), nullable=False, unique=True, index=True)
+    alt_text = Column(String(500))
+    title_attribute = Column(String(255))
+    caption = Column(String(500))
+    page_url = Column(String(500), index=True)
+    file_size = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+    optimized_size = Column(Integer)
+    content_hash = Column(String(64))  # key of the variant directory in the image cache
+    is_optimized = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# Performance Report Model (one row per page per audit run)
+class PerformanceReport(Base):
+    __tablename__ = "performance_reports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String(36), index=True)  # groups pages audited together
+    page_url = Column(String(500), nullable=False, index=True)
+    base_url = Column(String(500))
+    is_mobile = Column(Boolean, default=False)
+    status_code = Column(Integer)
+    load_time = Column(Integer)  # ms, document + subresources
+    ttfb = Column(Integer)  # ms
+    html_size = Column(Integer)
+    total_transfer_size = Column(Integer)
+    image_weight = Column(Integer)
+    script_weight = Column(Integer)
+    stylesheet_weight = Column(Integer)
+    request_count = Column(Integer)
+    render_blocking_count = Column(Integer)
+    performance_score = Column(Integer)
+    accessibility_score = Column(Integer)
+    best_practices_score = Column(Integer)
+    seo_score = Column(Integer)
+    error = Column(Text)
+    details = Column(Text)  # JSON: resources, findings, recommendations, regressions
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Link Model (outgoing links of pages and blog posts, maintained by app.links)
+class Link(Base):
+    __tablename__ = "links"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_type = Column(String(20), nullable=False)  # "page" or "blog"
+    source_id = Column(Integer, nullable=False)
+    source_url = Column(String(500), nullable=False)
+    href = Column(String(1000), nullable=False)  # as written in the content
+    target_url = Column(String(1000), nullable=False, index=True)  # normalized path or absolute URL
+    anchor_text = Column(String(500))
+    is_internal = Column(Boolean, default=True)
+    status = Column(String(20), default="unchecked", index=True)  # ok, redirect, broken, error, unchecked
+    status_code = Column(Integer)
+    resolved_url = Column(String(1000))
+    error = Column(Text)
+    last_checked_at = Column(DateTime)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_links_source", "source_type", "source_id"),
+    )
+
 # User Verification Token Model
 class UserVerification(Base):
     __tablename__ = "user_verifications"
@@ -302,10 +476,19 @@ class Kundli(Base):
     yoga = Column(String(100))
     karan = Column(String(100))
     
-    # Planetary positions (JSON)
-    planetary_positions = Column(Text)  # JSON string
-    house_positions = Column(Text)  # JSON string
-    aspects = Column(Text)  # JSON string
+    # Planetary positions (native JSON; the "chart" group is deferred)
+    planetary_positions = deferred(Column(JSONData), group="chart")  # {"Sun": "Aries", ...}
+    house_positions = deferred(Column(JSONData), group="chart")
+    aspects = deferred(Column(JSONData), group="chart")
+    
+    # Planet-in-sign, generated from planetary_positions so charts can be filtered by index
+    mars_sign = Column(String(50), Computed(json_text("planetary_positions", "Mars")), index=True)
+    mercury_sign = Column(String(50), Computed(json_text("planetary_positions", "Mercury")), index=True)
+    jupiter_sign = Column(String(50), Computed(json_text("planetary_positions", "Jupiter")), index=True)
+    venus_sign = Column(String(50), Computed(json_text("planetary_positions", "Venus")), index=True)
+    saturn_sign = Column(String(50), Computed(json_text("planetary_positions", "Saturn")), index=True)
+    rahu_sign = Column(String(50), Computed(json_text("planetary_positions", "Rahu")), index=True)
+    ketu_sign = Column(String(50), Computed(json_text("planetary_positions", "Ketu")), index=True)
     
     # Doshas
     mangal_dosha = Column(Boolean, default=False)
@@ -313,7 +496,7 @@ class Kundli(Base):
     shani_dosha = Column(Boolean, default=False)
     
     # Report data
-    report_data = Column(Text)  # JSON string with full report
+    report_data = deferred(Column(JSONData), group="chart")  # Full report
     chart_type = Column(String(20), default="south_indian")  # north_indian, south_indian, east_indian
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -350,10 +533,10 @@ class Matching(Base):
     compatibility_percentage = Column(Float, default=0.0)
     compatibility_level = Column(String(20))  # Excellent, Good, Average, Poor
     
-    # Detailed analysis
-    detailed_analysis = Column(Text)  # JSON string with detailed compatibility report
-    recommendations = Column(Text)
-    remedies = Column(Text)
+    # Detailed analysis (the "analysis" group is deferred)
+    detailed_analysis = deferred(Column(JSONData), group="analysis")  # Detailed compatibility report
+    recommendations = deferred(Column(JSONData), group="analysis")  # List of recommendations
+    remedies = deferred(Column(JSONData), group="analysis")  # List of remedies
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -386,12 +569,12 @@ class Numerology(Base):
     lucky_days = Column(String(100))  # comma-separated
     lucky_stones = Column(String(100))  # comma-separated
     
-    # Predictions
-    personality_traits = Column(Text)
-    career_guidance = Column(Text)
-    relationship_compatibility = Column(Text)
-    health_predictions = Column(Text)
-    financial_outlook = Column(Text)
+    # Predictions (the "predictions" group is deferred)
+    personality_traits = deferred(Column(Text), group="predictions")
+    career_guidance = deferred(Column(Text), group="predictions")
+    relationship_compatibility = deferred(Column(Text), group="predictions")
+    health_predictions = deferred(Column(Text), group="predictions")
+    financial_outlook = deferred(Column(Text), group="predictions")
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -481,14 +664,14 @@ class PanchangDetail(Base):
     yamaganda_end = Column(String(10))
     
     # Dur Muhurta timings
-    dur_muhurta_timings = Column(Text)  # JSON array of time ranges
+    dur_muhurta_timings = Column(JSONData)  # JSON array of time ranges
     
     # Auspicious timings
-    shubh_muhurta_timings = Column(Text)  # JSON array of auspicious times
+    shubh_muhurta_timings = Column(JSONData)  # JSON array of auspicious times
     
     # Festival and special days
-    festivals = Column(Text)  # JSON array of festivals
-    vratas = Column(Text)  # JSON array of vratas/fasting days
+    festivals = Column(JSONData)  # JSON array of festivals
+    vratas = Column(JSONData)  # JSON array of vratas/fasting days
     
     # Daily predictions
     daily_prediction = Column(Text)
@@ -0,0 +1,173 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+List endpoints keep their skip/limit parameters. Passing `cursor` switches
+to keyset mode: rows are read in (sort key, id) order with a WHERE clause
+that starts right after the last row of the previous page, so page 500
+costs the same as page 1. Start with an empty cursor (`?cursor=`) and
+follow the X-Next-Cursor (or Link rel="next") response header until it is
+absent. Cursors are opaque base64 tokens.
+
+Total counts are only computed when asked for with include_total=true, and
+are cached for PAGINATION_COUNT_TTL_SECONDS per distinct query. The count
+is sent in the X-Total-Count header, so response bodies are unchanged.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import Date, DateTime, and_, func, or_
+from sqlalchemy.orm import Query as SAQuery
+
+from app.tracing import span
+
+PAGINATION_COUNT_TTL_SECONDS = float(os.getenv("PAGINATION_COUNT_TTL_SECONDS", "30"))
+PAGINATION_COUNT_CACHE_SIZE = 512
+
+
+def encode_cursor(key_name: str, sort_value: Any, last_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        value = {"dt": sort_value.isoformat()}
+    elif isinstance(sort_value, date):
+        value = {"d": sort_value.isoformat()}
+    else:
+        value = sort_value
+    raw = json.dumps([key_name, value, last_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_name: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, value, last_id = json.loads(raw)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"]) if "dt" in value else date.fromisoformat(value["d"])
+        if name != key_name or not isinstance(last_id, int):
+            raise ValueError("cursor belongs to a different listing")
+        return value, last_id
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _comparable(sort, dialect_name: str):
+    """SQLite stores DateTime as text with or without fractional seconds;
+    normalize so equal instants compare equal and ordering stays correct"""
+    if dialect_name == "sqlite" and isinstance(getattr(sort, "type", None), DateTime):
+        return func.strftime("%Y-%m-%d %H:%M:%f", sort)
+    return sort
+
+
+class _CountCache:
+    """Small TTL cache of COUNT(*) results keyed by the compiled query"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, query: SAQuery) -> int:
+        compiled = query.statement.compile()
+        key = f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+        with span("cache.get", **{"cache.name": "pagination_count"}) as current:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and now - entry[0] < PAGINATION_COUNT_TTL_SECONDS:
+                    self.hits += 1
+                    current.set_attribute("cache.hit", True)
+                    return entry[1]
+                self.misses += 1
+            current.set_attribute("cache.hit", False)
+            total = query.order_by(None).count()
+            with self._lock:
+                if len(self._entries) >= PAGINATION_COUNT_CACHE_SIZE:
+                    self._entries.clear()
+                self._entries[key] = (now, total)
+            return total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+count_cache = _CountCache()
+
+
+class Pagination:
+    """Dependency adding cursor/include_total to an endpoint that already takes skip/limit"""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; empty for the first page"),
+        include_total: bool = Query(False, description="Send the (cached) total row count in X-Total-Count")
+    ):
+        self.request = request
+        self.response = response
+        self.cursor = cursor
+        self.include_total = include_total
+
+    def paginate(
+        self,
+        query: SAQuery,
+        sort,
+        id_column,
+        skip: int = 0,
+        limit: int = 100,
+        descending: bool = False
+    ) -> List[Any]:
+        """Apply offset or keyset pagination ordered by (sort, id_column)"""
+        if self.include_total:
+            self.response.headers["X-Total-Count"] = str(count_cache.count(query))
+
+        dialect_name = query.session.get_bind().dialect.name
+        sort_key = _comparable(sort, dialect_name)
+        by_id_only = sort is id_column
+        if by_id_only:
+            order = [id_column.desc() if descending else id_column.asc()]
+        else:
+            order = [
+                sort_key.desc() if descending else sort_key.asc(),
+                id_column.desc() if descending else id_column.asc()
+            ]
+
+        limit = max(limit, 0)
+        if self.cursor is None:
+            return query.order_by(*order).offset(max(skip, 0)).limit(limit).all()
+
+        key_name = getattr(sort, "key", None) or getattr(sort, "name", None) or "sort"
+        if self.cursor:
+            sort_value, last_id = decode_cursor(self.cursor, key_name)
+            after_id = id_column < last_id if descending else id_column > last_id
+            if by_id_only:
+                query = query.filter(after_id)
+            else:
+                after_sort = sort_key < sort_value if descending else sort_key > sort_value
+                query = query.filter(or_(after_sort, and_(sort_key == sort_value, after_id)))
+
+        # Entity queries yield the object; column queries (Projection.select) the row tuple
+        width = len(query.column_descriptions)
+        rows = query.add_columns(sort_key, id_column).order_by(*order).limit(limit + 1).all()
+        items = [row[0] if width == 1 else row[:width] for row in rows[:limit]]
+        if len(rows) > limit and limit:
+            sort_value, last_id = rows[limit - 1][width:width + 2]
+            next_cursor = encode_cursor(key_name, sort_value, last_id)
+            self.response.headers["X-Next-Cursor"] = next_cursor
+            next_url = self.request.url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return items
@@ -0,0 +1,252 @@
+"""
+Sampling profiler
+
+StackSampler is a background thread that snapshots every thread's Python
+stack (sys._current_frames) every few milliseconds and counts identical
+stacks. Nothing is traced between samples, so the overhead is one stack walk
+per thread per interval and only while a profile is running. Idle stacks
+(event loop waiting in select, threadpool workers waiting for work) are
+dropped unless asked for, so the output shows where CPU time goes.
+
+Profiles are rendered as collapsed stacks, one `frame;frame;frame count`
+line per distinct stack (root first), which flamegraph.pl, speedscope and
+inferno read directly.
+
+Two ways to take one, both admin-only and off unless PROFILER_ENABLED=true:
+
+- POST /api/admin/profiler/sample?seconds=N profiles the whole worker for N seconds.
+- A request carrying `X-Profile-Token: <token from POST /api/admin/profiler/token>`
+  is profiled by ProfilerMiddleware; the response gets X-Profile-Id and the
+  stacks are kept for GET /api/admin/profiler/profiles/{id}. Other requests
+  the worker serves at the same time appear in that profile too.
+
+Only one profile runs at a time per worker process.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.auth import create_access_token, verify_token
+
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+PROFILER_REQUEST_INTERVAL_MS = float(os.getenv("PROFILER_REQUEST_INTERVAL_MS", "1"))
+PROFILER_MAX_SECONDS = int(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "20"))
+PROFILER_TOKEN_MINUTES = int(os.getenv("PROFILER_TOKEN_MINUTES", "10"))
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_TOKEN_SCOPE = "profile"
+
+MAX_DEPTH = 128
+
+# Leaf frames of a thread that is waiting rather than running Python code
+IDLE_FRAMES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("queue", "get"),
+}
+
+
+class Profile:
+    """Collapsed stack counts from one sampling run"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = datetime.utcnow()
+        self.duration = 0.0
+        self.info: Dict[str, object] = {}
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            **self.info,
+        }
+
+
+_frame_names: Dict[object, str] = {}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    name = _frame_names.get(code)
+    if name is None:
+        qualname = getattr(code, "co_qualname", code.co_name)
+        name = _frame_names[code] = f"{frame.f_globals.get('__name__', '?')}:{qualname}"
+    return name
+
+
+def _is_idle(frame) -> bool:
+    module = frame.f_globals.get("__name__", "")
+    return (module, frame.f_code.co_name) in IDLE_FRAMES
+
+
+class StackSampler:
+    """Background thread counting the Python stacks of every other thread"""
+
+    def __init__(self, interval: float, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.profile = Profile(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = self.profile.stacks
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (not self.include_idle and _is_idle(frame)):
+                continue
+            frames: List[str] = []
+            while frame is not None and len(frames) < MAX_DEPTH:
+                frames.append(_frame_name(frame))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}").replace(" ", "_"))
+            frames.reverse()
+            stacks[";".join(frames)] += 1
+        self.profile.samples += 1
+
+
+# One profile at a time per process
+_profiling = threading.Lock()
+
+
+def start_profile(interval: float, include_idle: bool = False) -> Optional[StackSampler]:
+    """A running sampler, or None when another profile is in progress"""
+    if not _profiling.acquire(blocking=False):
+        return None
+    try:
+        return StackSampler(interval, include_idle).start()
+    except Exception:
+        _profiling.release()
+        raise
+
+
+def stop_profile(sampler: StackSampler) -> Profile:
+    try:
+        return sampler.stop()
+    finally:
+        _profiling.release()
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class ProfileStore:
+    """The last PROFILER_KEEP per-request profiles"""
+
+    def __init__(self, keep: int = PROFILER_KEEP):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+
+    def add(self, profile: Profile, profile_id: Optional[str] = None) -> str:
+        profile_id = profile_id or new_profile_id()
+        with self._lock:
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.keep:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, object]]:
+        with self._lock:
+            items = list(self._profiles.items())
+        return [{"id": profile_id, **profile.summary()} for profile_id, profile in reversed(items)]
+
+
+profile_store = ProfileStore()
+
+
+def create_profile_token(username: str) -> str:
+    # The subject names no user, so the token cannot stand in for an access token
+    return create_access_token(
+        {"sub": f"profile:{username}", "scope": PROFILE_TOKEN_SCOPE}, timedelta(minutes=PROFILER_TOKEN_MINUTES)
+    )
+
+
+def valid_profile_token(token: Optional[str]) -> bool:
+    payload = verify_token(token) if token else None
+    return bool(payload) and payload.get("scope") == PROFILE_TOKEN_SCOPE
+
+
+class ProfilerMiddleware:
+    """ASGI middleware profiling requests that carry a valid X-Profile-Token"""
+
+    def __init__(self, app, enabled: bool = PROFILER_ENABLED, interval: float = PROFILER_REQUEST_INTERVAL_MS / 1000):
+        self.app = app
+        self.enabled = enabled
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get(PROFILE_TOKEN_HEADER)
+        if not token or not valid_profile_token(token):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = start_profile(self.interval)
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The id goes out with the response headers, before the profile is complete
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile = stop_profile(sampler)
+            profile.info = {"method": scope["method"], "path": scope["path"], "status": status_code}
+            profile_store.add(profile, profile_id)
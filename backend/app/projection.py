@@ -0,0 +1,129 @@
+"""
+Sparse field selection for list endpoints
+
+A Projection ties a model to its response schema. `?fields=title,slug` (or
+a named preset such as `?fields=summary`, backed by a slim schema) is
+turned into a load_only() so only those columns are selected, and rows are
+serialized through a subset model built from the full schema's own field
+definitions, so values are formatted exactly as in the full response.
+Without `fields` the endpoint behaves as before, unless the projection has
+a default preset.
+
+Endpoints can instead select() plain columns and return rows_response():
+rows are turned into dicts and encoded once by FastJSONResponse, skipping
+ORM object loading, pydantic validation and jsonable_encoder.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Query, Session, load_only, undefer_group
+
+from app.serialization import FastJSONResponse
+
+
+@lru_cache(maxsize=256)
+def _subset_model(schema: Type[BaseModel], names: Tuple[str, ...]) -> Type[BaseModel]:
+    fields = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names}
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__={"from_attributes": True},
+        **fields
+    )
+
+
+class Projection:
+    """Resolves `fields=` for one model/schema pair and applies it to queries"""
+
+    def __init__(
+        self,
+        model,
+        schema: Type[BaseModel],
+        presets: Optional[Dict[str, Type[BaseModel]]] = None,
+        computed: Optional[Dict[str, Sequence[str]]] = None,
+        default: Optional[str] = None,
+        undefer: Sequence[str] = (),
+        derive: Optional[Dict[str, Callable[[Mapping[str, Any]], Any]]] = None
+    ):
+        self.model = model
+        self.schema = schema
+        self.presets = {name: list(preset.model_fields) for name, preset in (presets or {}).items()}
+        # Schema fields backed by model properties, mapped to the columns they read
+        self.computed = computed or {}
+        self.default = default
+        # Deferred column groups the full schema needs
+        self.undefer = list(undefer)
+        # Computed fields for rows_response(), built from the row's column values
+        self.derive = derive or {}
+        self.columns = {attr.key for attr in sa_inspect(model).column_attrs}
+
+    def resolve(self, fields: Optional[str]) -> Optional[List[str]]:
+        """Requested field names, or None for the full schema"""
+        fields = fields if fields is not None else self.default
+        if not fields:
+            return None
+        if fields in self.presets:
+            return self.presets[fields]
+
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.schema.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown)}"
+            )
+        if "id" in self.schema.model_fields and "id" not in names:
+            names.insert(0, "id")
+        return names
+
+    def _columns_for(self, names: Sequence[str]) -> List[str]:
+        columns = set()
+        for name in names:
+            if name in self.columns:
+                columns.add(name)
+            columns.update(self.computed.get(name, ()))
+        return sorted(columns)
+
+    def apply(self, query: Query, names: Optional[List[str]]) -> Query:
+        if names is None:
+            return query.options(*(undefer_group(group) for group in self.undefer)) if self.undefer else query
+        return query.options(load_only(*(getattr(self.model, name) for name in self._columns_for(names))))
+
+    def select(self, db: Session, names: Optional[List[str]]) -> Query:
+        """A column query for rows_response(); deferred columns are selected when requested"""
+        names = names if names is not None else list(self.schema.model_fields)
+        missing = [name for name in names if name not in self.columns and name not in self.derive]
+        if missing:
+            raise ValueError(f"No column or derive function for {', '.join(missing)}")
+        return db.query(*(getattr(self.model, name) for name in self._columns_for(names)))
+
+    def response(self, rows, names: Optional[List[str]], headers: Optional[Mapping[str, str]] = None):
+        """The rows themselves for the full schema, otherwise a JSONResponse with just `names`
+
+        Headers set on an injected Response (e.g. by Pagination) are not applied
+        to a returned JSONResponse, so pass them along in `headers`.
+        """
+        if names is None:
+            return rows
+        subset = _subset_model(self.schema, tuple(names))
+        return JSONResponse(
+            content=[subset.model_validate(row).model_dump(mode="json") for row in rows],
+            headers=dict(headers or {})
+        )
+
+    def rows_response(self, rows, names: Optional[List[str]], headers: Optional[Mapping[str, str]] = None):
+        """Serialize row tuples from select() with the same names, without validation"""
+        names = names if names is not None else list(self.schema.model_fields)
+        columns = self._columns_for(names)
+        content = []
+        for row in rows:
+            values = dict(zip(columns, row))
+            content.append({
+                name: values[name] if name in values else self.derive[name](values)
+                for name in names
+            })
+        return FastJSONResponse(content=content, headers=dict(headers or {}))
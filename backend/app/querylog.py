@@ -0,0 +1,206 @@
+"""
+Per-request SQL instrumentation and N+1 detection
+
+instrument_queries(engine) hooks SQLAlchemy's cursor events. While a
+QueryLog is active for the current request (begun by QueryLogMiddleware,
+or by MetricsMiddleware when it is installed outside it), every statement
+is recorded with its duration and a fingerprint: the SQL with literals and
+IN-lists collapsed, so the same query with different ids counts as one.
+
+A request that runs one SELECT fingerprint QUERY_LOG_N_PLUS_ONE_THRESHOLD
+times or more most likely lazy-loads a relationship in a loop; it is logged
+as a warning. With QUERY_LOG_HEADERS=true (development) responses also carry
+X-DB-Query-Count, X-DB-Time-Ms and, for suspected N+1s, X-DB-N-Plus-One.
+
+QueryBudget asserts an upper bound on the statements a block of code runs
+and is exposed to pytest as the `query_budget` fixture (backend/conftest.py):
+
+    with query_budget(max_queries=3):
+        client.get("/api/bookings/")
+"""
+
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+QUERY_LOG_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_LOG_N_PLUS_ONE_THRESHOLD", "5"))
+QUERY_LOG_HEADERS = os.getenv("QUERY_LOG_HEADERS", "false").lower() == "true"
+
+logger = logging.getLogger("app.querylog")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """SQL with literals and parameter lists normalized"""
+    statement = _STRING_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _IN_LIST_RE.sub("IN (...)", statement)
+    return _SPACE_RE.sub(" ", statement).strip()
+
+
+class QueryLog:
+    """Statements run while the log is active"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = QUERY_LOG_N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """SELECT fingerprints run at least `threshold` times, most frequent first"""
+        return [
+            (statement, count) for statement, count in self.fingerprints.most_common()
+            if count >= threshold and statement.upper().startswith("SELECT")
+        ]
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def current_query_log() -> Optional[QueryLog]:
+    return _current_log.get()
+
+
+def begin_query_log():
+    """Start a log for this request, or join the one an outer middleware started
+
+    Returns (log, token); pass the token to end_query_log().
+    """
+    log = _current_log.get()
+    if log is not None:
+        return log, None
+    log = QueryLog()
+    return log, _current_log.set(log)
+
+
+def end_query_log(token) -> None:
+    if token is not None:
+        _current_log.reset(token)
+
+
+_budgets: List["QueryBudget"] = []
+
+
+def instrument_queries(engine) -> None:
+    """Record every statement `engine` runs into the active request log and budgets"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _record(conn, statement):
+        started = conn.info.get("query_started")
+        duration = time.perf_counter() - started.pop() if started else 0.0
+        log = _current_log.get()
+        if log is not None:
+            log.record(statement, duration)
+        for budget in _budgets:
+            budget.log.record(statement, duration)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        _record(conn, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # A failed statement still ran (and counts); popping its start keeps later timings paired
+        if context.connection is not None and context.statement is not None:
+            _record(context.connection, context.statement)
+
+
+class QueryLogMiddleware:
+    """ASGI middleware warning about (and in dev, reporting) likely N+1 requests"""
+
+    def __init__(self, app, headers: bool = QUERY_LOG_HEADERS, threshold: int = QUERY_LOG_N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.headers = headers
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log, token = begin_query_log()
+
+        async def send_with_headers(message):
+            if self.headers and message["type"] == "http.response.start":
+                repeated = log.repeated(self.threshold)
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(log.count)
+                headers["X-DB-Time-Ms"] = f"{log.total_time * 1000:.2f}"
+                if repeated:
+                    statement, times = repeated[0]
+                    headers["X-DB-N-Plus-One"] = f"{times}x {statement[:200]}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            end_query_log(token)
+            for statement, times in log.repeated(self.threshold):
+                logger.warning(
+                    "Possible N+1 on %s %s: %d queries (%.1f ms); %dx %s",
+                    scope["method"], scope["path"], log.count, log.total_time * 1000, times, statement[:300]
+                )
+
+
+class QueryBudget:
+    """Context manager failing when the block runs more statements than allowed
+
+    max_queries bounds the total; max_repeats bounds how often any single
+    fingerprint may run (catches N+1 regardless of row count). Statements
+    are counted from every thread, so it works with TestClient.
+    """
+
+    def __init__(self, max_queries: Optional[int] = None, max_repeats: Optional[int] = None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.log = QueryLog()
+
+    def __enter__(self) -> "QueryBudget":
+        _budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _budgets.remove(self)
+        if exc_type is not None:
+            return
+        problems = []
+        if self.max_queries is not None and self.log.count > self.max_queries:
+            problems.append(f"{self.log.count} queries, budget is {self.max_queries}")
+        if self.max_repeats is not None:
+            for statement, count in self.log.fingerprints.most_common():
+                if count > self.max_repeats:
+                    problems.append(f"{count}x (max {self.max_repeats}): {statement}")
+        if problems:
+            statements = "\n".join(f"  {count}x {statement}" for statement, count in self.log.fingerprints.most_common())
+            raise AssertionError("Query budget exceeded: " + "; ".join(problems) + "\nStatements:\n" + statements)
+
+    @property
+    def count(self) -> int:
+        return self.log.count
+
+    @property
+    def fingerprints(self) -> Dict[str, int]:
+        return dict(self.log.fingerprints)
+
+
+def query_budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> QueryBudget:
+    return QueryBudget(max_queries=max_queries, max_repeats=max_repeats)
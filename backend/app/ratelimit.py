@@ -0,0 +1,283 @@
+"""
+Rate limiting for expensive endpoints
+
+RateLimitMiddleware applies a token bucket per rule and client to the
+anonymous-but-expensive routes: login, registration and the password/
+verification e-mails (bcrypt, DB writes, SMTP), kundli generation, matching
+and the calculators. A bucket holds `requests` tokens and refills at
+`requests / seconds` per second, so short bursts pass and sustained abuse
+gets 429 with Retry-After. Allowed responses carry X-RateLimit-Limit and
+X-RateLimit-Remaining.
+
+Clients are keyed by IP address. The authenticated compute rules (kundli,
+matching, calculators) key by user instead when a valid bearer token is
+sent (its `sub`, checked without a DB query); the auth rules never do, so
+a token cannot move a client out of its IP's login bucket. Behind proxies
+set RATE_LIMIT_TRUST_FORWARDED=true and RATE_LIMIT_TRUSTED_PROXIES to the
+number of proxies in front of the app: each appends the address it saw to
+X-Forwarded-For, so the client is that many entries from the right and
+anything further left is whatever the client sent.
+
+Buckets live in process memory by default, i.e. per worker. With
+RATE_LIMIT_BACKEND=redis they are shared through RATE_LIMIT_REDIS_URL (a
+Lua script keeps each take atomic); if Redis is unreachable the worker
+falls back to its own buckets rather than failing requests.
+
+Limits are "requests/seconds" and can be overridden per rule:
+RATE_LIMITS="login=20/60,calculators=120/60".
+"""
+
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from app.auth import verify_token
+from app.metrics import registry
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis not installed; memory backend only
+    aioredis = None
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+
+# Seconds between warnings while Redis is failing
+REDIS_WARNING_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+rate_limited_total = registry.counter(
+    "rate_limited_requests_total", "Requests rejected with 429 by rate limit rule", ("rule",)
+)
+
+
+class Rule(NamedTuple):
+    name: str
+    methods: Tuple[str, ...]
+    paths: Tuple[str, ...]
+    prefix: bool
+    requests: int
+    seconds: float
+    by_user: bool = False
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.seconds
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        path = path.rstrip("/") or "/"
+        if self.prefix:
+            return any(path == p or path.startswith(p + "/") for p in self.paths)
+        return path in self.paths
+
+
+DEFAULT_RULES = [
+    Rule("login", ("POST",), ("/api/auth/login",), False, 10, 60),
+    Rule("register", ("POST",), ("/api/auth/register",), False, 5, 600),
+    Rule("auth_email", ("POST",), ("/api/auth/forgot-password", "/api/auth/resend-verification"), False, 5, 900),
+    Rule("kundli", ("POST",), ("/api/kundli/generate",), False, 30, 60, by_user=True),
+    Rule("matching", ("POST",), ("/api/matching/calculate",), False, 30, 60, by_user=True),
+    Rule("calculators", (), ("/api/calculators",), True, 60, 60, by_user=True),
+]
+
+
+def parse_limits(spec: str, rules: List[Rule] = DEFAULT_RULES) -> List[Rule]:
+    """Rules with "name=requests/seconds" overrides applied"""
+    overrides = {}
+    for item in spec.split(","):
+        name, _, limit = item.partition("=")
+        if not limit.strip():
+            continue
+        requests, _, seconds = limit.partition("/")
+        try:
+            overrides[name.strip()] = (int(requests), float(seconds or 1))
+        except ValueError:
+            raise ValueError(f"RATE_LIMITS entry {item!r} is not name=requests/seconds")
+    return [
+        rule._replace(requests=overrides[rule.name][0], seconds=overrides[rule.name][1]) if rule.name in overrides else rule
+        for rule in rules
+    ]
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+class MemoryBackend:
+    """Token buckets in this process; only touched from the event loop, so unlocked"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, rate: float, now: Optional[float] = None) -> Decision:
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(capacity), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return Decision(True, int(bucket[0]), 0.0)
+        return Decision(False, 0, (1 - bucket[0]) / rate)
+
+    def stats(self) -> Dict[str, int]:
+        return {"keys": len(self._buckets)}
+
+
+# KEYS[1] bucket; ARGV capacity, rate per second, now (seconds)
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by all workers through Redis, with a local fallback"""
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self.client = aioredis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.script = self.client.register_script(_TAKE_SCRIPT)
+        self.fallback = MemoryBackend()
+        self.errors = 0
+        self._warned_at = 0.0
+
+    async def take(self, key: str, capacity: int, rate: float, now: Optional[float] = None) -> Decision:
+        try:
+            allowed, tokens = await self.script(keys=[self.prefix + key], args=[capacity, rate, time.time()])
+        except Exception as e:
+            self.errors += 1
+            if time.monotonic() - self._warned_at > REDIS_WARNING_INTERVAL:
+                self._warned_at = time.monotonic()
+                logger.warning("Rate limit Redis unavailable, using per-worker buckets: %s", e)
+            return await self.fallback.take(key, capacity, rate, now)
+        tokens = float(tokens)
+        if int(allowed):
+            return Decision(True, int(tokens), 0.0)
+        return Decision(False, 0, (1 - tokens) / rate)
+
+    def stats(self) -> Dict[str, int]:
+        return {"errors": self.errors, "fallback_keys": self.fallback.stats()["keys"]}
+
+
+def make_backend(kind: str = RATE_LIMIT_BACKEND):
+    if kind == "redis":
+        if aioredis is not None:
+            return RedisBackend()
+        logger.warning("RATE_LIMIT_BACKEND=redis but the redis package is not installed; using memory")
+        return MemoryBackend()
+    if kind == "memory":
+        return MemoryBackend()
+    raise ValueError(f"RATE_LIMIT_BACKEND must be 'memory' or 'redis', not {kind!r}")
+
+
+def client_address(
+    scope, trust_forwarded: bool = RATE_LIMIT_TRUST_FORWARDED, trusted_proxies: int = RATE_LIMIT_TRUSTED_PROXIES
+) -> str:
+    """The client's IP, taken `trusted_proxies` entries from the right of X-Forwarded-For when trusted"""
+    if trust_forwarded and trusted_proxies > 0:
+        forwarded = [a.strip() for a in ",".join(Headers(scope=scope).getlist("x-forwarded-for")).split(",")]
+        forwarded = [a for a in forwarded if a]
+        if forwarded:
+            # Fewer entries than proxies: the leftmost one was still added by a trusted proxy
+            return forwarded[-min(trusted_proxies, len(forwarded))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def client_key(scope, rule: Rule) -> str:
+    if rule.by_user:
+        authorization = Headers(scope=scope).get("authorization", "")
+        if authorization[:7].lower() == "bearer ":
+            payload = verify_token(authorization[7:])
+            if payload and payload.get("sub"):
+                return f"user:{payload['sub']}"
+    return f"ip:{client_address(scope)}"
+
+
+def match_rule(rules: List[Rule], method: str, path: str) -> Optional[Rule]:
+    for rule in rules:
+        if rule.matches(method, path):
+            return rule
+    return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 once a client's bucket for a rule is empty"""
+
+    def __init__(self, app, enabled: bool = RATE_LIMIT_ENABLED, rules: Optional[List[Rule]] = None, backend=None):
+        self.app = app
+        self.enabled = enabled
+        self.rules = rules if rules is not None else parse_limits(RATE_LIMITS)
+        self.backend = backend
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = match_rule(self.rules, scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.backend is None:
+            self.backend = make_backend()
+        decision = await self.backend.take(f"{rule.name}:{client_key(scope, rule)}", rule.requests, rule.rate)
+        if not decision.allowed:
+            rate_limited_total.inc(rule.name)
+            response = JSONResponse(
+                {"detail": "Too many requests, please retry later"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(max(1, math.ceil(decision.retry_after))),
+                    "X-RateLimit-Limit": str(rule.requests),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(rule.requests)
+                headers["X-RateLimit-Remaining"] = str(decision.remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
@@ -0,0 +1,626 @@
+"""
+Redirect resolution for the Redirect and RedirectRule tables
+
+Exact redirects are kept in a dict keyed by normalized path (O(1) lookup).
+Pattern rules such as ``/blog/:slug`` or ``/old-site/*`` are compiled into a
+segment trie, so a path is resolved in O(path length) regardless of how many
+rules exist. The same resolver is used by the ASGI middleware and by the
+admin ``/redirects/test`` endpoints.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import RedirectResponse
+
+from app.database import SessionLocal
+from app.models import Redirect, RedirectRule
+
+logger = logging.getLogger(__name__)
+
+# How often (seconds) each worker re-reads the tables even without an explicit
+# invalidation, so changes made through another worker are picked up.
+REDIRECT_RELOAD_SECONDS = float(os.getenv("REDIRECT_RELOAD_SECONDS", "60"))
+
+# Paths that are never redirected (admin API must stay reachable)
+REDIRECT_EXCLUDED_PREFIXES = tuple(
+    prefix.strip() for prefix in os.getenv(
+        "REDIRECT_EXCLUDED_PREFIXES", "/api/admin,/api/auth,/docs,/openapi.json"
+    ).split(",") if prefix.strip()
+)
+
+STATUS_LABELS = {
+    301: "Permanent Redirect",
+    302: "Temporary Redirect",
+    303: "See Other",
+    307: "Temporary Redirect",
+    308: "Permanent Redirect",
+}
+VALID_REDIRECT_TYPES = set(STATUS_LABELS)
+
+
+class RedirectMatch(NamedTuple):
+    to_url: str
+    redirect_type: int
+    source: str  # "exact" or "rule"
+    source_id: Optional[int] = None
+
+
+def normalize_path(url: str) -> str:
+    """Reduce a URL or path to the form used as a lookup key"""
+    if not url:
+        return "/"
+    path = urlsplit(url.strip()).path or "/"
+    if not path.startswith("/"):
+        path = "/" + path
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    return path
+
+
+def split_segments(path: str) -> List[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+class _TrieNode:
+    __slots__ = ("literals", "param", "wildcard", "terminal")
+
+    def __init__(self):
+        self.literals: Dict[str, "_TrieNode"] = {}
+        self.param: Optional["_TrieNode"] = None
+        # Wildcard terminal: (rule, param_names) for a trailing "*"
+        self.wildcard: Optional[Tuple["_CompiledRule", List[str]]] = None
+        self.terminal: Optional[Tuple["_CompiledRule", List[str]]] = None
+
+
+class _CompiledRule(NamedTuple):
+    id: Optional[int]
+    pattern: str
+    replacement: str
+    redirect_type: int
+
+
+def validate_pattern(pattern: str) -> Optional[str]:
+    """Return an error message if the pattern is not a valid rule pattern"""
+    if not pattern or not pattern.startswith("/"):
+        return "Pattern must start with '/'"
+    segments = split_segments(normalize_path(pattern))
+    for index, segment in enumerate(segments):
+        if segment == "*" and index != len(segments) - 1:
+            return "'*' is only allowed as the last segment"
+        if segment.startswith(":") and len(segment) == 1:
+            return "Parameter segments need a name, e.g. ':slug'"
+    return None
+
+
+class PatternTrie:
+    """Segment trie of redirect rules
+
+    Literal segments take priority over ``:param`` segments, which take
+    priority over a trailing ``*``.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.size = 0
+
+    def add(self, rule: _CompiledRule):
+        node = self.root
+        names: List[str] = []
+        for segment in split_segments(normalize_path(rule.pattern)):
+            if segment == "*":
+                node.wildcard = (rule, names)
+                self.size += 1
+                return
+            if segment.startswith(":"):
+                names.append(segment[1:])
+                if node.param is None:
+                    node.param = _TrieNode()
+                node = node.param
+            else:
+                node = node.literals.setdefault(segment, _TrieNode())
+        node.terminal = (rule, names)
+        self.size += 1
+
+    def match(self, path: str) -> Optional[Tuple[_CompiledRule, Dict[str, str], str]]:
+        return self._match(self.root, split_segments(path), 0, [])
+
+    def _match(self, node: _TrieNode, segments: List[str], index: int, captured: List[str]):
+        if index == len(segments):
+            if node.terminal:
+                rule, names = node.terminal
+                return rule, dict(zip(names, captured)), ""
+            if node.wildcard:
+                rule, names = node.wildcard
+                return rule, dict(zip(names, captured)), ""
+            return None
+
+        segment = segments[index]
+        child = node.literals.get(segment)
+        if child is not None:
+            found = self._match(child, segments, index + 1, captured)
+            if found:
+                return found
+        if node.param is not None:
+            found = self._match(node.param, segments, index + 1, captured + [segment])
+            if found:
+                return found
+        if node.wildcard:
+            rule, names = node.wildcard
+            return rule, dict(zip(names, captured)), "/".join(segments[index:])
+        return None
+
+
+def apply_replacement(replacement: str, params: Dict[str, str], rest: str) -> str:
+    """Substitute :params and * captured by a rule into its replacement"""
+    parts = urlsplit(replacement)
+    prefix = f"{parts.scheme}://{parts.netloc}" if parts.netloc else ""
+    segments = []
+    for segment in parts.path.split("/"):
+        if segment == "*":
+            segments.append(rest)
+        elif segment.startswith(":") and segment[1:] in params:
+            segments.append(params[segment[1:]])
+        else:
+            segments.append(segment)
+    path = "/".join(segments)
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    result = prefix + path
+    if parts.query:
+        result += "?" + parts.query
+    return result
+
+
+def redirect_status(value: Any) -> Optional[int]:
+    """A redirect_type as a status code (blank means 301), or None if it is not a redirect status"""
+    try:
+        status = int(value or 301)
+    except (TypeError, ValueError):
+        return None
+    return status if status in VALID_REDIRECT_TYPES else None
+
+
+def compile_rule(pattern: str, replacement: str, redirect_type: int = 301, rule_id: Optional[int] = None) -> _CompiledRule:
+    return _CompiledRule(rule_id, pattern, replacement, int(redirect_type or 301))
+
+
+class RedirectResolver:
+    """In-memory redirect map with lazy, invalidation-driven reloads"""
+
+    def __init__(self, reload_seconds: float = REDIRECT_RELOAD_SECONDS):
+        self.reload_seconds = reload_seconds
+        self.exact: Dict[str, Tuple[str, int, Optional[int]]] = {}
+        self.rules = PatternTrie()
+        self.loaded_at: Optional[float] = None
+        self._stale = True
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Mark the map stale; the next request reloads it"""
+        self._generation += 1
+        self._stale = True
+
+    def needs_reload(self) -> bool:
+        if self._stale or self.loaded_at is None:
+            return True
+        return time.monotonic() - self.loaded_at > self.reload_seconds
+
+    def load(self, db) -> None:
+        """Rebuild the map and trie from the database and swap them in
+
+        Rows with an unusable redirect_type or pattern are skipped and logged,
+        so one bad row cannot take every request down with it.
+        """
+        generation = self._generation
+        exact = {}
+        for redirect in db.query(Redirect).filter(Redirect.is_active == True).all():
+            redirect_type = redirect_status(redirect.redirect_type)
+            if redirect_type is None:
+                logger.warning("Skipping redirect %s: invalid redirect_type %r", redirect.id, redirect.redirect_type)
+                continue
+            exact[normalize_path(redirect.from_url)] = (redirect.to_url, redirect_type, redirect.id)
+
+        rules = PatternTrie()
+        for rule in db.query(RedirectRule).filter(RedirectRule.is_active == True).order_by(RedirectRule.id).all():
+            redirect_type = redirect_status(rule.redirect_type)
+            error = validate_pattern(rule.pattern) if redirect_type else f"invalid redirect_type {rule.redirect_type!r}"
+            if error:
+                logger.warning("Skipping redirect rule %s: %s", rule.id, error)
+                continue
+            rules.add(compile_rule(rule.pattern, rule.replacement, redirect_type, rule.id))
+
+        # Swap both structures at once so readers never see a half-built map
+        self.exact, self.rules = exact, rules
+        self.loaded_at = time.monotonic()
+        # Still stale if an invalidation raced with the load; a failed load never gets here
+        self._stale = self._generation != generation
+
+    def reload(self) -> None:
+        with self._lock:
+            if not self.needs_reload():
+                return
+            db = SessionLocal()
+            try:
+                self.load(db)
+            finally:
+                db.close()
+
+    def ensure_loaded(self) -> None:
+        if self.needs_reload():
+            self.reload()
+
+    def resolve(self, url: str) -> Optional[RedirectMatch]:
+        path = normalize_path(url)
+        hit = self.exact.get(path)
+        if hit:
+            to_url, redirect_type, redirect_id = hit
+            return RedirectMatch(to_url, redirect_type, "exact", redirect_id)
+
+        found = self.rules.match(path)
+        if found:
+            rule, params, rest = found
+            return RedirectMatch(apply_replacement(rule.replacement, params, rest), rule.redirect_type, "rule", rule.id)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "exact_redirects": len(self.exact),
+            "pattern_rules": self.rules.size,
+            "stale": self._stale,
+        }
+
+
+redirect_resolver = RedirectResolver()
+
+
+class RedirectMiddleware:
+    """ASGI middleware that answers matching requests with a redirect"""
+
+    def __init__(self, app, resolver: RedirectResolver = redirect_resolver):
+        self.app = app
+        self.resolver = resolver
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope.get("path", "/")
+        if path.startswith(REDIRECT_EXCLUDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if self.resolver.needs_reload():
+            await run_in_threadpool(self.resolver.reload)
+
+        match = self.resolver.resolve(path)
+        if match is None or (not urlsplit(match.to_url).netloc and normalize_path(match.to_url) == normalize_path(path)):
+            await self.app(scope, receive, send)
+            return
+
+        location = match.to_url
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        if query_string and "?" not in location:
+            location = f"{location}?{query_string}"
+
+        response = RedirectResponse(location, status_code=match.redirect_type)
+        await response(scope, receive, send)
+
+
+# ============================================================================
+# BULK IMPORT / EXPORT
+# ============================================================================
+
+IMPORT_BATCH_SIZE = int(os.getenv("REDIRECT_IMPORT_BATCH_SIZE", "500"))
+EXPORT_FIELDS = ["from_url", "to_url", "redirect_type", "is_active", "description"]
+
+
+def _graph_target(to_url: str) -> Optional[str]:
+    """Internal redirect targets continue a chain; external ones end it"""
+    if urlsplit(to_url).netloc:
+        return None
+    return normalize_path(to_url)
+
+
+def load_redirect_graph(db) -> Dict[str, str]:
+    """Map normalized from-path -> normalized internal to-path for active redirects"""
+    graph: Dict[str, str] = {}
+    query = db.query(Redirect.from_url, Redirect.to_url).filter(Redirect.is_active == True)
+    for from_url, to_url in query.yield_per(1000):
+        target = _graph_target(to_url)
+        if target:
+            graph[normalize_path(from_url)] = target
+    return graph
+
+
+def find_redirect_cycle(graph: Dict[str, str], from_url: str, to_url: str) -> Optional[List[str]]:
+    """Return the chain if adding from_url -> to_url would create a loop"""
+    source = normalize_path(from_url)
+    current = _graph_target(to_url)
+    chain = [source]
+    seen = set()
+    while current is not None:
+        chain.append(current)
+        if current == source:
+            return chain
+        if current in seen:
+            # Pre-existing loop that does not involve this row
+            return None
+        seen.add(current)
+        current = graph.get(current)
+    return None
+
+
+def parse_redirect_row(row: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one import row, returning (clean data, error)"""
+    if row.get("_error"):
+        return None, f"Invalid JSON: {row['_error']}"
+    from_url = (row.get("from_url") or "").strip()
+    to_url = (row.get("to_url") or "").strip()
+    if not from_url or not to_url:
+        return None, "from_url and to_url are required"
+    if urlsplit(from_url).netloc or not from_url.startswith("/"):
+        return None, "from_url must be a site-relative path starting with '/'"
+    if not to_url.startswith("/") and urlsplit(to_url).scheme not in ("http", "https"):
+        return None, "to_url must be a path or an http(s) URL"
+
+    redirect_type = redirect_status(row.get("redirect_type"))
+    if redirect_type is None:
+        return None, f"Invalid redirect_type: {row.get('redirect_type')!r}"
+
+    is_active = row.get("is_active", True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() not in ("0", "false", "no", "")
+
+    return {
+        "from_url": normalize_path(from_url),
+        "to_url": to_url,
+        "redirect_type": redirect_type,
+        "is_active": bool(is_active),
+        "description": row.get("description") or "",
+    }, None
+
+
+class RedirectImporter:
+    """Validate rows as they arrive and upsert them in batched transactions"""
+
+    def __init__(self, db, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.graph = load_redirect_graph(db)
+        self.pending: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self.created = 0
+        self.updated = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def add(self, row_number: int, row: Dict[str, Any]) -> None:
+        data, error = parse_redirect_row(row)
+        if error:
+            self.errors.append({"row": row_number, "error": error})
+            return
+
+        if data["is_active"]:
+            cycle = find_redirect_cycle(self.graph, data["from_url"], data["to_url"])
+            if cycle:
+                self.errors.append({"row": row_number, "error": "Redirect loop: " + " -> ".join(cycle)})
+                return
+            target = _graph_target(data["to_url"])
+            if target:
+                self.graph[data["from_url"]] = target
+            else:
+                self.graph.pop(data["from_url"], None)
+        else:
+            self.graph.pop(data["from_url"], None)
+
+        # A later row for the same path replaces an earlier one in the batch
+        self.pending[data["from_url"]] = (row_number, data)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        try:
+            self._write(batch)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            # Retry row by row so one bad row does not sink the whole batch
+            for from_url, item in batch.items():
+                try:
+                    self._write({from_url: item})
+                    self.db.commit()
+                except Exception as e:
+                    self.db.rollback()
+                    self.errors.append({"row": item[0], "error": str(e)})
+
+    def _write(self, batch: Dict[str, Tuple[int, Dict[str, Any]]]) -> None:
+        # Existing rows may have been stored with or without a trailing slash
+        candidates = set(batch) | {path + "/" for path in batch if path != "/"}
+        existing = {
+            normalize_path(redirect.from_url): redirect
+            for redirect in self.db.query(Redirect).filter(Redirect.from_url.in_(candidates)).all()
+        }
+        for from_url, (_, data) in batch.items():
+            redirect = existing.get(from_url)
+            if redirect:
+                for field in ("to_url", "redirect_type", "is_active", "description"):
+                    setattr(redirect, field, data[field])
+                self.updated += 1
+            else:
+                self.db.add(Redirect(**data))
+                self.created += 1
+
+    def finish(self) -> Dict[str, Any]:
+        self.flush()
+        self.errors.sort(key=lambda error: error["row"])
+        return {
+            "success_count": self.created + self.updated,
+            "created_count": self.created,
+            "updated_count": self.updated,
+            "failed_count": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+def iter_csv_rows(text_stream) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Read CSV rows lazily; a header row is optional"""
+    reader = csv.reader(text_stream)
+    fieldnames = ["from_url", "to_url", "redirect_type", "description"]
+    for row_number, values in enumerate(reader, start=1):
+        if not values or not any(value.strip() for value in values):
+            continue
+        if row_number == 1 and "from_url" in [value.strip() for value in values]:
+            fieldnames = [value.strip() for value in values]
+            continue
+        yield row_number, dict(zip(fieldnames, values))
+
+
+class JsonArrayReader:
+    """Walks a JSON document from a text stream, decoding one array element at a time"""
+
+    def __init__(self, text_stream, chunk_size: int = 64 * 1024):
+        self.stream = text_stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # Possibly cut off at the end of the buffer
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"expected ',' or ']' at offset {self.pos - 1}")
+
+    def end(self) -> None:
+        """Fail unless only whitespace is left"""
+        if self.peek():
+            raise ValueError(f"unexpected data after the JSON document at offset {self.pos}")
+
+    def redirects(self) -> Iterator[Any]:
+        """Elements of a top-level array, or of the "redirects" array of a top-level object"""
+        if self.peek() == "[":
+            yield from self.array()
+            self.end()
+            return
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            self.end()
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key == "redirects" and self.peek() == "[":
+                yield from self.array()
+            else:
+                self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                self.end()
+                return
+            if separator != ",":
+                raise ValueError(f"expected ',' or '}}' at offset {self.pos - 1}")
+
+
+def iter_json_rows(text_stream, line_delimited: bool) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Read NDJSON line by line, or a JSON array element by element"""
+    if line_delimited:
+        for row_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = {"_error": str(e)}  # reported per row by parse_redirect_row
+            yield row_number, row if isinstance(row, dict) else {}
+        return
+
+    for row_number, row in enumerate(JsonArrayReader(text_stream).redirects(), start=1):
+        yield row_number, row if isinstance(row, dict) else {}
+
+
+def iter_redirects_export(format: str = "csv", batch_size: int = 1000) -> Iterator[str]:
+    """Stream redirects from a server-side cursor as CSV or a JSON array"""
+    db = SessionLocal()
+    try:
+        columns = [getattr(Redirect, field) for field in EXPORT_FIELDS]
+        rows = db.query(*columns).order_by(Redirect.id).yield_per(batch_size)
+
+        if format == "json":
+            yield "["
+            first = True
+            for row in rows:
+                yield ("" if first else ",") + json.dumps(dict(zip(EXPORT_FIELDS, row)))
+                first = False
+            yield "]"
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
@@ -2,16 +2,18 @@
 Admin router for dashboard analytics and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import func, desc
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.models import User, Booking, Service, Blog, Testimonial, BookingStatus, Horoscope, Panchang, SEO, Page
 from app.schemas import DashboardStats, BookingResponse, ServiceResponse, UserResponse, ServiceCreate, ServiceUpdate, BlogCreate, BlogUpdate, BlogResponse, SEOCreate, SEOUpdate, SEOResponse, PageCreate, PageUpdate, PageResponse, TestimonialCreate, TestimonialUpdate, TestimonialResponse
 from app.auth import get_admin_user
+from app.pagination import Pagination
+from app.loading import BOOKING_RESPONSE, TESTIMONIAL_RESPONSE, check_booking_fields, booking_summary_query, booking_summary_response
 
 router = APIRouter()
 
@@ -39,7 +41,7 @@ async def get_dashboard_stats(
     monthly_bookings = db.query(Booking).filter(Booking.created_at >= current_month_start).count()
     
     # Get recent bookings
-    recent_bookings = db.query(Booking).order_by(desc(Booking.created_at)).limit(10).all()
+    recent_bookings = db.query(Booking).options(*BOOKING_RESPONSE).order_by(desc(Booking.created_at)).limit(10).all()
     
     # Get popular services (by booking count)
     try:
@@ -69,11 +71,12 @@ async def get_dashboard_stats(
 async def get_all_users(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all users (Admin only)"""
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = page.paginate(db.query(User), User.id, User.id, skip, limit)
     return users
 
 @router.get("/users/{user_id}", response_model=UserResponse)
@@ -166,30 +169,28 @@ async def get_booking_summary_report(
     db: Session = Depends(get_db)
 ):
     """Generate booking summary report (Admin only)"""
-    query = db.query(Booking)
+    # Aggregated in one joined query rather than loading each booking's service
+    query = db.query(
+        Service.name,
+        func.count(Booking.id),
+        func.coalesce(func.sum(Service.price), 0)
+    ).join(Booking.service)
     
     if start_date:
         query = query.filter(Booking.created_at >= start_date)
     if end_date:
         query = query.filter(Booking.created_at <= end_date)
     
-    bookings = query.all()
-    
-    # Calculate revenue (if services have prices)
-    total_revenue = sum(booking.service.price for booking in bookings if booking.service.price)
-    
     # Service-wise breakdown
     service_breakdown = {}
-    for booking in bookings:
-        service_name = booking.service.name
-        if service_name not in service_breakdown:
-            service_breakdown[service_name] = {"count": 0, "revenue": 0}
-        service_breakdown[service_name]["count"] += 1
-        if booking.service.price:
-            service_breakdown[service_name]["revenue"] += booking.service.price
+    for service_name, count, revenue in query.group_by(Service.name).all():
+        service_breakdown[service_name] = {"count": count, "revenue": revenue}
+    
+    # Calculate revenue (if services have prices)
+    total_revenue = sum(entry["revenue"] for entry in service_breakdown.values())
     
     return {
-        "total_bookings": len(bookings),
+        "total_bookings": sum(entry["count"] for entry in service_breakdown.values()),
         "total_revenue": total_revenue,
         "service_breakdown": service_breakdown,
         "date_range": {
@@ -203,11 +204,17 @@ async def get_booking_summary_report(
 async def get_all_bookings(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
+    fields: Optional[str] = Query(None, description="'summary' for flat items with the service name/price"),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all bookings (Admin only)"""
-    bookings = db.query(Booking).offset(skip).limit(limit).all()
+    check_booking_fields(fields)
+    if fields:
+        bookings = page.paginate(booking_summary_query(db), Booking.id, Booking.id, skip, limit)
+        return booking_summary_response(bookings, headers=page.response.headers)
+    bookings = page.paginate(db.query(Booking).options(*BOOKING_RESPONSE), Booking.id, Booking.id, skip, limit)
     return bookings
 
 # Services Management
@@ -215,11 +222,12 @@ async def get_all_bookings(
 async def get_all_services(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all services (Admin only)"""
-    services = db.query(Service).offset(skip).limit(limit).all()
+    services = page.paginate(db.query(Service), Service.id, Service.id, skip, limit)
     return services
 
 @router.post("/services", response_model=ServiceResponse)
@@ -298,11 +306,12 @@ async def toggle_service_status(
 async def get_all_blogs(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all blogs (Admin only)"""
-    blogs = db.query(Blog).offset(skip).limit(limit).all()
+    blogs = page.paginate(db.query(Blog).options(undefer_group("content")), Blog.id, Blog.id, skip, limit)
     return blogs
 
 @router.post("/blogs", response_model=BlogResponse)
@@ -395,11 +404,12 @@ async def toggle_blog_status(
 async def get_all_seo(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all SEO data (Admin only)"""
-    seo_data = db.query(SEO).offset(skip).limit(limit).all()
+    seo_data = page.paginate(db.query(SEO), SEO.id, SEO.id, skip, limit)
     return seo_data
 
 @router.post("/seo", response_model=SEOResponse)
@@ -503,10 +513,11 @@ async def get_admin_pages(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    page: Pagination = Depends()
 ):
     """Get all pages for admin management"""
-    pages = db.query(Page).offset(skip).limit(limit).all()
+    pages = page.paginate(db.query(Page).options(undefer_group("content")), Page.id, Page.id, skip, limit)
     return pages
 
 
@@ -517,7 +528,7 @@ async def get_admin_page(
     current_user: User = Depends(get_admin_user)
 ):
     """Get a specific page by ID"""
-    page = db.query(Page).filter(Page.id == page_id).first()
+    page = db.query(Page).options(undefer_group("content")).filter(Page.id == page_id).first()
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
     return page
@@ -606,11 +617,12 @@ async def toggle_admin_page_status(
 async def get_admin_testimonials(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all testimonials for admin management"""
-    testimonials = db.query(Testimonial).offset(skip).limit(limit).all()
+    testimonials = page.paginate(db.query(Testimonial).options(*TESTIMONIAL_RESPONSE), Testimonial.id, Testimonial.id, skip, limit)
     return testimonials
 
 @router.get("/testimonials/{testimonial_id}", response_model=TestimonialResponse)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
+import logging
 import os
 
 from app.database import get_db
@@ -23,6 +24,7 @@ from app.auth import (
 from app.email_service import email_service
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=EmailVerificationResponse)
 async def register(user: UserCreate, request: Request, db: Session = Depends(get_db)):
@@ -65,10 +67,7 @@ async def register(user: UserCreate, request: Request, db: Session = Depends(get
         raise
     except Exception as e:
         # Log and handle unexpected errors
-        import traceback
-        import sys
-        print(f"❌ Registration error: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Registration error: %s", e)
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -2,48 +2,63 @@
 Blogs router for managing blog posts
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from sqlalchemy.orm import Session, undefer_group
+from typing import List, Optional
 from datetime import datetime
+import logging
 
 from app.database import get_db
 from app.models import Blog, User
-from app.schemas import BlogCreate, BlogUpdate, BlogResponse
+from app.schemas import BlogCreate, BlogUpdate, BlogResponse, BlogSummary
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
+from app.projection import Projection
+from app.images import image_pipeline, stored_picture
+from app.links import sync_source_links, drop_source_links, source_path
+from app.search import search_index
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+blog_projection = Projection(
+    Blog, BlogResponse,
+    presets={"summary": BlogSummary},
+    computed={"featured_image_variants": ["featured_image", "featured_image_manifest"]},
+    undefer=["content"],
+    derive={"featured_image_variants": lambda row: stored_picture(row["featured_image"], row["featured_image_manifest"])}
+)
 
 @router.get("/", response_model=List[BlogResponse])
 async def get_blogs(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     published_only: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or 'summary'"),
     db: Session = Depends(get_db)
 ):
     """Get all blog posts"""
+    names = blog_projection.resolve(fields)
     try:
-        query = db.query(Blog)
+        query = blog_projection.select(db, names)
 
         if published_only:
             query = query.filter(Blog.is_published == True)
 
-        blogs = query.order_by(Blog.created_at.desc()).offset(skip).limit(limit).all()
+        blogs = page.paginate(query, Blog.created_at, Blog.id, skip, limit, descending=True)
 
-        # Log for debugging
-        print(f"Found {len(blogs)} blogs")
+        logger.debug("Found %d blogs", len(blogs))
 
-        return blogs
-    except Exception as e:
-        print(f"Error in get_blogs: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        return blog_projection.rows_response(blogs, names, headers=page.response.headers)
+    except Exception:
+        logger.exception("Error in get_blogs")
         raise
 
 @router.get("/{blog_id}", response_model=BlogResponse)
 async def get_blog(blog_id: int, db: Session = Depends(get_db)):
     """Get a specific blog post by ID"""
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    blog = db.query(Blog).options(undefer_group("content")).filter(Blog.id == blog_id).first()
     if not blog:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,7 +74,7 @@ async def get_blog(blog_id: int, db: Session = Depends(get_db)):
 @router.get("/slug/{slug}", response_model=BlogResponse)
 async def get_blog_by_slug(slug: str, db: Session = Depends(get_db)):
     """Get a blog post by slug"""
-    blog = db.query(Blog).filter(Blog.slug == slug, Blog.is_published == True).first()
+    blog = db.query(Blog).options(undefer_group("content")).filter(Blog.slug == slug, Blog.is_published == True).first()
     if not blog:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,6 +90,7 @@ async def get_blog_by_slug(slug: str, db: Session = Depends(get_db)):
 @router.post("/", response_model=BlogResponse)
 async def create_blog(
     blog: BlogCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -90,13 +106,18 @@ async def create_blog(
     db_blog = Blog(**blog.dict(), author_id=current_user.id)
     db.add(db_blog)
     db.commit()
+    sync_source_links(db, "blog", db_blog)
+    search_index.update(db, "blog", db_blog)
     db.refresh(db_blog)
+    # Generate responsive variants after the response is sent
+    background_tasks.add_task(image_pipeline.optimize_quietly, db_blog.featured_image)
     return db_blog
 
 @router.put("/{blog_id}", response_model=BlogResponse)
 async def update_blog(
     blog_id: int,
     blog_update: BlogUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -117,6 +138,7 @@ async def update_blog(
                 detail="Blog post with this slug already exists"
             )
     
+    old_path = source_path("blog", blog.slug)
     update_data = blog_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(blog, field, value)
@@ -126,7 +148,11 @@ async def update_blog(
         blog.published_at = datetime.now()
     
     db.commit()
+    sync_source_links(db, "blog", blog, old_path)
+    search_index.update(db, "blog", blog)
     db.refresh(blog)
+    if "featured_image" in update_data:
+        background_tasks.add_task(image_pipeline.optimize_quietly, blog.featured_image)
     return blog
 
 @router.delete("/{blog_id}")
@@ -143,8 +169,11 @@ async def delete_blog(
             detail="Blog post not found"
         )
     
+    path = source_path("blog", blog.slug)
     db.delete(blog)
     db.commit()
+    drop_source_links(db, "blog", blog_id, path)
+    search_index.remove(db, "blog", blog_id)
     return {"message": "Blog post deleted successfully"}
 
 @router.get("/popular/", response_model=List[BlogResponse])
@@ -153,7 +182,7 @@ async def get_popular_blogs(
     db: Session = Depends(get_db)
 ):
     """Get popular blog posts by view count"""
-    blogs = db.query(Blog).filter(
+    blogs = db.query(Blog).options(undefer_group("content")).filter(
         Blog.is_published == True
     ).order_by(Blog.view_count.desc()).limit(limit).all()
     return blogs
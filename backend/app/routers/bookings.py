@@ -2,34 +2,43 @@
 Bookings router for appointment management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timezone
+import logging
 
 from app.database import get_db
 from app.models import Booking, Service, User, BookingStatus
 from app.schemas import BookingCreate, BookingUpdate, BookingResponse
 from app.auth import get_current_active_user, get_admin_or_editor_user
+from app.pagination import Pagination
+from app.loading import BOOKING_RESPONSE, check_booking_fields, booking_summary_query, booking_summary_response
 from app.email_service import email_service
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.get("/", response_model=List[BookingResponse])
 async def get_bookings(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     status: Optional[BookingStatus] = None,
+    fields: Optional[str] = Query(None, description="'summary' for flat items with the service name/price"),
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Get all bookings (Admin/Editor only)"""
-    query = db.query(Booking)
+    check_booking_fields(fields)
+    query = booking_summary_query(db) if fields else db.query(Booking).options(*BOOKING_RESPONSE)
     
     if status:
         query = query.filter(Booking.status == status)
     
-    bookings = query.offset(skip).limit(limit).all()
+    bookings = page.paginate(query, Booking.id, Booking.id, skip, limit)
+    if fields:
+        return booking_summary_response(bookings, headers=page.response.headers)
     return bookings
 
 @router.get("/my-bookings", response_model=List[BookingResponse])
@@ -38,7 +47,7 @@ async def get_my_bookings(
     db: Session = Depends(get_db)
 ):
     """Get current user's bookings"""
-    bookings = db.query(Booking).filter(Booking.user_id == current_user.id).all()
+    bookings = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.user_id == current_user.id).all()
     return bookings
 
 @router.get("/{booking_id}", response_model=BookingResponse)
@@ -48,7 +57,7 @@ async def get_booking(
     db: Session = Depends(get_db)
 ):
     """Get a specific booking"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,8 +119,7 @@ async def create_booking(
             email_service.send_booking_confirmation(db_booking)
         except Exception as email_error:
             # Log email error but don't fail the booking
-            import sys
-            print(f"⚠️  Email notification failed: {email_error}", file=sys.stderr)
+            logger.warning("Email notification failed: %s", email_error, extra={"booking_id": db_booking.id})
         
         return db_booking
         
@@ -120,10 +128,7 @@ async def create_booking(
         raise
     except Exception as e:
         # Log and handle unexpected errors
-        import traceback
-        import sys
-        print(f"❌ Booking creation error: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Booking creation error: %s", e)
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -139,7 +144,7 @@ async def update_booking(
 ):
     """Update a booking"""
     try:
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        booking = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
         if not booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -175,18 +180,14 @@ async def update_booking(
             try:
                 email_service.send_booking_update(booking, old_status)
             except Exception as email_error:
-                import sys
-                print(f"⚠️  Email notification failed: {email_error}", file=sys.stderr)
+                logger.warning("Email notification failed: %s", email_error, extra={"booking_id": booking.id})
         
         return booking
         
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        import sys
-        print(f"❌ Booking update error: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Booking update error: %s", e, extra={"booking_id": booking_id})
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -200,7 +201,7 @@ async def cancel_booking(
     db: Session = Depends(get_db)
 ):
     """Cancel a booking"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -229,7 +230,7 @@ async def confirm_booking(
     db: Session = Depends(get_db)
 ):
     """Confirm a booking (Admin/Editor only)"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -252,7 +253,7 @@ async def update_booking_status(
     db: Session = Depends(get_db)
 ):
     """Update only the booking status (Admin/Editor only)"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -8,6 +8,8 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 import math
 
+from app.serialization import FastJSONResponse
+
 router = APIRouter()
 
 # Request/Response models
@@ -32,6 +34,10 @@ class CalculatorResponse(BaseModel):
     data: Dict[str, Any]
     message: str
 
+def calculator_response(data: Dict[str, Any], message: str) -> FastJSONResponse:
+    """CalculatorResponse body encoded directly; the payloads are plain JSON data, so re-validating them is skipped"""
+    return FastJSONResponse({"success": True, "data": data, "message": message})
+
 # Zodiac signs and their date ranges
 ZODIAC_SIGNS = {
     "Aries": {"start": (3, 21), "end": (4, 19)},
@@ -553,8 +559,7 @@ async def calculate_kundli(birth_details: BirthDetails):
             "detailed_predictions": predictions
         }
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data=kundli_data,
             message="Kundli calculated successfully with comprehensive details"
         )
@@ -571,8 +576,7 @@ async def calculate_moon_sign_endpoint(birth_details: BirthDetails):
     try:
         moon_sign = calculate_moon_sign(birth_details.birth_date, birth_details.birth_time)
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data={
                 "moon_sign": moon_sign,
                 "description": f"Your moon sign is {moon_sign}. This represents your emotional nature and inner self.",
@@ -593,8 +597,7 @@ async def calculate_ascendant_endpoint(birth_details: BirthDetails):
     try:
         ascendant = calculate_ascendant(birth_details.birth_date, birth_details.birth_time, birth_details.birth_place)
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data={
                 "ascendant": ascendant,
                 "description": f"Your ascendant (rising sign) is {ascendant}. This represents your outward personality and how others see you.",
@@ -615,8 +618,7 @@ async def calculate_dosha(birth_details: BirthDetails):
     try:
         doshas = calculate_doshas(birth_details.birth_date, birth_details.birth_time)
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data=doshas,
             message="Dosha analysis completed successfully"
         )
@@ -633,8 +635,7 @@ async def get_gemstone_recommendations_endpoint(birth_details: BirthDetails):
     try:
         gemstones = get_gemstone_recommendations(birth_details.birth_date, birth_details.birth_time)
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data=gemstones,
             message="Gemstone recommendations generated successfully"
         )
@@ -685,8 +686,7 @@ async def horoscope_matching(male_details: BirthDetails, female_details: BirthDe
             "recommendation": "This is a good match for marriage" if compatibility_score >= 60 else "Consider consulting an astrologer for detailed analysis"
         }
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data=matching_data,
             message="Horoscope matching completed successfully"
         )
@@ -716,8 +716,7 @@ async def calculate_rudraksha(rudraksha_request: RudrakshaRequest):
             "gender": rudraksha_request.gender
         }
         
-        return CalculatorResponse(
-            success=True,
+        return calculator_response(
             data=rudraksha_data,
             message="Rudraksha recommendations generated successfully"
         )
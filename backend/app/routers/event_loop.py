@@ -0,0 +1,39 @@
+"""
+Admin event-loop monitor router (lag, stalls and saturation; see app.loopmonitor)
+"""
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth import get_admin_user
+from app.loopmonitor import loop_monitor
+from app.models import User
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_event_loop(current_user: User = Depends(get_admin_user)):
+    """Lag, worker saturation and the routes that stalled the loop most on this worker (Admin only)"""
+    return {
+        **loop_monitor.stats(),
+        "offenders": loop_monitor.offenders.top(),
+    }
+
+
+@router.get("/stalls")
+async def list_stalls(
+    limit: int = Query(20, ge=1, le=500),
+    route: str = Query(None, description="Only stalls while this route template was served"),
+    stacks: bool = Query(True, description="Include the sampled stack of each stall"),
+    current_user: User = Depends(get_admin_user)
+):
+    """Recent stalls, newest first (Admin only)"""
+    stalls = [stall for stall in reversed(loop_monitor.stalls) if route is None or stall.route == route]
+    return [stall.to_dict(stack=stacks) for stall in stalls[:limit]]
+
+
+@router.delete("/stalls")
+async def reset_stalls(current_user: User = Depends(get_admin_user)):
+    """Forget recorded stalls, offenders and the max lag (Admin only)"""
+    loop_monitor.reset()
+    return {"message": "Event loop stalls cleared"}
@@ -3,6 +3,7 @@ FAQs router for managing frequently asked questions
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -10,6 +11,8 @@ from app.database import get_db
 from app.models import FAQ, User
 from app.schemas import FAQCreate, FAQUpdate, FAQResponse
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
+from app.search import search_index
 
 router = APIRouter()
 
@@ -17,6 +20,7 @@ router = APIRouter()
 async def get_faqs(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     category: Optional[str] = None,
     active_only: bool = True,
     db: Session = Depends(get_db)
@@ -30,7 +34,7 @@ async def get_faqs(
     if category:
         query = query.filter(FAQ.category == category)
     
-    faqs = query.order_by(FAQ.order.asc()).offset(skip).limit(limit).all()
+    faqs = page.paginate(query, func.coalesce(FAQ.order, 0), FAQ.id, skip, limit)
     return faqs
 
 @router.get("/categories")
@@ -64,6 +68,7 @@ async def create_faq(
     db.add(db_faq)
     db.commit()
     db.refresh(db_faq)
+    search_index.update(db, "faq", db_faq)
     return db_faq
 
 @router.put("/{faq_id}", response_model=FAQResponse)
@@ -87,6 +92,7 @@ async def update_faq(
     
     db.commit()
     db.refresh(faq)
+    search_index.update(db, "faq", faq)
     return faq
 
 @router.delete("/{faq_id}")
@@ -105,4 +111,5 @@ async def delete_faq(
     
     db.delete(faq)
     db.commit()
+    search_index.remove(db, "faq", faq_id)
     return {"message": "FAQ deleted successfully"}
@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models import Horoscope, User
 from app.schemas import HoroscopeCreate, HoroscopeResponse
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
 
 router = APIRouter()
 
@@ -27,6 +28,7 @@ async def get_horoscopes(
     date_filter: Optional[date] = None,
     skip: int = 0,
     limit: int = 12,
+    page: Pagination = Depends(),
     db: Session = Depends(get_db)
 ):
     """Get horoscopes with optional filters"""
@@ -39,7 +41,7 @@ async def get_horoscopes(
     if date_filter:
         query = query.filter(Horoscope.date == date_filter)
     
-    horoscopes = query.order_by(Horoscope.date.desc()).offset(skip).limit(limit).all()
+    horoscopes = page.paginate(query, Horoscope.date, Horoscope.id, skip, limit, descending=True)
     return horoscopes
 
 @router.get("/daily", response_model=List[HoroscopeResponse])
@@ -2,20 +2,41 @@
 Kundli generation and management API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session, undefer_group
 from typing import List, Optional
-import json
 import math
 from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.models import Kundli, User
-from app.schemas import KundliCreate, KundliResponse
+from app.schemas import KundliCreate, KundliResponse, KundliSummary
 from app.auth import get_current_user, get_optional_current_user
+from app.tracing import span
+from app.projection import Projection
 
 router = APIRouter(prefix="/kundli", tags=["kundli"])
 
+# The chart list only needs the summary; pass fields=full (or a field list) for chart data
+kundli_projection = Projection(
+    Kundli, KundliResponse,
+    presets={"summary": KundliSummary, "full": KundliResponse},
+    default="summary"
+)
+
+# Indexed columns per planet; all but Sun/Moon are generated from planetary_positions
+PLANET_SIGN_COLUMNS = {
+    'Sun': Kundli.sun_sign,
+    'Moon': Kundli.moon_sign,
+    'Mars': Kundli.mars_sign,
+    'Mercury': Kundli.mercury_sign,
+    'Jupiter': Kundli.jupiter_sign,
+    'Venus': Kundli.venus_sign,
+    'Saturn': Kundli.saturn_sign,
+    'Rahu': Kundli.rahu_sign,
+    'Ketu': Kundli.ketu_sign
+}
+
 # Zodiac signs and their properties
 ZODIAC_SIGNS = {
     'Aries': {'element': 'Fire', 'quality': 'Cardinal', 'ruler': 'Mars', 'dates': (3, 21, 4, 19)},
@@ -264,23 +285,24 @@ async def generate_kundli(
     """Generate a new kundli"""
     try:
         # Calculate astrological elements
-        sun_sign = calculate_sun_sign(kundli_data.birth_date)
-        moon_sign = calculate_moon_sign(kundli_data.birth_date, kundli_data.birth_time)
-        ascendant = calculate_ascendant(
-            kundli_data.birth_date, 
-            kundli_data.birth_time, 
-            kundli_data.latitude or 0, 
-            kundli_data.longitude or 0
-        )
-        nakshatra, nakshatra_pada = calculate_nakshatra(kundli_data.birth_date, kundli_data.birth_time)
-        tithi = calculate_tithi(kundli_data.birth_date)
-        yoga = calculate_yoga(kundli_data.birth_date, kundli_data.birth_time)
-        karan = calculate_karan(kundli_data.birth_date)
-        doshas = check_doshas(kundli_data.birth_date, kundli_data.birth_time, kundli_data.gender)
+        with span("kundli.calculate"):
+            sun_sign = calculate_sun_sign(kundli_data.birth_date)
+            moon_sign = calculate_moon_sign(kundli_data.birth_date, kundli_data.birth_time)
+            ascendant = calculate_ascendant(
+                kundli_data.birth_date, 
+                kundli_data.birth_time, 
+                kundli_data.latitude or 0, 
+                kundli_data.longitude or 0
+            )
+            nakshatra, nakshatra_pada = calculate_nakshatra(kundli_data.birth_date, kundli_data.birth_time)
+            tithi = calculate_tithi(kundli_data.birth_date)
+            yoga = calculate_yoga(kundli_data.birth_date, kundli_data.birth_time)
+            karan = calculate_karan(kundli_data.birth_date)
+            doshas = check_doshas(kundli_data.birth_date, kundli_data.birth_time, kundli_data.gender)
         
-        # Generate planetary positions
-        planetary_positions = generate_planetary_positions(kundli_data.birth_date, kundli_data.birth_time)
-        house_positions = generate_house_positions(planetary_positions, ascendant)
+            # Generate planetary positions
+            planetary_positions = generate_planetary_positions(kundli_data.birth_date, kundli_data.birth_time)
+            house_positions = generate_house_positions(planetary_positions, ascendant)
         
         # Create kundli record
         db_kundli = Kundli(
@@ -303,8 +325,8 @@ async def generate_kundli(
             tithi=tithi,
             yoga=yoga,
             karan=karan,
-            planetary_positions=json.dumps(planetary_positions),
-            house_positions=json.dumps(house_positions),
+            planetary_positions=planetary_positions,
+            house_positions=house_positions,
             mangal_dosha=doshas['mangal_dosha'],
             kaal_sarp_dosha=doshas['kaal_sarp_dosha'],
             shani_dosha=doshas['shani_dosha']
@@ -325,8 +347,9 @@ async def generate_kundli(
             'house_positions': house_positions
         }
         
-        report = generate_kundli_report(kundli_dict, kundli_data.language)
-        db_kundli.report_data = json.dumps(report)
+        with span("kundli.report", **{"kundli.language": kundli_data.language}):
+            report = generate_kundli_report(kundli_dict, kundli_data.language)
+        db_kundli.report_data = report
         
         db.add(db_kundli)
         db.commit()
@@ -340,14 +363,27 @@ async def generate_kundli(
             detail=f"Error generating kundli: {str(e)}"
         )
 
-@router.get("/user", response_model=List[KundliResponse])
+@router.get("/user", response_model=List[KundliSummary])
 async def get_user_kundlis(
+    fields: Optional[str] = Query(None, description="Comma-separated fields, 'summary' (default) or 'full'"),
+    planet: Optional[str] = Query(None, description="Only charts with this planet in `sign`, e.g. Mars"),
+    sign: Optional[str] = Query(None, description="Zodiac sign for `planet`, e.g. Aries"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all kundlis for the current user"""
-    kundlis = db.query(Kundli).filter(Kundli.user_id == current_user.id).all()
-    return kundlis
+    names = kundli_projection.resolve(fields)
+    query = kundli_projection.apply(db.query(Kundli), names)
+    query = query.filter(Kundli.user_id == current_user.id)
+    if planet or sign:
+        if planet not in PLANET_SIGN_COLUMNS or sign not in ZODIAC_SIGNS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"planet must be one of {', '.join(PLANET_SIGN_COLUMNS)} and sign one of {', '.join(ZODIAC_SIGNS)}"
+            )
+        query = query.filter(PLANET_SIGN_COLUMNS[planet] == sign)
+    kundlis = query.order_by(Kundli.id).all()
+    return kundli_projection.response(kundlis, names)
 
 @router.get("/{kundli_id}", response_model=KundliResponse)
 async def get_kundli(
@@ -356,7 +392,7 @@ async def get_kundli(
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """Get a specific kundli by ID"""
-    kundli = db.query(Kundli).filter(Kundli.id == kundli_id).first()
+    kundli = db.query(Kundli).options(undefer_group("chart")).filter(Kundli.id == kundli_id).first()
     
     if not kundli:
         raise HTTPException(
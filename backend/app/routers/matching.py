@@ -3,15 +3,15 @@ Horoscope matching and compatibility API endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from typing import List, Optional
-import json
 import math
 
 from app.database import get_db
 from app.models import Matching, Kundli, User
 from app.schemas import MatchingCreate, MatchingResponse
 from app.auth import get_current_user, get_optional_current_user
+from app.tracing import span
 
 router = APIRouter(prefix="/matching", tags=["matching"])
 
@@ -298,14 +298,15 @@ async def calculate_matching(
             )
         
         # Calculate Ashtakoot scores
-        varna_score = calculate_varna_score(male_kundli.nakshatra, female_kundli.nakshatra)
-        vashya_score = calculate_vashya_score(male_kundli.nakshatra, female_kundli.nakshatra)
-        tara_score = calculate_tara_score(male_kundli.nakshatra, female_kundli.nakshatra)
-        yoni_score = calculate_yoni_score(male_kundli.nakshatra, female_kundli.nakshatra)
-        graha_maitri_score = calculate_graha_maitri_score(male_kundli.moon_sign, female_kundli.moon_sign)
-        gana_score = calculate_gana_score(male_kundli.nakshatra, female_kundli.nakshatra)
-        bhakoot_score = calculate_bhakoot_score(male_kundli.moon_sign, female_kundli.moon_sign)
-        nadi_score = calculate_nadi_score(male_kundli.nakshatra, female_kundli.nakshatra)
+        with span("matching.ashtakoot"):
+            varna_score = calculate_varna_score(male_kundli.nakshatra, female_kundli.nakshatra)
+            vashya_score = calculate_vashya_score(male_kundli.nakshatra, female_kundli.nakshatra)
+            tara_score = calculate_tara_score(male_kundli.nakshatra, female_kundli.nakshatra)
+            yoni_score = calculate_yoni_score(male_kundli.nakshatra, female_kundli.nakshatra)
+            graha_maitri_score = calculate_graha_maitri_score(male_kundli.moon_sign, female_kundli.moon_sign)
+            gana_score = calculate_gana_score(male_kundli.nakshatra, female_kundli.nakshatra)
+            bhakoot_score = calculate_bhakoot_score(male_kundli.moon_sign, female_kundli.moon_sign)
+            nadi_score = calculate_nadi_score(male_kundli.nakshatra, female_kundli.nakshatra)
         
         total_score = (varna_score + vashya_score + tara_score + yoni_score + 
                       graha_maitri_score + gana_score + bhakoot_score + nadi_score)
@@ -334,7 +335,8 @@ async def calculate_matching(
             'nadi': nadi_score
         }
         
-        analysis = generate_compatibility_analysis(scores, matching_data.male_name, matching_data.female_name)
+        with span("matching.analysis"):
+            analysis = generate_compatibility_analysis(scores, matching_data.male_name, matching_data.female_name)
         
         # Create matching record
         db_matching = Matching(
@@ -355,9 +357,9 @@ async def calculate_matching(
             total_score=total_score,
             compatibility_percentage=compatibility_percentage,
             compatibility_level=compatibility_level,
-            detailed_analysis=json.dumps(analysis),
-            recommendations=json.dumps(analysis.get('recommendations', [])),
-            remedies=json.dumps([])  # Can be populated with specific remedies
+            detailed_analysis=analysis,
+            recommendations=analysis.get('recommendations', []),
+            remedies=[]  # Can be populated with specific remedies
         )
         
         db.add(db_matching)
@@ -378,7 +380,7 @@ async def get_user_matchings(
     db: Session = Depends(get_db)
 ):
     """Get all matchings for the current user"""
-    matchings = db.query(Matching).filter(Matching.user_id == current_user.id).all()
+    matchings = db.query(Matching).options(undefer_group("analysis")).filter(Matching.user_id == current_user.id).all()
     return matchings
 
 @router.get("/{matching_id}", response_model=MatchingResponse)
@@ -388,7 +390,7 @@ async def get_matching(
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """Get a specific matching by ID"""
-    matching = db.query(Matching).filter(Matching.id == matching_id).first()
+    matching = db.query(Matching).options(undefer_group("analysis")).filter(Matching.id == matching_id).first()
     
     if not matching:
         raise HTTPException(
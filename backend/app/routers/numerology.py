@@ -3,7 +3,7 @@ Numerology calculations and predictions API endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from typing import List, Optional
 import json
 from datetime import datetime
@@ -366,7 +366,7 @@ async def get_user_numerology(
     db: Session = Depends(get_db)
 ):
     """Get all numerology calculations for the current user"""
-    numerology_records = db.query(Numerology).filter(Numerology.user_id == current_user.id).all()
+    numerology_records = db.query(Numerology).options(undefer_group("predictions")).filter(Numerology.user_id == current_user.id).all()
     return numerology_records
 
 @router.get("/{numerology_id}", response_model=NumerologyResponse)
@@ -376,7 +376,7 @@ async def get_numerology(
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """Get a specific numerology calculation by ID"""
-    numerology = db.query(Numerology).filter(Numerology.id == numerology_id).first()
+    numerology = db.query(Numerology).options(undefer_group("predictions")).filter(Numerology.id == numerology_id).first()
     
     if not numerology:
         raise HTTPException(
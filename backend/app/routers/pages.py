@@ -2,37 +2,53 @@
 Pages router for managing website pages
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from sqlalchemy.orm import Session, undefer_group
+from typing import List, Optional
 
 from app.database import get_db
 from app.models import Page, User
-from app.schemas import PageCreate, PageUpdate, PageResponse
+from app.schemas import PageCreate, PageUpdate, PageResponse, PageSummary
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
+from app.projection import Projection
+from app.images import image_pipeline, stored_picture
+from app.links import sync_source_links, drop_source_links, source_path
+from app.search import search_index
 
 router = APIRouter()
 
+page_projection = Projection(
+    Page, PageResponse,
+    presets={"summary": PageSummary},
+    computed={"banner_image_variants": ["banner_image", "banner_image_manifest"]},
+    undefer=["content"],
+    derive={"banner_image_variants": lambda row: stored_picture(row["banner_image"], row["banner_image_manifest"])}
+)
+
 @router.get("/", response_model=List[PageResponse])
 async def get_pages(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     published_only: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or 'summary'"),
     db: Session = Depends(get_db)
 ):
     """Get all pages"""
-    query = db.query(Page)
+    names = page_projection.resolve(fields)
+    query = page_projection.select(db, names)
     
     if published_only:
         query = query.filter(Page.is_published == True)
     
-    pages = query.offset(skip).limit(limit).all()
-    return pages
+    pages = page.paginate(query, Page.id, Page.id, skip, limit)
+    return page_projection.rows_response(pages, names, headers=page.response.headers)
 
 @router.get("/{page_id}", response_model=PageResponse)
 async def get_page(page_id: int, db: Session = Depends(get_db)):
     """Get a specific page by ID"""
-    page = db.query(Page).filter(Page.id == page_id).first()
+    page = db.query(Page).options(undefer_group("content")).filter(Page.id == page_id).first()
     if not page:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -43,7 +59,7 @@ async def get_page(page_id: int, db: Session = Depends(get_db)):
 @router.get("/slug/{slug}", response_model=PageResponse)
 async def get_page_by_slug(slug: str, db: Session = Depends(get_db)):
     """Get a page by slug"""
-    page = db.query(Page).filter(Page.slug == slug, Page.is_published == True).first()
+    page = db.query(Page).options(undefer_group("content")).filter(Page.slug == slug, Page.is_published == True).first()
     if not page:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,6 +70,7 @@ async def get_page_by_slug(slug: str, db: Session = Depends(get_db)):
 @router.post("/", response_model=PageResponse)
 async def create_page(
     page: PageCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -69,13 +86,18 @@ async def create_page(
     db_page = Page(**page.dict(), author_id=current_user.id)
     db.add(db_page)
     db.commit()
+    sync_source_links(db, "page", db_page)
+    search_index.update(db, "page", db_page)
     db.refresh(db_page)
+    # Generate responsive variants after the response is sent
+    background_tasks.add_task(image_pipeline.optimize_quietly, db_page.banner_image)
     return db_page
 
 @router.put("/{page_id}", response_model=PageResponse)
 async def update_page(
     page_id: int,
     page_update: PageUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -96,12 +118,17 @@ async def update_page(
                 detail="Page with this slug already exists"
             )
     
+    old_path = source_path("page", page.slug)
     update_data = page_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(page, field, value)
     
     db.commit()
+    sync_source_links(db, "page", page, old_path)
+    search_index.update(db, "page", page)
     db.refresh(page)
+    if "banner_image" in update_data:
+        background_tasks.add_task(image_pipeline.optimize_quietly, page.banner_image)
     return page
 
 @router.delete("/{page_id}")
@@ -118,6 +145,9 @@ async def delete_page(
             detail="Page not found"
         )
     
+    path = source_path("page", page.slug)
     db.delete(page)
     db.commit()
+    drop_source_links(db, "page", page_id, path)
+    search_index.remove(db, "page", page_id)
     return {"message": "Page deleted successfully"}
@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models import Panchang, User
 from app.schemas import PanchangCreate, PanchangResponse
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
 
 router = APIRouter()
 
@@ -19,6 +20,7 @@ async def get_panchang(
     date_filter: Optional[date] = None,
     skip: int = 0,
     limit: int = 30,
+    page: Pagination = Depends(),
     db: Session = Depends(get_db)
 ):
     """Get panchang data for a specific date or date range"""
@@ -31,7 +33,7 @@ async def get_panchang(
         today = datetime.now().date()
         query = query.filter(Panchang.date == today)
     
-    panchang_data = query.offset(skip).limit(limit).all()
+    panchang_data = page.paginate(query, Panchang.id, Panchang.id, skip, limit)
     return panchang_data
 
 @router.get("/today", response_model=PanchangResponse)
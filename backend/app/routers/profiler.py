@@ -0,0 +1,83 @@
+"""
+Admin profiler router (collapsed stacks for flame graphs; see app.profiling)
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth import get_admin_user
+from app.models import User
+from app.profiling import (
+    PROFILER_ENABLED, PROFILER_INTERVAL_MS, PROFILER_MAX_SECONDS, PROFILER_TOKEN_MINUTES,
+    PROFILE_TOKEN_HEADER, Profile, create_profile_token, profile_store, start_profile, stop_profile
+)
+
+router = APIRouter()
+
+
+async def require_profiler(current_user: User = Depends(get_admin_user)) -> User:
+    if not PROFILER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiler is disabled (set PROFILER_ENABLED=true)"
+        )
+    return current_user
+
+
+def collapsed_response(profile: Profile) -> PlainTextResponse:
+    return PlainTextResponse(profile.collapsed(), headers={
+        "X-Profile-Samples": str(profile.samples),
+        "X-Profile-Duration-Ms": f"{profile.duration * 1000:.0f}",
+        "Cache-Control": "no-store",
+    })
+
+
+@router.post("/sample", response_class=PlainTextResponse)
+async def sample_worker(
+    seconds: float = Query(10, gt=0, le=PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(PROFILER_INTERVAL_MS, ge=1, le=1000),
+    idle: bool = Query(False, description="Keep stacks of threads that are waiting"),
+    current_user: User = Depends(require_profiler)
+):
+    """Profile this worker process for `seconds` and return collapsed stacks (Admin only)"""
+    sampler = start_profile(interval_ms / 1000, include_idle=idle)
+    if sampler is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running on this worker"
+        )
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = stop_profile(sampler)
+    return collapsed_response(profile)
+
+
+@router.post("/token")
+async def create_token(current_user: User = Depends(require_profiler)):
+    """Token for profiling single requests via the X-Profile-Token header (Admin only)"""
+    return {
+        "token": create_profile_token(current_user.username),
+        "header": PROFILE_TOKEN_HEADER,
+        "expires_in": PROFILER_TOKEN_MINUTES * 60,
+    }
+
+
+@router.get("/profiles")
+async def list_profiles(current_user: User = Depends(require_profiler)):
+    """Recent per-request profiles, newest first (Admin only)"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, current_user: User = Depends(require_profiler)):
+    """Collapsed stacks of one per-request profile (Admin only)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return collapsed_response(profile)
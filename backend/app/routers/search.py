@@ -0,0 +1,59 @@
+"""
+Search router: full-text search over published blogs, pages and active FAQs
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+import time
+
+from app.database import get_db
+from app.models import User
+from app.schemas import SearchResponse
+from app.auth import get_admin_user
+from app.search import search_index, SEARCH_TYPES
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, description="Comma-separated: blog, page, faq"),
+    limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Search blogs, pages and FAQs, ranked by BM25 with highlighted snippets"""
+    types = None
+    if type:
+        types = [part.strip() for part in type.split(",") if part.strip()]
+        unknown = [part for part in types if part not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search type(s): {', '.join(unknown)}"
+            )
+
+    started = time.perf_counter()
+    await run_in_threadpool(search_index.ensure_fresh, db)
+    result = search_index.search(q, types=types, limit=limit, offset=offset)
+    return {
+        "query": q,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        **result
+    }
+
+@router.get("/stats")
+async def search_stats(current_user: User = Depends(get_admin_user)):
+    """Index size (Admin only)"""
+    return search_index.stats()
+
+@router.post("/reindex")
+async def reindex(
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Rebuild the search index from the database (Admin only)"""
+    documents = await run_in_threadpool(search_index.rebuild, db)
+    return {"message": "Search index rebuilt", "documents": documents}
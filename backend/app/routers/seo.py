@@ -2,26 +2,33 @@
 SEO router for managing meta tags, titles, descriptions, and sitemap
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+import os
 
 from app.database import get_db
 from app.models import SEO, Page, Blog, User
-from app.schemas import SEOCreate, SEOUpdate, SEOResponse
+from app.schemas import SEOCreate, SEOUpdate, SEOResponse, SEOBatchRequest, SEOBatchResponse
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
+from app.seo_cache import seo_lookup_cache
 
 router = APIRouter()
 
+SEO_BATCH_MAX_SLUGS = int(os.getenv("SEO_BATCH_MAX_SLUGS", "1000"))
+
 @router.get("/", response_model=List[SEOResponse])
 async def get_seo_data(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     db: Session = Depends(get_db)
 ):
     """Get all SEO data"""
-    seo_data = db.query(SEO).offset(skip).limit(limit).all()
+    seo_data = page.paginate(db.query(SEO), SEO.id, SEO.id, skip, limit)
     return seo_data
 
 @router.get("/page/{page_slug}", response_model=SEOResponse)
@@ -62,6 +69,62 @@ async def get_seo_by_blog_slug(blog_slug: str, db: Session = Depends(get_db)):
     
     return seo_data
 
+@router.post("/batch", response_model=SEOBatchResponse)
+async def get_seo_batch(request: SEOBatchRequest, db: Session = Depends(get_db)):
+    """Get SEO data for many page and blog slugs in one round trip
+
+    Every requested slug appears in the response; slugs without a page/blog or
+    without an SEO row map to null. All records come from a single joined query.
+    """
+    page_slugs = list(dict.fromkeys(request.pages))
+    blog_slugs = list(dict.fromkeys(request.blogs))
+    if len(page_slugs) + len(blog_slugs) > SEO_BATCH_MAX_SLUGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {SEO_BATCH_MAX_SLUGS} slugs can be requested at once"
+        )
+
+    result = {
+        "pages": {slug: None for slug in page_slugs},
+        "blogs": {slug: None for slug in blog_slugs}
+    }
+    if not page_slugs and not blog_slugs:
+        return result
+
+    rows = (
+        db.query(SEO, Page.slug, Blog.slug)
+        .outerjoin(Page, SEO.page_id == Page.id)
+        .outerjoin(Blog, SEO.blog_id == Blog.id)
+        .filter(or_(Page.slug.in_(page_slugs), Blog.slug.in_(blog_slugs)))
+        .order_by(SEO.id)
+        .all()
+    )
+    for seo_data, page_slug, blog_slug in rows:
+        # Keep the first SEO row per slug, matching the single-slug endpoints
+        if page_slug in result["pages"] and result["pages"][page_slug] is None:
+            result["pages"][page_slug] = seo_data
+        if blog_slug in result["blogs"] and result["blogs"][blog_slug] is None:
+            result["blogs"][blog_slug] = seo_data
+
+    return result
+
+@router.get("/resolve")
+async def resolve_seo(path: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Resolve stored meta tags and JSON-LD for a page path (cached per path)
+
+    Supports conditional requests: an If-None-Match matching the current ETag
+    returns 304 so SSR callers can revalidate without re-downloading.
+    """
+    payload = seo_lookup_cache.get(db, path)
+    etag = f'"{payload["etag"]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return payload
+
 @router.post("/", response_model=SEOResponse)
 async def create_seo_data(
     seo: SEOCreate,
@@ -2,43 +2,123 @@
 Comprehensive SEO Admin router for the SEO management system
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Response, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, undefer_group
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
+import csv
+import io
 import json
+import uuid
 
 from app.database import get_db
 from app.models import User
 from app.auth import get_admin_user
+from app.redirects import (
+    redirect_resolver, validate_pattern, compile_rule, PatternTrie, apply_replacement, STATUS_LABELS, redirect_status,
+    RedirectImporter, iter_csv_rows, iter_json_rows, iter_redirects_export, load_redirect_graph, find_redirect_cycle, normalize_path
+)
+from app.seo_cache import seo_lookup_cache, normalize_page_url, parse_schema_data
+from app.audit import performance_auditor, find_regressions
+from app.links import redirects_changed, reindex_all, external_link_checker
+from app.assets import minify_css as minify_css_source, minify_js as minify_js_source, build_assets, load_manifest
+from app.images import image_pipeline, resolve_source, inspect_image, extract_image_sources, picture_from_manifest, store_row_manifests
 
 router = APIRouter()
 
+DEFAULT_SEO_SETTINGS: Dict[str, Any] = {
+    "site_title": "AstroArupShastri - Professional Vedic Astrology Services",
+    "site_description": "Get accurate Vedic astrology consultations, horoscope readings, and spiritual guidance from Dr. Arup Shastri. Trusted astrology services for personal growth and life decisions.",
+    "site_keywords": "astrology, vedic astrology, horoscope, spiritual consultation, Dr. Arup Shastri, birth chart, kundli, panchang, gemstone consultation",
+    "google_analytics_id": "",
+    "facebook_app_id": "",
+    "twitter_handle": "@astroarupshastri",
+    "robots_txt": """User-agent: *
+Allow: /
+Disallow: /admin/
+Disallow: /api/
+Disallow: /private/
+
+Sitemap: https://astroarupshastri.com/sitemap.xml""",
+    "sitemap_url": "https://astroarupshastri.com/sitemap.xml",
+    "image_optimization": {
+        "quality": 80,
+        "max_width": 1920,
+        "max_height": 1080,
+        "format": "auto",
+        "enable_lazy_loading": True,
+        "enable_compression": True
+    },
+    "schema_markup": """{
+  "@context": "https://schema.org",
+  "@type": "Organization",
+  "name": "AstroArupShastri",
+  "url": "https://astroarupshastri.com",
+  "logo": "https://astroarupshastri.com/logo.svg",
+  "description": "Professional Vedic astrology consultations and spiritual guidance",
+  "contactPoint": {
+    "@type": "ContactPoint",
+    "telephone": "+91-9876543210",
+    "contactType": "customer service"
+  }
+}"""
+}
+
+def _load_seo_settings(db: Session) -> Dict[str, Any]:
+    """Default settings overlaid with the values stored in seo_settings"""
+    from app.models import SEOSetting
+
+    settings = dict(DEFAULT_SEO_SETTINGS)
+    for key, value in db.query(SEOSetting.key, SEOSetting.value):
+        try:
+            settings[key] = json.loads(value) if value is not None else None
+        except ValueError:
+            settings[key] = value
+    return settings
+
+def _save_seo_settings(db: Session, updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Upsert the given keys into seo_settings and return the merged settings"""
+    from app.models import SEOSetting
+
+    existing = {row.key: row for row in db.query(SEOSetting).filter(SEOSetting.key.in_(list(updates)))}
+    for key, value in updates.items():
+        row = existing.get(key)
+        if row is None:
+            row = SEOSetting(key=key)
+            db.add(row)
+        row.value = json.dumps(value)
+    db.commit()
+    return _load_seo_settings(db)
+
 # ============================================================================
 # BASIC META OPTIONS
 # ============================================================================
 
+META_WRITABLE_FIELDS = [
+    "title", "meta_description", "meta_keywords", "canonical_url", "robots",
+    "og_title", "og_description", "og_image"
+]
+
+def _meta_to_dict(meta) -> Dict[str, Any]:
+    return {
+        "id": meta.id,
+        "page_url": meta.page_url,
+        **{field: getattr(meta, field) for field in META_WRITABLE_FIELDS},
+        "created_at": meta.created_at.isoformat() if meta.created_at else None,
+        "updated_at": meta.updated_at.isoformat() if meta.updated_at else None
+    }
+
 @router.get("/meta")
 async def get_seo_meta_data(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all SEO meta data"""
-    # This would typically query a seo_meta table
-    # For now, return mock data
-    return [
-        {
-            "id": 1,
-            "page_url": "/about",
-            "title": "About Us - Astrology Website",
-            "meta_description": "Learn about our astrology services and expert astrologers",
-            "meta_keywords": "astrology, about, services",
-            "canonical_url": "https://example.com/about",
-            "robots": "index, follow",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-    ]
+    from app.models import SEOMeta
+    return [_meta_to_dict(meta) for meta in db.query(SEOMeta).order_by(SEOMeta.page_url).all()]
 
 @router.get("/meta/page/{page_url:path}")
 async def get_seo_meta_by_page(
@@ -47,18 +127,11 @@ async def get_seo_meta_by_page(
     db: Session = Depends(get_db)
 ):
     """Get SEO meta data by page URL"""
-    # Mock implementation
-    return {
-        "id": 1,
-        "page_url": page_url,
-        "title": f"Page Title for {page_url}",
-        "meta_description": f"Meta description for {page_url}",
-        "meta_keywords": "keywords, for, page",
-        "canonical_url": f"https://example.com{page_url}",
-        "robots": "index, follow",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
+    from app.models import SEOMeta
+    meta = db.query(SEOMeta).filter(SEOMeta.page_url == normalize_page_url(page_url)).first()
+    if not meta:
+        raise HTTPException(status_code=404, detail="SEO meta data not found for this page")
+    return _meta_to_dict(meta)
 
 @router.post("/meta")
 async def create_seo_meta(
@@ -67,13 +140,74 @@ async def create_seo_meta(
     db: Session = Depends(get_db)
 ):
     """Create new SEO meta data"""
-    # Mock implementation - in real app, save to database
-    return {
-        "id": 2,
-        **meta_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+    from app.models import SEOMeta
+
+    if not meta_data.get("page_url"):
+        raise HTTPException(status_code=400, detail="page_url is required")
+
+    page_url = normalize_page_url(meta_data["page_url"])
+    if db.query(SEOMeta).filter(SEOMeta.page_url == page_url).first():
+        raise HTTPException(status_code=400, detail="SEO meta data for this page already exists")
+
+    meta = SEOMeta(
+        page_url=page_url,
+        **{field: meta_data[field] for field in META_WRITABLE_FIELDS if field in meta_data}
+    )
+    db.add(meta)
+    db.commit()
+    db.refresh(meta)
+    seo_lookup_cache.invalidate(page_url)
+    return _meta_to_dict(meta)
+
+@router.put("/meta/bulk")
+async def bulk_update_seo_meta(
+    updates: Dict[str, Any],
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Bulk upsert SEO meta data
+
+    Accepts {"updates": [{"id": 1, "data": {...}}]} for existing rows and/or
+    {"items": [{"page_url": "/about", ...}]} to upsert by page URL. All
+    changes are written in a single transaction.
+    """
+    from app.models import SEOMeta
+
+    by_id = {
+        update["id"]: update.get("data", {})
+        for update in updates.get("updates", []) if update.get("id") is not None
     }
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for item in updates.get("items", []):
+        if item.get("page_url"):
+            by_url[normalize_page_url(item["page_url"])] = item
+
+    rows = []
+    if by_id:
+        rows.extend(db.query(SEOMeta).filter(SEOMeta.id.in_(list(by_id))).all())
+    if by_url:
+        rows.extend(db.query(SEOMeta).filter(SEOMeta.page_url.in_(list(by_url))).all())
+
+    touched = {}
+    for meta in rows:
+        data = dict(by_id.get(meta.id, {}))
+        data.update(by_url.pop(meta.page_url, {}))
+        for field in META_WRITABLE_FIELDS:
+            if field in data:
+                setattr(meta, field, data[field])
+        touched[meta.id] = meta
+
+    for page_url, item in by_url.items():
+        meta = SEOMeta(
+            page_url=page_url,
+            **{field: item[field] for field in META_WRITABLE_FIELDS if field in item}
+        )
+        db.add(meta)
+        touched[page_url] = meta
+
+    db.commit()
+    seo_lookup_cache.invalidate()
+    return [_meta_to_dict(meta) for meta in touched.values()]
 
 @router.put("/meta/{meta_id}")
 async def update_seo_meta(
@@ -83,12 +217,29 @@ async def update_seo_meta(
     db: Session = Depends(get_db)
 ):
     """Update SEO meta data"""
-    # Mock implementation
-    return {
-        "id": meta_id,
-        **meta_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOMeta
+
+    meta = db.query(SEOMeta).filter(SEOMeta.id == meta_id).first()
+    if not meta:
+        raise HTTPException(status_code=404, detail="SEO meta data not found")
+
+    old_page_url = meta.page_url
+    if meta_data.get("page_url"):
+        page_url = normalize_page_url(meta_data["page_url"])
+        if page_url != meta.page_url:
+            if db.query(SEOMeta).filter(SEOMeta.page_url == page_url, SEOMeta.id != meta_id).first():
+                raise HTTPException(status_code=400, detail="SEO meta data for this page already exists")
+            meta.page_url = page_url
+
+    for field in META_WRITABLE_FIELDS:
+        if field in meta_data:
+            setattr(meta, field, meta_data[field])
+
+    db.commit()
+    db.refresh(meta)
+    seo_lookup_cache.invalidate(old_page_url)
+    seo_lookup_cache.invalidate(meta.page_url)
+    return _meta_to_dict(meta)
 
 @router.delete("/meta/{meta_id}")
 async def delete_seo_meta(
@@ -97,44 +248,70 @@ async def delete_seo_meta(
     db: Session = Depends(get_db)
 ):
     """Delete SEO meta data"""
-    return {"message": "SEO meta data deleted successfully"}
+    from app.models import SEOMeta
 
-@router.put("/meta/bulk")
-async def bulk_update_seo_meta(
-    updates: Dict[str, Any],
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Bulk update SEO meta data"""
-    # Mock implementation
-    return [{"id": update["id"], **update["data"]} for update in updates.get("updates", [])]
+    meta = db.query(SEOMeta).filter(SEOMeta.id == meta_id).first()
+    if not meta:
+        raise HTTPException(status_code=404, detail="SEO meta data not found")
+
+    page_url = meta.page_url
+    db.delete(meta)
+    db.commit()
+    seo_lookup_cache.invalidate(page_url)
+    return {"message": "SEO meta data deleted successfully"}
 
 # ============================================================================
 # STRUCTURED DATA (SCHEMA MARKUP)
 # ============================================================================
 
+def _schema_to_dict(schema) -> Dict[str, Any]:
+    return {
+        "id": schema.id,
+        "page_url": schema.page_url,
+        "schema_type": schema.schema_type,
+        "schema_data": parse_schema_data(schema.schema_data),
+        "is_active": schema.is_active,
+        "created_at": schema.created_at.isoformat() if schema.created_at else None,
+        "updated_at": schema.updated_at.isoformat() if schema.updated_at else None
+    }
+
+def _validate_schema_data(schema_data: Any) -> List[str]:
+    """Basic JSON-LD checks: an object (or list of objects) with @context and @type"""
+    errors = []
+    if isinstance(schema_data, str):
+        try:
+            schema_data = json.loads(schema_data)
+        except ValueError as e:
+            return [f"Invalid JSON: {e}"]
+
+    items = schema_data if isinstance(schema_data, list) else [schema_data]
+    for index, item in enumerate(items):
+        prefix = f"[{index}] " if isinstance(schema_data, list) else ""
+        if not isinstance(item, dict):
+            errors.append(f"{prefix}Schema must be a JSON object")
+            continue
+        if "@context" not in item:
+            errors.append(f"{prefix}Missing @context")
+        if "@type" not in item:
+            errors.append(f"{prefix}Missing @type")
+    return errors
+
+def _dump_schema_data(schema_data: Any) -> str:
+    errors = _validate_schema_data(schema_data)
+    if errors:
+        raise HTTPException(status_code=400, detail="; ".join(errors))
+    if isinstance(schema_data, str):
+        schema_data = json.loads(schema_data)
+    return json.dumps(schema_data)
+
 @router.get("/schema")
 async def get_schema_data(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all schema data"""
-    return [
-        {
-            "id": 1,
-            "page_url": "/about",
-            "schema_type": "organization",
-            "schema_data": {
-                "@context": "https://schema.org",
-                "@type": "Organization",
-                "name": "Astrology Website",
-                "description": "Professional astrology services"
-            },
-            "is_active": True,
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-    ]
+    from app.models import SEOSchema
+    return [_schema_to_dict(schema) for schema in db.query(SEOSchema).order_by(SEOSchema.page_url, SEOSchema.id).all()]
 
 @router.get("/schema/page/{page_url:path}")
 async def get_schema_by_page(
@@ -143,7 +320,9 @@ async def get_schema_by_page(
     db: Session = Depends(get_db)
 ):
     """Get schema data by page URL"""
-    return []
+    from app.models import SEOSchema
+    schemas = db.query(SEOSchema).filter(SEOSchema.page_url == normalize_page_url(page_url)).order_by(SEOSchema.id).all()
+    return [_schema_to_dict(schema) for schema in schemas]
 
 @router.post("/schema")
 async def create_schema(
@@ -152,12 +331,22 @@ async def create_schema(
     db: Session = Depends(get_db)
 ):
     """Create new schema data"""
-    return {
-        "id": 2,
-        **schema_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOSchema
+
+    if not schema_data.get("page_url") or schema_data.get("schema_data") is None:
+        raise HTTPException(status_code=400, detail="page_url and schema_data are required")
+
+    schema = SEOSchema(
+        page_url=normalize_page_url(schema_data["page_url"]),
+        schema_type=schema_data.get("schema_type"),
+        schema_data=_dump_schema_data(schema_data["schema_data"]),
+        is_active=schema_data.get("is_active", True)
+    )
+    db.add(schema)
+    db.commit()
+    db.refresh(schema)
+    seo_lookup_cache.invalidate(schema.page_url)
+    return _schema_to_dict(schema)
 
 @router.put("/schema/{schema_id}")
 async def update_schema(
@@ -167,11 +356,26 @@ async def update_schema(
     db: Session = Depends(get_db)
 ):
     """Update schema data"""
-    return {
-        "id": schema_id,
-        **schema_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOSchema
+
+    schema = db.query(SEOSchema).filter(SEOSchema.id == schema_id).first()
+    if not schema:
+        raise HTTPException(status_code=404, detail="Schema data not found")
+
+    old_page_url = schema.page_url
+    if schema_data.get("page_url"):
+        schema.page_url = normalize_page_url(schema_data["page_url"])
+    if "schema_data" in schema_data:
+        schema.schema_data = _dump_schema_data(schema_data["schema_data"])
+    for field in ["schema_type", "is_active"]:
+        if field in schema_data:
+            setattr(schema, field, schema_data[field])
+
+    db.commit()
+    db.refresh(schema)
+    seo_lookup_cache.invalidate(old_page_url)
+    seo_lookup_cache.invalidate(schema.page_url)
+    return _schema_to_dict(schema)
 
 @router.delete("/schema/{schema_id}")
 async def delete_schema(
@@ -180,6 +384,16 @@ async def delete_schema(
     db: Session = Depends(get_db)
 ):
     """Delete schema data"""
+    from app.models import SEOSchema
+
+    schema = db.query(SEOSchema).filter(SEOSchema.id == schema_id).first()
+    if not schema:
+        raise HTTPException(status_code=404, detail="Schema data not found")
+
+    page_url = schema.page_url
+    db.delete(schema)
+    db.commit()
+    seo_lookup_cache.invalidate(page_url)
     return {"message": "Schema data deleted successfully"}
 
 @router.post("/schema/auto-generate")
@@ -188,17 +402,21 @@ async def auto_generate_schema(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Auto-generate schema based on page type"""
+    """Auto-generate and store schema based on page type"""
+    from app.models import SEOSchema, SEOMeta
+
     page_type = request_data.get("page_type", "article")
-    page_url = request_data.get("page_url", "/")
-    
-    # Mock auto-generated schema based on page type
+    page_url = normalize_page_url(request_data.get("page_url", "/"))
+    meta = db.query(SEOMeta).filter(SEOMeta.page_url == page_url).first()
+    name = (meta.title if meta and meta.title else None) or f"Page for {page_url}"
+    description = (meta.meta_description if meta and meta.meta_description else None) or f"Page description for {page_url}"
+
     if page_type == "article":
         schema = {
             "@context": "https://schema.org",
             "@type": "Article",
-            "headline": f"Article for {page_url}",
-            "description": f"Article description for {page_url}",
+            "headline": name,
+            "description": description,
             "author": {"@type": "Person", "name": "Author Name"},
             "publisher": {"@type": "Organization", "name": "Astrology Website"},
             "datePublished": datetime.now().isoformat(),
@@ -208,27 +426,29 @@ async def auto_generate_schema(
         schema = {
             "@context": "https://schema.org",
             "@type": "Product",
-            "name": f"Product for {page_url}",
-            "description": f"Product description for {page_url}",
+            "name": name,
+            "description": description,
             "offers": {"@type": "Offer", "price": "99.99", "priceCurrency": "USD"}
         }
     else:
         schema = {
             "@context": "https://schema.org",
             "@type": "WebPage",
-            "name": f"Page for {page_url}",
-            "description": f"Page description for {page_url}"
+            "name": name,
+            "description": description
         }
-    
-    return {
-        "id": 3,
-        "page_url": page_url,
-        "schema_type": page_type,
-        "schema_data": schema,
-        "is_active": True,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+
+    db_schema = SEOSchema(
+        page_url=page_url,
+        schema_type=page_type,
+        schema_data=json.dumps(schema),
+        is_active=True
+    )
+    db.add(db_schema)
+    db.commit()
+    db.refresh(db_schema)
+    seo_lookup_cache.invalidate(page_url)
+    return _schema_to_dict(db_schema)
 
 @router.post("/schema/validate")
 async def validate_schema(
@@ -237,36 +457,50 @@ async def validate_schema(
     db: Session = Depends(get_db)
 ):
     """Validate schema data"""
-    # Mock validation
+    errors = _validate_schema_data(request_data.get("schema_data"))
     return {
-        "valid": True,
-        "errors": []
+        "valid": not errors,
+        "errors": errors
     }
 
 # ============================================================================
 # URL & CANONICAL CONTROL
 # ============================================================================
 
+URL_WRITABLE_FIELDS = ["custom_slug", "canonical_url", "redirect_to", "redirect_type", "is_active"]
+
+def _url_to_dict(url) -> Dict[str, Any]:
+    return {
+        "id": url.id,
+        "page_url": url.page_url,
+        "custom_slug": url.custom_slug,
+        "canonical_url": url.canonical_url,
+        "redirect_from": json.loads(url.redirect_from) if url.redirect_from else [],
+        "redirect_to": url.redirect_to or "",
+        "redirect_type": url.redirect_type,
+        "is_active": url.is_active,
+        "created_at": url.created_at.isoformat() if url.created_at else None,
+        "updated_at": url.updated_at.isoformat() if url.updated_at else None
+    }
+
+def _apply_url_data(url, url_data: Dict[str, Any]) -> None:
+    for field in URL_WRITABLE_FIELDS:
+        if field in url_data:
+            setattr(url, field, url_data[field])
+    if "redirect_from" in url_data:
+        redirect_from = url_data["redirect_from"] or []
+        if isinstance(redirect_from, str):
+            redirect_from = [part.strip() for part in redirect_from.split(",") if part.strip()]
+        url.redirect_from = json.dumps([normalize_page_url(path) for path in redirect_from])
+
 @router.get("/urls")
 async def get_url_data(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all URL data"""
-    return [
-        {
-            "id": 1,
-            "page_url": "/about",
-            "custom_slug": "about-us",
-            "canonical_url": "https://example.com/about",
-            "redirect_from": ["/old-about"],
-            "redirect_to": "",
-            "redirect_type": 301,
-            "is_active": True,
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-    ]
+    from app.models import SEOUrl
+    return [_url_to_dict(url) for url in db.query(SEOUrl).order_by(SEOUrl.page_url).all()]
 
 @router.get("/urls/page/{page_url:path}")
 async def get_url_by_page(
@@ -275,18 +509,11 @@ async def get_url_by_page(
     db: Session = Depends(get_db)
 ):
     """Get URL data by page URL"""
-    return {
-        "id": 1,
-        "page_url": page_url,
-        "custom_slug": page_url.replace("/", ""),
-        "canonical_url": f"https://example.com{page_url}",
-        "redirect_from": [],
-        "redirect_to": "",
-        "redirect_type": 301,
-        "is_active": True,
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
+    from app.models import SEOUrl
+    url = db.query(SEOUrl).filter(SEOUrl.page_url == normalize_page_url(page_url)).first()
+    if not url:
+        raise HTTPException(status_code=404, detail="URL data not found for this page")
+    return _url_to_dict(url)
 
 @router.post("/urls")
 async def create_url_data(
@@ -295,12 +522,22 @@ async def create_url_data(
     db: Session = Depends(get_db)
 ):
     """Create new URL data"""
-    return {
-        "id": 2,
-        **url_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOUrl
+
+    if not url_data.get("page_url"):
+        raise HTTPException(status_code=400, detail="page_url is required")
+
+    page_url = normalize_page_url(url_data["page_url"])
+    if db.query(SEOUrl).filter(SEOUrl.page_url == page_url).first():
+        raise HTTPException(status_code=400, detail="URL data for this page already exists")
+
+    url = SEOUrl(page_url=page_url)
+    _apply_url_data(url, url_data)
+    db.add(url)
+    db.commit()
+    db.refresh(url)
+    seo_lookup_cache.invalidate(page_url)
+    return _url_to_dict(url)
 
 @router.put("/urls/{url_id}")
 async def update_url_data(
@@ -310,11 +547,17 @@ async def update_url_data(
     db: Session = Depends(get_db)
 ):
     """Update URL data"""
-    return {
-        "id": url_id,
-        **url_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOUrl
+
+    url = db.query(SEOUrl).filter(SEOUrl.id == url_id).first()
+    if not url:
+        raise HTTPException(status_code=404, detail="URL data not found")
+
+    _apply_url_data(url, url_data)
+    db.commit()
+    db.refresh(url)
+    seo_lookup_cache.invalidate(url.page_url)
+    return _url_to_dict(url)
 
 @router.delete("/urls/{url_id}")
 async def delete_url_data(
@@ -323,6 +566,16 @@ async def delete_url_data(
     db: Session = Depends(get_db)
 ):
     """Delete URL data"""
+    from app.models import SEOUrl
+
+    url = db.query(SEOUrl).filter(SEOUrl.id == url_id).first()
+    if not url:
+        raise HTTPException(status_code=404, detail="URL data not found")
+
+    page_url = url.page_url
+    db.delete(url)
+    db.commit()
+    seo_lookup_cache.invalidate(page_url)
     return {"message": "URL data deleted successfully"}
 
 @router.post("/urls/generate-slug")
@@ -343,10 +596,16 @@ async def check_slug_availability(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Check if slug is available"""
-    slug = request_data.get("slug", "")
-    # Mock availability check
-    return {"available": True}
+    """Check if slug is available across pages, blogs and custom slugs"""
+    from app.models import Page, Blog, SEOUrl
+
+    slug = request_data.get("slug", "").strip("/")
+    taken = (
+        db.query(Page.id).filter(Page.slug == slug).first()
+        or db.query(Blog.id).filter(Blog.slug == slug).first()
+        or db.query(SEOUrl.id).filter(SEOUrl.custom_slug == slug).first()
+    )
+    return {"available": not taken}
 
 @router.post("/urls/canonical")
 async def set_canonical_url(
@@ -355,33 +614,59 @@ async def set_canonical_url(
     db: Session = Depends(get_db)
 ):
     """Set canonical URL"""
-    return {
-        "id": 1,
-        "page_url": request_data.get("page_url", ""),
-        "canonical_url": request_data.get("canonical_url", ""),
-        "is_active": True,
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOUrl
+
+    if not request_data.get("page_url"):
+        raise HTTPException(status_code=400, detail="page_url is required")
+
+    page_url = normalize_page_url(request_data["page_url"])
+    url = db.query(SEOUrl).filter(SEOUrl.page_url == page_url).first()
+    if not url:
+        url = SEOUrl(page_url=page_url, is_active=True)
+        db.add(url)
+    url.canonical_url = request_data.get("canonical_url", "")
+
+    db.commit()
+    db.refresh(url)
+    seo_lookup_cache.invalidate(page_url)
+    return _url_to_dict(url)
 
 # ============================================================================
 # ROBOTS & SITEMAP
 # ============================================================================
 
+SITEMAP_WRITABLE_FIELDS = [
+    "change_frequency", "priority", "page_type", "include_images",
+    "include_categories", "include_tags", "is_active"
+]
+
+def _sitemap_entry_to_dict(entry) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "url": entry.url,
+        "last_modified": entry.last_modified.isoformat() if entry.last_modified else None,
+        **{field: getattr(entry, field) for field in SITEMAP_WRITABLE_FIELDS},
+        "created_at": entry.created_at.isoformat() if entry.created_at else None,
+        "updated_at": entry.updated_at.isoformat() if entry.updated_at else None
+    }
+
+def _apply_sitemap_data(entry, sitemap_data: Dict[str, Any]) -> None:
+    for field in SITEMAP_WRITABLE_FIELDS:
+        if field in sitemap_data:
+            setattr(entry, field, sitemap_data[field])
+    if sitemap_data.get("last_modified"):
+        try:
+            entry.last_modified = datetime.fromisoformat(str(sitemap_data["last_modified"]).replace("Z", "+00:00"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="last_modified must be an ISO 8601 datetime")
+
 @router.get("/robots")
 async def get_robots(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get robots.txt content"""
-    return {
-        "content": """User-agent: *
-Allow: /
-Disallow: /admin/
-Disallow: /private/
-
-Sitemap: https://example.com/sitemap.xml"""
-    }
+    return {"content": _load_seo_settings(db)["robots_txt"]}
 
 @router.put("/robots")
 async def update_robots(
@@ -390,9 +675,8 @@ async def update_robots(
     db: Session = Depends(get_db)
 ):
     """Update robots.txt content"""
-    return {
-        "content": request_data.get("content", "")
-    }
+    settings = _save_seo_settings(db, {"robots_txt": request_data.get("content", "")})
+    return {"content": settings["robots_txt"]}
 
 @router.get("/sitemap")
 async def get_sitemap_entries(
@@ -400,22 +684,8 @@ async def get_sitemap_entries(
     db: Session = Depends(get_db)
 ):
     """Get all sitemap entries"""
-    return [
-        {
-            "id": 1,
-            "url": "https://example.com/",
-            "last_modified": "2024-01-01T00:00:00Z",
-            "change_frequency": "daily",
-            "priority": 1.0,
-            "page_type": "homepage",
-            "include_images": True,
-            "include_categories": False,
-            "include_tags": False,
-            "is_active": True,
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-    ]
+    from app.models import SitemapEntry
+    return [_sitemap_entry_to_dict(entry) for entry in db.query(SitemapEntry).order_by(SitemapEntry.url).all()]
 
 @router.post("/sitemap")
 async def add_sitemap_entry(
@@ -424,12 +694,19 @@ async def add_sitemap_entry(
     db: Session = Depends(get_db)
 ):
     """Add sitemap entry"""
-    return {
-        "id": 2,
-        **sitemap_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SitemapEntry
+
+    if not sitemap_data.get("url"):
+        raise HTTPException(status_code=400, detail="url is required")
+    if db.query(SitemapEntry).filter(SitemapEntry.url == sitemap_data["url"]).first():
+        raise HTTPException(status_code=400, detail="Sitemap entry for this URL already exists")
+
+    entry = SitemapEntry(url=sitemap_data["url"])
+    _apply_sitemap_data(entry, sitemap_data)
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return _sitemap_entry_to_dict(entry)
 
 @router.put("/sitemap/{entry_id}")
 async def update_sitemap_entry(
@@ -439,11 +716,21 @@ async def update_sitemap_entry(
     db: Session = Depends(get_db)
 ):
     """Update sitemap entry"""
-    return {
-        "id": entry_id,
-        **sitemap_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SitemapEntry
+
+    entry = db.query(SitemapEntry).filter(SitemapEntry.id == entry_id).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Sitemap entry not found")
+
+    if sitemap_data.get("url") and sitemap_data["url"] != entry.url:
+        if db.query(SitemapEntry).filter(SitemapEntry.url == sitemap_data["url"], SitemapEntry.id != entry_id).first():
+            raise HTTPException(status_code=400, detail="Sitemap entry for this URL already exists")
+        entry.url = sitemap_data["url"]
+    _apply_sitemap_data(entry, sitemap_data)
+
+    db.commit()
+    db.refresh(entry)
+    return _sitemap_entry_to_dict(entry)
 
 @router.delete("/sitemap/{entry_id}")
 async def delete_sitemap_entry(
@@ -452,6 +739,14 @@ async def delete_sitemap_entry(
     db: Session = Depends(get_db)
 ):
     """Delete sitemap entry"""
+    from app.models import SitemapEntry
+
+    entry = db.query(SitemapEntry).filter(SitemapEntry.id == entry_id).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Sitemap entry not found")
+
+    db.delete(entry)
+    db.commit()
     return {"message": "Sitemap entry deleted successfully"}
 
 @router.post("/sitemap/generate")
@@ -459,20 +754,31 @@ async def generate_sitemap(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Generate XML sitemap"""
-    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>https://example.com/</loc>
-    <lastmod>2024-01-01T00:00:00Z</lastmod>
-    <changefreq>daily</changefreq>
-    <priority>1.0</priority>
-  </url>
-</urlset>"""
-    
+    """Generate XML sitemap from the active sitemap entries"""
+    from app.models import SitemapEntry
+    from xml.sax.saxutils import escape
+
+    site_url = _load_seo_settings(db)["sitemap_url"].rsplit("/", 1)[0]
+    entries = db.query(SitemapEntry).filter(SitemapEntry.is_active == True).order_by(SitemapEntry.priority.desc(), SitemapEntry.url)
+
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    ]
+    for entry in entries:
+        loc = entry.url if entry.url.startswith("http") else f"{site_url}{normalize_page_url(entry.url)}"
+        parts.append('  <url>\n')
+        parts.append(f'    <loc>{escape(loc)}</loc>\n')
+        if entry.last_modified:
+            parts.append(f'    <lastmod>{entry.last_modified.isoformat()}</lastmod>\n')
+        parts.append(f'    <changefreq>{escape(entry.change_frequency or "weekly")}</changefreq>\n')
+        parts.append(f'    <priority>{entry.priority if entry.priority is not None else 0.5}</priority>\n')
+        parts.append('  </url>\n')
+    parts.append('</urlset>')
+
     return {
-        "xml_content": xml_content,
-        "url": "https://example.com/sitemap.xml"
+        "xml_content": "".join(parts),
+        "url": _load_seo_settings(db)["sitemap_url"]
     }
 
 @router.post("/sitemap/auto-generate")
@@ -480,23 +786,33 @@ async def auto_generate_sitemap(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Auto-generate sitemap entries"""
-    return [
-        {
-            "id": 3,
-            "url": "https://example.com/about",
-            "last_modified": datetime.now().isoformat(),
-            "change_frequency": "monthly",
-            "priority": 0.8,
-            "page_type": "page",
-            "include_images": False,
-            "include_categories": False,
-            "include_tags": False,
-            "is_active": True,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    """Auto-generate sitemap entries for published pages and blog posts"""
+    from app.models import SitemapEntry, Page, Blog
+
+    candidates = {"/": ("homepage", 1.0, "daily", None)}
+    for slug, updated_at, created_at in db.query(Page.slug, Page.updated_at, Page.created_at).filter(Page.is_published == True):
+        candidates[f"/{slug}"] = ("page", 0.8, "monthly", updated_at or created_at)
+    for slug, updated_at, created_at in db.query(Blog.slug, Blog.updated_at, Blog.created_at).filter(Blog.is_published == True):
+        candidates[f"/blog/{slug}"] = ("blog", 0.6, "monthly", updated_at or created_at)
+
+    existing = {url for (url,) in db.query(SitemapEntry.url).filter(SitemapEntry.url.in_(list(candidates)))}
+    created = []
+    for url, (page_type, priority, change_frequency, last_modified) in candidates.items():
+        if url in existing:
+            continue
+        entry = SitemapEntry(
+            url=url,
+            page_type=page_type,
+            priority=priority,
+            change_frequency=change_frequency,
+            last_modified=last_modified,
+            is_active=True
+        )
+        db.add(entry)
+        created.append(entry)
+
+    db.commit()
+    return [_sitemap_entry_to_dict(entry) for entry in created]
 
 @router.post("/sitemap/submit")
 async def submit_sitemap(
@@ -657,28 +973,67 @@ async def generate_tracking_code(
 # IMAGE OPTIMIZATION
 # ============================================================================
 
+IMAGE_WRITABLE_FIELDS = ["alt_text", "title_attribute", "caption"]
+
+def _image_to_dict(image) -> Dict[str, Any]:
+    compression_ratio = None
+    if image.is_optimized and image.file_size and image.optimized_size is not None:
+        compression_ratio = round(100 * (1 - image.optimized_size / image.file_size))
+    return {
+        "id": image.id,
+        "image_url": image.image_url,
+        "alt_text": image.alt_text or "",
+        "title_attribute": image.title_attribute or "",
+        "caption": image.caption or "",
+        "file_size": image.file_size or 0,
+        "dimensions": {"width": image.width or 0, "height": image.height or 0},
+        "compression_ratio": compression_ratio,
+        "is_optimized": image.is_optimized,
+        "variants": image_pipeline.picture(image.image_url, key=image.content_hash) if image.is_optimized else None,
+        "page_url": image.page_url,
+        "created_at": image.created_at.isoformat() if image.created_at else None,
+        "updated_at": image.updated_at.isoformat() if image.updated_at else None
+    }
+
+def _refresh_image_file_info(image) -> None:
+    path = resolve_source(image.image_url)
+    if path is not None:
+        info = inspect_image(path)
+        image.file_size = info["file_size"]
+        image.width = info["width"]
+        image.height = info["height"]
+
+def _apply_optimization_result(db: Session, image, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    picture = picture_from_manifest(manifest, image.image_url)
+    store_row_manifests(db, image.image_url, manifest)
+    image.is_optimized = True
+    image.content_hash = manifest["key"]
+    image.file_size = manifest["original_size"]
+    image.width = manifest["width"]
+    image.height = manifest["height"]
+    image.optimized_size = picture["optimized_size"]
+    return {
+        "optimized_url": picture["optimized_src"],
+        "original_size": picture["original_size"],
+        "optimized_size": picture["optimized_size"],
+        "compression_ratio": round(100 * (1 - picture["optimized_size"] / picture["original_size"])) if picture["original_size"] else 0,
+        "sources": picture["sources"],
+        "cached": manifest.get("cached", False)
+    }
+
+def _image_settings(db: Session, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    settings = dict(_load_seo_settings(db)["image_optimization"])
+    settings.update(overrides or {})
+    return settings
+
 @router.get("/images")
 async def get_images(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get all images"""
-    return [
-        {
-            "id": 1,
-            "image_url": "https://example.com/image1.jpg",
-            "alt_text": "Astrology consultation",
-            "title_attribute": "Professional astrology reading",
-            "caption": "Expert astrologer providing consultation",
-            "file_size": 1024000,
-            "dimensions": {"width": 1920, "height": 1080},
-            "compression_ratio": 25,
-            "is_optimized": True,
-            "page_url": "/about",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-    ]
+    from app.models import SEOImage
+    return [_image_to_dict(image) for image in db.query(SEOImage).order_by(SEOImage.id).all()]
 
 @router.get("/images/page/{page_url:path}")
 async def get_images_by_page(
@@ -687,7 +1042,27 @@ async def get_images_by_page(
     db: Session = Depends(get_db)
 ):
     """Get images by page URL"""
-    return []
+    from app.models import SEOImage
+    images = db.query(SEOImage).filter(SEOImage.page_url == normalize_page_url(page_url)).order_by(SEOImage.id).all()
+    return [_image_to_dict(image) for image in images]
+
+@router.get("/images/settings")
+async def get_optimization_settings(
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Get optimization settings"""
+    return _image_settings(db)
+
+@router.put("/images/settings")
+async def update_optimization_settings(
+    settings: Dict[str, Any],
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Update optimization settings"""
+    merged = _image_settings(db, settings)
+    return _save_seo_settings(db, {"image_optimization": merged})["image_optimization"]
 
 @router.post("/images")
 async def add_image(
@@ -696,12 +1071,24 @@ async def add_image(
     db: Session = Depends(get_db)
 ):
     """Add image"""
-    return {
-        "id": 2,
-        **image_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOImage
+
+    if not image_data.get("image_url"):
+        raise HTTPException(status_code=400, detail="image_url is required")
+    if db.query(SEOImage).filter(SEOImage.image_url == image_data["image_url"]).first():
+        raise HTTPException(status_code=400, detail="Image already exists")
+
+    image = SEOImage(
+        image_url=image_data["image_url"],
+        page_url=normalize_page_url(image_data["page_url"]) if image_data.get("page_url") else None,
+        is_optimized=False,
+        **{field: image_data[field] for field in IMAGE_WRITABLE_FIELDS if field in image_data}
+    )
+    _refresh_image_file_info(image)
+    db.add(image)
+    db.commit()
+    db.refresh(image)
+    return _image_to_dict(image)
 
 @router.put("/images/{image_id}")
 async def update_image(
@@ -711,11 +1098,27 @@ async def update_image(
     db: Session = Depends(get_db)
 ):
     """Update image"""
-    return {
-        "id": image_id,
-        **image_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import SEOImage
+
+    image = db.query(SEOImage).filter(SEOImage.id == image_id).first()
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    for field in IMAGE_WRITABLE_FIELDS:
+        if field in image_data:
+            setattr(image, field, image_data[field])
+    if "page_url" in image_data:
+        image.page_url = normalize_page_url(image_data["page_url"]) if image_data["page_url"] else None
+    if image_data.get("image_url") and image_data["image_url"] != image.image_url:
+        image.image_url = image_data["image_url"]
+        image.is_optimized = False
+        image.optimized_size = None
+        image.content_hash = None
+        _refresh_image_file_info(image)
+
+    db.commit()
+    db.refresh(image)
+    return _image_to_dict(image)
 
 @router.delete("/images/{image_id}")
 async def delete_image(
@@ -724,22 +1127,15 @@ async def delete_image(
     db: Session = Depends(get_db)
 ):
     """Delete image"""
-    return {"message": "Image deleted successfully"}
+    from app.models import SEOImage
 
-@router.post("/images/{image_id}/optimize")
-async def optimize_image(
-    image_id: int,
-    settings: Dict[str, Any],
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Optimize image"""
-    return {
-        "optimized_url": f"https://example.com/optimized/image{image_id}.webp",
-        "original_size": 1024000,
-        "optimized_size": 512000,
-        "compression_ratio": 50
-    }
+    image = db.query(SEOImage).filter(SEOImage.id == image_id).first()
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    db.delete(image)
+    db.commit()
+    return {"message": "Image deleted successfully"}
 
 @router.post("/images/bulk-optimize")
 async def bulk_optimize_images(
@@ -747,26 +1143,76 @@ async def bulk_optimize_images(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Bulk optimize images"""
+    """Bulk optimize images on the image pipeline's process pool"""
+    from app.models import SEOImage
+
+    if not image_pipeline.available:
+        raise HTTPException(status_code=503, detail="Image optimization is unavailable (Pillow is not installed)")
+
     image_ids = request_data.get("image_ids", [])
+    images = db.query(SEOImage).filter(SEOImage.id.in_(image_ids)).all() if image_ids else []
+    settings = _image_settings(db, request_data.get("settings"))
+    manifests = await run_in_threadpool(
+        image_pipeline.bulk_optimize, [image.image_url for image in images], settings
+    )
+
+    results = []
+    found = {image.id: image for image in images}
+    for image_id in image_ids:
+        image = found.get(image_id)
+        manifest = manifests.get(image.image_url) if image else None
+        if manifest is None or "error" in manifest:
+            error = manifest["error"] if manifest else "Image not found"
+            results.append({"id": image_id, "success": False, "error": error})
+        else:
+            results.append({"id": image_id, "success": True, **_apply_optimization_result(db, image, manifest)})
+    db.commit()
+
+    success_count = sum(1 for result in results if result["success"])
     return {
-        "success_count": len(image_ids),
-        "failed_count": 0,
-        "results": [
-            {"id": img_id, "success": True, "optimized_url": f"https://example.com/optimized/image{img_id}.webp"}
-            for img_id in image_ids
-        ]
+        "success_count": success_count,
+        "failed_count": len(results) - success_count,
+        "results": results
     }
 
+@router.post("/images/{image_id}/optimize")
+async def optimize_image(
+    image_id: int,
+    settings: Dict[str, Any],
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Generate resized AVIF/WebP variants for an image"""
+    from app.models import SEOImage
+
+    image = db.query(SEOImage).filter(SEOImage.id == image_id).first()
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if not image_pipeline.available:
+        raise HTTPException(status_code=503, detail="Image optimization is unavailable (Pillow is not installed)")
+
+    try:
+        manifest = await run_in_threadpool(image_pipeline.optimize, image.image_url, _image_settings(db, settings))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=400, detail=f"Could not process image: {e}")
+
+    result = _apply_optimization_result(db, image, manifest)
+    db.commit()
+    return result
+
 @router.post("/images/generate-alt-text")
 async def generate_alt_text(
     request_data: Dict[str, Any],
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Generate alt text for image"""
+    """Generate alt text for image from its file name"""
     image_url = request_data.get("image_url", "")
-    return {"alt_text": f"Generated alt text for {image_url}"}
+    name = urlsplit(image_url).path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    words = " ".join(name.replace("-", " ").replace("_", " ").replace(";", " ").split())
+    return {"alt_text": words[:1].upper() + words[1:] if words else ""}
 
 @router.post("/images/scan-page")
 async def scan_page_images(
@@ -774,47 +1220,44 @@ async def scan_page_images(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Scan page for images"""
-    page_url = request_data.get("page_url", "")
-    return [
-        {
-            "id": 3,
-            "image_url": f"https://example.com/page-image.jpg",
-            "alt_text": "",
-            "title_attribute": "",
-            "caption": "",
-            "file_size": 512000,
-            "dimensions": {"width": 800, "height": 600},
-            "is_optimized": False,
-            "page_url": page_url,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    """Scan a page or blog post for images and track them"""
+    from app.models import SEOImage, Page, Blog
 
-@router.get("/images/settings")
-async def get_optimization_settings(
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Get optimization settings"""
-    return {
-        "quality": 85,
-        "max_width": 1920,
-        "max_height": 1080,
-        "format": "webp",
-        "enable_lazy_loading": True,
-        "enable_compression": True
-    }
+    page_url = normalize_page_url(request_data.get("page_url", ""))
+    slug = page_url.strip("/")
+    found: List[Dict[str, str]] = []
+    if slug.startswith("blog/"):
+        blog = db.query(Blog).options(undefer_group("content")).filter(Blog.slug == slug[len("blog/"):]).first()
+        if blog:
+            if blog.featured_image:
+                found.append({"src": blog.featured_image, "alt": blog.title, "title": ""})
+            found.extend(extract_image_sources(blog.content))
+    else:
+        page = db.query(Page).options(undefer_group("content")).filter(Page.slug == slug).first()
+        if page:
+            if page.banner_image:
+                found.append({"src": page.banner_image, "alt": page.title, "title": ""})
+            found.extend(extract_image_sources(page.content))
+
+    sources = {item["src"]: item for item in found if not item["src"].startswith(("data:", "blob:"))}
+    existing = {image.image_url: image for image in db.query(SEOImage).filter(SEOImage.image_url.in_(list(sources)))}
+    images = []
+    for src, item in sources.items():
+        image = existing.get(src)
+        if image is None:
+            image = SEOImage(
+                image_url=src,
+                alt_text=item["alt"],
+                title_attribute=item["title"],
+                page_url=page_url,
+                is_optimized=False
+            )
+            _refresh_image_file_info(image)
+            db.add(image)
+        images.append(image)
 
-@router.put("/images/settings")
-async def update_optimization_settings(
-    settings: Dict[str, Any],
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Update optimization settings"""
-    return settings
+    db.commit()
+    return [_image_to_dict(image) for image in images]
 
 # ============================================================================
 # PERFORMANCE OPTIMIZATION
@@ -853,42 +1296,134 @@ async def update_performance_settings(
         "updated_at": datetime.now().isoformat()
     }
 
+REPORT_METRIC_FIELDS = [
+    "status_code", "load_time", "ttfb", "html_size", "total_transfer_size", "image_weight",
+    "script_weight", "stylesheet_weight", "request_count", "render_blocking_count",
+    "performance_score", "accessibility_score", "best_practices_score", "seo_score"
+]
+REPORT_DETAIL_FIELDS = [
+    "recommendations", "regressions", "mobile_issues", "render_blocking", "uncompressed_resources",
+    "weak_cache_resources", "failed_resources", "resources", "first_contentful_paint",
+    "largest_contentful_paint", "cumulative_layout_shift", "first_input_delay"
+]
+AUDIT_MAX_PAGES = 200
+
+def _report_to_dict(report, include_resources: bool = True) -> Dict[str, Any]:
+    details = json.loads(report.details) if report.details else {}
+    if not include_resources:
+        details.pop("resources", None)
+    mobile_issues = details.get("mobile_issues", [])
+    return {
+        "id": report.id,
+        "run_id": report.run_id,
+        "page_url": report.page_url,
+        "base_url": report.base_url,
+        "is_mobile": report.is_mobile,
+        **{field: getattr(report, field) for field in REPORT_METRIC_FIELDS},
+        **details,
+        "mobile_performance": {
+            "load_time": report.load_time,
+            "performance_score": report.performance_score,
+            "is_mobile_friendly": not any(issue["severity"] == "error" for issue in mobile_issues)
+        } if report.is_mobile else None,
+        "error": report.error,
+        "created_at": report.created_at.isoformat() if report.created_at else None
+    }
+
+def _latest_reports(db: Session, page_urls: Optional[List[str]] = None, is_mobile: Optional[bool] = None) -> Dict[str, Any]:
+    """Most recent successful report per page (optionally limited to some pages)"""
+    from sqlalchemy import func
+    from app.models import PerformanceReport
+
+    latest = db.query(func.max(PerformanceReport.id)).filter(PerformanceReport.error.is_(None))
+    if page_urls is not None:
+        latest = latest.filter(PerformanceReport.page_url.in_(page_urls))
+    if is_mobile is not None:
+        latest = latest.filter(PerformanceReport.is_mobile == is_mobile)
+    latest = latest.group_by(PerformanceReport.page_url, PerformanceReport.is_mobile)
+    return {
+        report.page_url: report
+        for report in db.query(PerformanceReport).filter(PerformanceReport.id.in_(latest.scalar_subquery()))
+    }
+
+def _site_page_urls(db: Session) -> List[str]:
+    from app.models import Page, Blog
+
+    urls = ["/"]
+    urls.extend(f"/{slug}" for (slug,) in db.query(Page.slug).filter(Page.is_published == True).order_by(Page.id))
+    urls.extend(f"/blog/{slug}" for (slug,) in db.query(Blog.slug).filter(Blog.is_published == True).order_by(Blog.id))
+    return urls
+
+async def _run_and_store_audit(db: Session, page_urls: List[str], is_mobile: bool = False) -> List[Any]:
+    from app.models import PerformanceReport
+
+    previous = _latest_reports(db, page_urls, is_mobile)
+    results = await performance_auditor.audit_pages(page_urls, mobile=is_mobile)
+
+    run_id = str(uuid.uuid4())
+    reports = []
+    for result in results:
+        if result.get("error"):
+            report = PerformanceReport(
+                run_id=run_id, page_url=result["page_url"], base_url=performance_auditor.base_url,
+                is_mobile=is_mobile, error=result["error"]
+            )
+        else:
+            prior = previous.get(result["page_url"])
+            result["regressions"] = find_regressions(
+                result, {field: getattr(prior, field) for field in REPORT_METRIC_FIELDS} if prior else None
+            )
+            report = PerformanceReport(
+                run_id=run_id,
+                page_url=result["page_url"],
+                base_url=performance_auditor.base_url,
+                is_mobile=is_mobile,
+                **{field: result.get(field) for field in REPORT_METRIC_FIELDS},
+                details=json.dumps({field: result.get(field) for field in REPORT_DETAIL_FIELDS})
+            )
+        db.add(report)
+        reports.append(report)
+
+    db.commit()
+    for report in reports:
+        db.refresh(report)
+    return reports
+
 @router.get("/performance/report/{page_url:path}")
 async def get_page_performance_report(
     page_url: str,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get performance report for a page"""
-    return {
-        "page_url": page_url,
-        "load_time": 1200,
-        "first_contentful_paint": 800,
-        "largest_contentful_paint": 1500,
-        "cumulative_layout_shift": 0.1,
-        "first_input_delay": 50,
-        "performance_score": 85,
-        "accessibility_score": 92,
-        "best_practices_score": 88,
-        "seo_score": 95,
-        "recommendations": [
-            {"type": "warning", "message": "Optimize images", "impact": "medium"},
-            {"type": "info", "message": "Enable compression", "impact": "low"}
-        ],
-        "mobile_performance": {
-            "load_time": 1800,
-            "performance_score": 75,
-            "is_mobile_friendly": True
-        }
-    }
+    """Get the latest performance report for a page"""
+    report = _latest_reports(db, [normalize_page_url(page_url)], is_mobile=False).get(normalize_page_url(page_url))
+    if not report:
+        raise HTTPException(status_code=404, detail="No performance report for this page yet; run an audit first")
+    return _report_to_dict(report)
 
 @router.get("/performance/reports")
 async def get_all_performance_reports(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get performance reports for all pages"""
-    return []
+    """Get the latest performance report for every audited page"""
+    reports = _latest_reports(db, is_mobile=False)
+    return [_report_to_dict(reports[page_url], include_resources=False) for page_url in sorted(reports)]
+
+@router.get("/performance/history/{page_url:path}")
+async def get_performance_history(
+    page_url: str,
+    limit: int = 20,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Get historical performance reports for a page, newest first"""
+    from app.models import PerformanceReport
+
+    reports = db.query(PerformanceReport).filter(
+        PerformanceReport.page_url == normalize_page_url(page_url)
+    ).order_by(PerformanceReport.id.desc()).limit(min(limit, 200)).all()
+    return [_report_to_dict(report, include_resources=False) for report in reports]
 
 @router.post("/performance/audit")
 async def run_performance_audit(
@@ -896,28 +1431,46 @@ async def run_performance_audit(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Run performance audit"""
-    page_url = request_data.get("page_url", "")
+    """Run a performance audit against AUDIT_BASE_URL
+
+    Accepts {"page_url": "/about"} for a single page, {"page_urls": [...]} for
+    several, or {"all_pages": true} for the home page plus every published page
+    and blog post. Pages are fetched concurrently and every report is stored.
+    """
+    if request_data.get("all_pages"):
+        page_urls = _site_page_urls(db)
+    else:
+        page_urls = list(request_data.get("page_urls") or [])
+        if request_data.get("page_url"):
+            page_urls.insert(0, request_data["page_url"])
+    page_urls = list(dict.fromkeys(normalize_page_url(url) for url in page_urls if url))
+
+    if not page_urls:
+        raise HTTPException(status_code=400, detail="page_url, page_urls or all_pages is required")
+    if len(page_urls) > AUDIT_MAX_PAGES:
+        raise HTTPException(status_code=400, detail=f"At most {AUDIT_MAX_PAGES} pages can be audited at once")
+
+    reports = await _run_and_store_audit(db, page_urls, is_mobile=bool(request_data.get("mobile")))
+    if request_data.get("page_url") and len(reports) == 1:
+        report = reports[0]
+        if report.error:
+            raise HTTPException(status_code=502, detail=report.error)
+        return _report_to_dict(report)
+
     return {
-        "page_url": page_url,
-        "load_time": 1200,
-        "first_contentful_paint": 800,
-        "largest_contentful_paint": 1500,
-        "cumulative_layout_shift": 0.1,
-        "first_input_delay": 50,
-        "performance_score": 85,
-        "accessibility_score": 92,
-        "best_practices_score": 88,
-        "seo_score": 95,
-        "recommendations": [
-            {"type": "warning", "message": "Optimize images", "impact": "medium"},
-            {"type": "info", "message": "Enable compression", "impact": "low"}
-        ],
-        "mobile_performance": {
-            "load_time": 1800,
-            "performance_score": 75,
-            "is_mobile_friendly": True
-        }
+        "run_id": reports[0].run_id,
+        "base_url": performance_auditor.base_url,
+        "reports": [_report_to_dict(report, include_resources=False) for report in reports],
+        "regression_count": sum(len(json.loads(report.details).get("regressions", [])) for report in reports if report.details)
+    }
+
+def _minify_result(original: str, minified: str) -> Dict[str, Any]:
+    original_size = len(original.encode("utf-8"))
+    minified_size = len(minified.encode("utf-8"))
+    return {
+        "original_size": original_size,
+        "minified_size": minified_size,
+        "size_reduction": round(100 * (1 - minified_size / original_size)) if original_size else 0
     }
 
 @router.post("/performance/minify-css")
@@ -928,11 +1481,10 @@ async def minify_css(
 ):
     """Minify CSS"""
     css_content = request_data.get("css_content", "")
-    # Mock minification
-    minified_css = css_content.replace("  ", "").replace("\n", "")
+    minified_css = await run_in_threadpool(minify_css_source, css_content)
     return {
         "minified_css": minified_css,
-        "size_reduction": 30
+        **_minify_result(css_content, minified_css)
     }
 
 @router.post("/performance/minify-js")
@@ -943,11 +1495,34 @@ async def minify_js(
 ):
     """Minify JavaScript"""
     js_content = request_data.get("js_content", "")
-    # Mock minification
-    minified_js = js_content.replace("  ", "").replace("\n", "")
+    minified_js = await run_in_threadpool(minify_js_source, js_content)
     return {
         "minified_js": minified_js,
-        "size_reduction": 25
+        **_minify_result(js_content, minified_js)
+    }
+
+@router.get("/performance/assets")
+async def get_asset_manifest(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get the manifest of built CSS/JS bundles"""
+    manifest = load_manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Assets have not been built yet")
+    return manifest
+
+@router.post("/performance/assets/build")
+async def build_static_assets(
+    current_user: User = Depends(get_admin_user)
+):
+    """Minify CSS/JS sources into hashed, precompressed bundles"""
+    try:
+        manifest = await run_in_threadpool(build_assets)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {
+        "message": f"Built {len(manifest['assets'])} assets",
+        **manifest
     }
 
 @router.post("/performance/caching-headers")
@@ -970,17 +1545,19 @@ async def test_mobile_responsiveness(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Test mobile responsiveness"""
-    page_url = request_data.get("page_url", "")
+    """Fetch a page with a mobile user agent and check viewport and layout issues"""
+    page_url = normalize_page_url(request_data.get("page_url", "/"))
+    report = (await _run_and_store_audit(db, [page_url], is_mobile=True))[0]
+    if report.error:
+        raise HTTPException(status_code=502, detail=report.error)
+
+    result = _report_to_dict(report, include_resources=False)
     return {
-        "is_mobile_friendly": True,
-        "issues": [
-            {"type": "viewport", "description": "Viewport meta tag missing", "severity": "error"}
-        ],
-        "screenshots": {
-            "desktop": "https://example.com/screenshots/desktop.png",
-            "mobile": "https://example.com/screenshots/mobile.png"
-        }
+        "is_mobile_friendly": result["mobile_performance"]["is_mobile_friendly"],
+        "issues": result["mobile_issues"],
+        "load_time": report.load_time,
+        "performance_score": report.performance_score,
+        "total_transfer_size": report.total_transfer_size
     }
 
 @router.get("/performance/recommendations/{page_url:path}")
@@ -989,16 +1566,21 @@ async def get_performance_recommendations(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get performance recommendations"""
+    """Get performance recommendations from the latest audit of a page"""
+    report = _latest_reports(db, [normalize_page_url(page_url)], is_mobile=False).get(normalize_page_url(page_url))
+    if not report:
+        return []
+    recommendations = json.loads(report.details or "{}").get("recommendations", [])
     return [
         {
             "category": "performance",
-            "title": "Optimize Images",
-            "description": "Compress and optimize images to reduce file size",
-            "impact": "high",
+            "title": recommendation["message"],
+            "description": ", ".join(recommendation["urls"][:5]),
+            "impact": recommendation["impact"],
             "effort": "medium",
-            "savings": "2.5s"
+            "count": recommendation["count"]
         }
+        for recommendation in recommendations
     ]
 
 # ============================================================================
@@ -1027,6 +1609,15 @@ async def get_redirects(
         for redirect in redirects
     ]
 
+def _check_redirect_type(data: Dict[str, Any]) -> None:
+    """Reject a redirect_type that is not a redirect status, normalizing it to an int"""
+    if "redirect_type" in data:
+        redirect_type = redirect_status(data["redirect_type"])
+        if redirect_type is None:
+            allowed = ", ".join(str(code) for code in sorted(STATUS_LABELS))
+            raise HTTPException(status_code=400, detail=f"redirect_type must be one of {allowed}")
+        data["redirect_type"] = redirect_type
+
 @router.post("/redirects")
 async def add_redirect(
     redirect_data: Dict[str, Any],
@@ -1039,12 +1630,17 @@ async def add_redirect(
     # Validate required fields
     if not redirect_data.get("from_url") or not redirect_data.get("to_url"):
         raise HTTPException(status_code=400, detail="from_url and to_url are required")
+    _check_redirect_type(redirect_data)
 
     # Check if from_url already exists
     existing = db.query(Redirect).filter(Redirect.from_url == redirect_data["from_url"]).first()
     if existing:
         raise HTTPException(status_code=400, detail="Redirect from this URL already exists")
 
+    cycle = find_redirect_cycle(load_redirect_graph(db), redirect_data["from_url"], redirect_data["to_url"])
+    if cycle:
+        raise HTTPException(status_code=400, detail="Redirect loop: " + " -> ".join(cycle))
+
     redirect = Redirect(
         from_url=redirect_data["from_url"],
         to_url=redirect_data["to_url"],
@@ -1056,6 +1652,7 @@ async def add_redirect(
     db.add(redirect)
     db.commit()
     db.refresh(redirect)
+    redirects_changed(db)
 
     return {
         "id": redirect.id,
@@ -1081,6 +1678,7 @@ async def update_redirect(
     redirect = db.query(Redirect).filter(Redirect.id == redirect_id).first()
     if not redirect:
         raise HTTPException(status_code=404, detail="Redirect not found")
+    _check_redirect_type(redirect_data)
 
     # Check if from_url is being changed and if it conflicts
     if "from_url" in redirect_data and redirect_data["from_url"] != redirect.from_url:
@@ -1091,6 +1689,17 @@ async def update_redirect(
         if existing:
             raise HTTPException(status_code=400, detail="Redirect from this URL already exists")
 
+    if redirect_data.get("is_active", redirect.is_active):
+        graph = load_redirect_graph(db)
+        graph.pop(normalize_path(redirect.from_url), None)
+        cycle = find_redirect_cycle(
+            graph,
+            redirect_data.get("from_url", redirect.from_url),
+            redirect_data.get("to_url", redirect.to_url)
+        )
+        if cycle:
+            raise HTTPException(status_code=400, detail="Redirect loop: " + " -> ".join(cycle))
+
     # Update fields
     for field in ["from_url", "to_url", "redirect_type", "is_active", "description"]:
         if field in redirect_data:
@@ -1098,6 +1707,7 @@ async def update_redirect(
 
     db.commit()
     db.refresh(redirect)
+    redirects_changed(db)
 
     return {
         "id": redirect.id,
@@ -1125,6 +1735,7 @@ async def delete_redirect(
 
     db.delete(redirect)
     db.commit()
+    redirects_changed(db)
 
     return {"message": "Redirect deleted successfully"}
 
@@ -1134,40 +1745,119 @@ async def test_redirect(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Test redirect"""
+    """Test redirect using the same resolver as the redirect middleware"""
     from_url = request_data.get("from_url", "")
+    if redirect_resolver.needs_reload():
+        redirect_resolver.load(db)
+
+    match = redirect_resolver.resolve(from_url)
+    if not match:
+        return {"found": False}
+
     return {
         "found": True,
         "redirect": {
-            "to_url": "https://example.com/new-page",
-            "redirect_type": 301,
-            "status": "Permanent Redirect"
+            "to_url": match.to_url,
+            "redirect_type": match.redirect_type,
+            "status": STATUS_LABELS.get(match.redirect_type, "Redirect"),
+            "source": match.source
         }
     }
 
+def _import_redirect_rows(db: Session, rows: Iterable[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Feed (row_number, row) pairs through the batched importer
+
+    If the file cannot be parsed partway through, the rows before the error
+    stay imported and the error is returned as "parse_error" with the counts.
+    """
+    importer = RedirectImporter(db)
+    last_row = 0
+    parse_error = None
+    try:
+        for row_number, row in rows:
+            importer.add(row_number, row)
+            last_row = row_number
+    except (ValueError, csv.Error) as e:
+        parse_error = f"Could not parse import file after row {last_row}: {e}"
+    finally:
+        result = importer.finish()
+        redirects_changed(db)
+    if parse_error:
+        result["parse_error"] = parse_error
+    return result
+
 @router.post("/redirects/bulk-import")
 async def bulk_import_redirects(
     request_data: Dict[str, Any],
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Bulk import redirects"""
+    """Bulk import redirects from a JSON body ({"redirects": [...]})"""
     redirects = request_data.get("redirects", [])
-    return {
-        "success_count": len(redirects),
-        "failed_count": 0,
-        "errors": []
-    }
+    rows = ((index, row if isinstance(row, dict) else {}) for index, row in enumerate(redirects, start=1))
+    return await run_in_threadpool(_import_redirect_rows, db, rows)
+
+@router.post("/redirects/bulk-import/file")
+async def bulk_import_redirects_file(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Bulk import redirects from an uploaded CSV, JSON or NDJSON file
+
+    The upload is read incrementally and rows are upserted in batches, so
+    files with many thousands of legacy URLs do not have to fit in memory.
+    JSON files may be an array of rows or {"redirects": [...]}; either way
+    the array is decoded one element at a time.
+
+    Batches are committed as they fill, so when the file turns out to be
+    malformed partway through, the rows before the error stay imported: the
+    400 response carries the error as "detail" along with the usual counts.
+    """
+    filename = (file.filename or "").lower()
+    text_stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+
+    if filename.endswith((".ndjson", ".jsonl")):
+        rows = iter_json_rows(text_stream, line_delimited=True)
+    elif filename.endswith(".json") or file.content_type == "application/json":
+        rows = iter_json_rows(text_stream, line_delimited=False)
+    else:
+        rows = iter_csv_rows(text_stream)
+
+    try:
+        result = await run_in_threadpool(_import_redirect_rows, db, rows)
+    finally:
+        text_stream.detach()
+    if "parse_error" in result:
+        return JSONResponse(status_code=400, content={"detail": result.pop("parse_error"), **result})
+    return result
 
 @router.get("/redirects/export")
 async def export_redirects(
     format: str = "csv",
-    current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_admin_user)
 ):
-    """Export redirects"""
+    """Export redirects as a streamed CSV or JSON download"""
+    if format not in ("csv", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'json'")
+
+    media_type = "text/csv" if format == "csv" else "application/json"
+    return StreamingResponse(
+        iter_redirects_export(format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="redirects.{format}"'}
+    )
+
+def _redirect_rule_to_dict(rule) -> Dict[str, Any]:
     return {
-        "download_url": f"https://example.com/exports/redirects.{format}"
+        "id": rule.id,
+        "pattern": rule.pattern,
+        "replacement": rule.replacement,
+        "redirect_type": rule.redirect_type,
+        "is_active": rule.is_active,
+        "description": rule.description,
+        "created_at": rule.created_at.isoformat() if rule.created_at else None,
+        "updated_at": rule.updated_at.isoformat() if rule.updated_at else None
     }
 
 @router.get("/redirects/rules")
@@ -1176,7 +1866,9 @@ async def get_redirect_rules(
     db: Session = Depends(get_db)
 ):
     """Get redirect rules"""
-    return []
+    from app.models import RedirectRule
+    rules = db.query(RedirectRule).order_by(RedirectRule.id).all()
+    return [_redirect_rule_to_dict(rule) for rule in rules]
 
 @router.post("/redirects/rules")
 async def add_redirect_rule(
@@ -1185,12 +1877,34 @@ async def add_redirect_rule(
     db: Session = Depends(get_db)
 ):
     """Add redirect rule"""
-    return {
-        "id": 1,
-        **rule_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import RedirectRule
+
+    if not rule_data.get("pattern") or not rule_data.get("replacement"):
+        raise HTTPException(status_code=400, detail="pattern and replacement are required")
+
+    error = validate_pattern(rule_data["pattern"])
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    _check_redirect_type(rule_data)
+
+    existing = db.query(RedirectRule).filter(RedirectRule.pattern == rule_data["pattern"]).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Redirect rule for this pattern already exists")
+
+    rule = RedirectRule(
+        pattern=rule_data["pattern"],
+        replacement=rule_data["replacement"],
+        redirect_type=rule_data.get("redirect_type", 301),
+        is_active=rule_data.get("is_active", True),
+        description=rule_data.get("description", "")
+    )
+
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    redirects_changed(db)
+
+    return _redirect_rule_to_dict(rule)
 
 @router.put("/redirects/rules/{rule_id}")
 async def update_redirect_rule(
@@ -1200,11 +1914,33 @@ async def update_redirect_rule(
     db: Session = Depends(get_db)
 ):
     """Update redirect rule"""
-    return {
-        "id": rule_id,
-        **rule_data,
-        "updated_at": datetime.now().isoformat()
-    }
+    from app.models import RedirectRule
+
+    rule = db.query(RedirectRule).filter(RedirectRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Redirect rule not found")
+    _check_redirect_type(rule_data)
+
+    if "pattern" in rule_data and rule_data["pattern"] != rule.pattern:
+        error = validate_pattern(rule_data["pattern"])
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+        existing = db.query(RedirectRule).filter(
+            RedirectRule.pattern == rule_data["pattern"],
+            RedirectRule.id != rule_id
+        ).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Redirect rule for this pattern already exists")
+
+    for field in ["pattern", "replacement", "redirect_type", "is_active", "description"]:
+        if field in rule_data:
+            setattr(rule, field, rule_data[field])
+
+    db.commit()
+    db.refresh(rule)
+    redirects_changed(db)
+
+    return _redirect_rule_to_dict(rule)
 
 @router.delete("/redirects/rules/{rule_id}")
 async def delete_redirect_rule(
@@ -1213,6 +1949,16 @@ async def delete_redirect_rule(
     db: Session = Depends(get_db)
 ):
     """Delete redirect rule"""
+    from app.models import RedirectRule
+
+    rule = db.query(RedirectRule).filter(RedirectRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Redirect rule not found")
+
+    db.delete(rule)
+    db.commit()
+    redirects_changed(db)
+
     return {"message": "Redirect rule deleted successfully"}
 
 @router.post("/redirects/rules/test")
@@ -1221,14 +1967,108 @@ async def test_redirect_rule(
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Test redirect rule"""
+    """Test a single redirect rule pattern against a URL"""
     pattern = request_data.get("pattern", "")
     test_url = request_data.get("test_url", "")
+    replacement = request_data.get("replacement") or pattern
+
+    error = validate_pattern(pattern)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    trie = PatternTrie()
+    trie.add(compile_rule(pattern, replacement))
+    found = trie.match(test_url)
+    if not found:
+        return {"matches": False}
+
+    rule, params, rest = found
     return {
         "matches": True,
-        "result_url": "https://example.com/redirected"
+        "params": params,
+        "result_url": apply_replacement(rule.replacement, params, rest)
     }
 
+# ============================================================================
+# LINK INDEX
+# ============================================================================
+
+@router.get("/links")
+async def get_links(
+    status: Optional[str] = None,
+    internal: Optional[bool] = None,
+    source_type: Optional[str] = None,
+    limit: int = 100,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """List indexed links, e.g. ?status=broken for the broken-link report"""
+    from app.models import Link
+
+    query = db.query(Link)
+    if status:
+        query = query.filter(Link.status == status)
+    if internal is not None:
+        query = query.filter(Link.is_internal == internal)
+    if source_type:
+        query = query.filter(Link.source_type == source_type)
+    links = query.order_by(Link.source_url, Link.id).limit(max(1, min(limit, 1000))).all()
+    return [
+        {
+            "id": link.id,
+            "source_type": link.source_type,
+            "source_id": link.source_id,
+            "source_url": link.source_url,
+            "href": link.href,
+            "target_url": link.target_url,
+            "anchor_text": link.anchor_text,
+            "is_internal": link.is_internal,
+            "status": link.status,
+            "status_code": link.status_code,
+            "resolved_url": link.resolved_url,
+            "error": link.error,
+            "last_checked_at": link.last_checked_at
+        }
+        for link in links
+    ]
+
+
+@router.get("/links/summary")
+async def get_links_summary(
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Link counts by internal/external and status"""
+    from sqlalchemy import func
+    from app.models import Link
+
+    summary = {"internal": {}, "external": {}}
+    rows = db.query(Link.is_internal, Link.status, func.count(Link.id)).group_by(Link.is_internal, Link.status).all()
+    for is_internal, link_status, count in rows:
+        summary["internal" if is_internal else "external"][link_status] = count
+    return summary
+
+
+@router.post("/links/reindex")
+async def reindex_links(
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Rebuild the link index from every page and blog"""
+    result = await run_in_threadpool(reindex_all, db)
+    return {"message": "Link index rebuilt", **result}
+
+
+@router.post("/links/check-external")
+async def check_external_links(
+    options: Optional[Dict[str, Any]] = None,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Check external links that are due; {"force": true} rechecks all of them"""
+    force = bool((options or {}).get("force", False))
+    return await external_link_checker.check_index(db, force=force)
+
 
 # ============================================================================
 # GLOBAL SEO SETTINGS MANAGEMENT
@@ -1240,36 +2080,7 @@ async def get_seo_settings(
     db: Session = Depends(get_db)
 ):
     """Get global SEO settings"""
-    # For now, return default settings. In production, this would come from database
-    return {
-        "site_title": "AstroArupShastri - Professional Vedic Astrology Services",
-        "site_description": "Get accurate Vedic astrology consultations, horoscope readings, and spiritual guidance from Dr. Arup Shastri. Trusted astrology services for personal growth and life decisions.",
-        "site_keywords": "astrology, vedic astrology, horoscope, spiritual consultation, Dr. Arup Shastri, birth chart, kundli, panchang, gemstone consultation",
-        "google_analytics_id": "",
-        "facebook_app_id": "",
-        "twitter_handle": "@astroarupshastri",
-        "robots_txt": """User-agent: *
-Allow: /
-Disallow: /admin/
-Disallow: /api/
-Disallow: /private/
-
-Sitemap: https://astroarupshastri.com/sitemap.xml""",
-        "sitemap_url": "https://astroarupshastri.com/sitemap.xml",
-        "schema_markup": """{
-  "@context": "https://schema.org",
-  "@type": "Organization",
-  "name": "AstroArupShastri",
-  "url": "https://astroarupshastri.com",
-  "logo": "https://astroarupshastri.com/logo.svg",
-  "description": "Professional Vedic astrology consultations and spiritual guidance",
-  "contactPoint": {
-    "@type": "ContactPoint",
-    "telephone": "+91-9876543210",
-    "contactType": "customer service"
-  }
-}"""
-    }
+    return _load_seo_settings(db)
 
 
 @router.put("/settings")
@@ -1279,10 +2090,9 @@ async def update_seo_settings(
     db: Session = Depends(get_db)
 ):
     """Update global SEO settings"""
-    # For now, just return success. In production, save to database
     return {
         "message": "SEO settings updated successfully",
-        "settings": settings
+        "settings": _save_seo_settings(db, settings)
     }
 
 
@@ -1292,7 +2102,7 @@ async def get_seo_performance(
     db: Session = Depends(get_db)
 ):
     """Get SEO performance metrics"""
-    from app.models import Blog, Page, SEO
+    from app.models import Blog, Page, SEO, Link
 
     # Count blogs and their SEO data
     total_blogs = db.query(Blog).count()
@@ -1336,6 +2146,6 @@ async def get_seo_performance(
         "pages_with_meta_description": total_with_meta_desc,
         "pages_with_canonical": pages_with_canonical,
         "pages_with_schema": pages_with_schema,
-        "broken_links": 0,  # Placeholder - would need link checker implementation
+        "broken_links": db.query(Link).filter(Link.status == "broken").count(),
         "seo_score": seo_score
     }
@@ -2,7 +2,7 @@
 Services router for managing astrology services
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -10,17 +10,21 @@ from app.database import get_db
 from app.models import Service, User
 from app.schemas import ServiceCreate, ServiceUpdate, ServiceResponse
 from app.auth import get_admin_or_editor_user
+from app.pagination import Pagination
+from app.images import image_pipeline
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ServiceResponse])
 async def get_services(
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = 100,
+    page: Pagination = Depends(),
     db: Session = Depends(get_db)
 ):
     """Get all active services"""
-    services = db.query(Service).filter(Service.is_active == True).offset(skip).limit(limit).all()
+    query = db.query(Service).filter(Service.is_active == True)
+    services = page.paginate(query, Service.id, Service.id, skip, limit)
     return services
 
 @router.get("/{service_id}", response_model=ServiceResponse)
@@ -37,6 +41,7 @@ async def get_service(service_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=ServiceResponse)
 async def create_service(
     service: ServiceCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -45,12 +50,15 @@ async def create_service(
     db.add(db_service)
     db.commit()
     db.refresh(db_service)
+    # Generate responsive variants after the response is sent
+    background_tasks.add_task(image_pipeline.optimize_quietly, db_service.image_url)
     return db_service
 
 @router.put("/{service_id}", response_model=ServiceResponse)
 async def update_service(
     service_id: int,
     service_update: ServiceUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
@@ -68,6 +76,8 @@ async def update_service(
     
     db.commit()
     db.refresh(service)
+    if "image_url" in update_data:
+        background_tasks.add_task(image_pipeline.optimize_quietly, service.image_url)
     return service
 
 @router.delete("/{service_id}")
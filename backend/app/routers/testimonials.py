@@ -10,6 +10,8 @@ from app.database import get_db
 from app.models import Testimonial, User
 from app.schemas import TestimonialCreate, TestimonialUpdate, TestimonialResponse
 from app.auth import get_current_active_user, get_admin_or_editor_user
+from app.pagination import Pagination
+from app.loading import TESTIMONIAL_RESPONSE
 
 router = APIRouter()
 
@@ -17,22 +19,23 @@ router = APIRouter()
 async def get_testimonials(
     skip: int = 0,
     limit: int = 100,
+    page: Pagination = Depends(),
     approved_only: bool = True,
     db: Session = Depends(get_db)
 ):
     """Get all testimonials"""
-    query = db.query(Testimonial)
+    query = db.query(Testimonial).options(*TESTIMONIAL_RESPONSE)
     
     if approved_only:
         query = query.filter(Testimonial.is_approved == True)
     
-    testimonials = query.order_by(Testimonial.created_at.desc()).offset(skip).limit(limit).all()
+    testimonials = page.paginate(query, Testimonial.created_at, Testimonial.id, skip, limit, descending=True)
     return testimonials
 
 @router.get("/{testimonial_id}", response_model=TestimonialResponse)
 async def get_testimonial(testimonial_id: int, db: Session = Depends(get_db)):
     """Get a specific testimonial by ID"""
-    testimonial = db.query(Testimonial).filter(Testimonial.id == testimonial_id).first()
+    testimonial = db.query(Testimonial).options(*TESTIMONIAL_RESPONSE).filter(Testimonial.id == testimonial_id).first()
     if not testimonial:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -4,7 +4,7 @@ User management router for admin operations
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
+from sqlalchemy import or_
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -12,6 +12,7 @@ from app.database import get_db
 from app.models import User, UserRole, UserVerification
 from app.schemas import UserResponse, UserUpdate
 from app.auth import get_admin_user
+from app.pagination import Pagination
 
 router = APIRouter()
 
@@ -19,7 +20,9 @@ router = APIRouter()
 async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    page: Pagination = Depends(),
     search: Optional[str] = Query(None),
+    prefix: bool = Query(False, description="Only match the start of name, e-mail or username (can use their indexes)"),
     role: Optional[UserRole] = Query(None),
     is_verified: Optional[bool] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -31,13 +34,24 @@ async def get_users(
     
     # Apply filters
     if search:
-        query = query.filter(
-            or_(
-                User.full_name.ilike(f"%{search}%"),
-                User.email.ilike(f"%{search}%"),
-                User.username.ilike(f"%{search}%")
+        term = search.strip()
+        if prefix:
+            # Prefix matches can use the column indexes
+            query = query.filter(
+                or_(
+                    User.full_name.startswith(term, autoescape=True),
+                    User.email.startswith(term, autoescape=True),
+                    User.username.startswith(term, autoescape=True)
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    User.full_name.icontains(term, autoescape=True),
+                    User.email.icontains(term, autoescape=True),
+                    User.username.icontains(term, autoescape=True)
+                )
             )
-        )
     
     if role:
         query = query.filter(User.role == role)
@@ -48,11 +62,8 @@ async def get_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     
-    # Order by creation date (newest first)
-    query = query.order_by(desc(User.created_at))
-    
-    # Apply pagination
-    users = query.offset(skip).limit(limit).all()
+    # Paginate by creation date (newest first)
+    users = page.paginate(query, User.created_at, User.id, skip, limit, descending=True)
     
     return users
 
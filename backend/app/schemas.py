@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from app.models import UserRole, BookingStatus, ServiceType
 
@@ -102,6 +102,7 @@ class ServiceResponse(ServiceBase):
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
+    image_variants: Optional[Dict[str, Any]] = None
     
     model_config = {
         "from_attributes": True
@@ -147,6 +148,21 @@ class BookingResponse(BookingBase):
         "from_attributes": True
     }
 
+class BookingSummary(BaseModel):
+    """Flat booking list item with the service name/price (GET /api/bookings/?fields=summary)"""
+    id: int
+    user_id: int
+    service_id: int
+    service_name: str
+    service_price: Optional[float] = None
+    booking_date: datetime
+    booking_time: str
+    status: BookingStatus
+    customer_name: Optional[str] = None
+    customer_email: str
+    customer_phone: str
+    created_at: datetime
+
 # Page Schemas
 class PageBase(BaseModel):
     title: str
@@ -175,11 +191,27 @@ class PageResponse(PageBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     author_id: Optional[int] = None
+    banner_image_variants: Optional[Dict[str, Any]] = None
     
     model_config = {
         "from_attributes": True
     }
 
+class PageSummary(BaseModel):
+    """Page list item without the content HTML (GET /api/pages/?fields=summary)"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    banner_image_variants: Optional[Dict[str, Any]] = None
+    is_published: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
 # Blog Schemas
 class BlogBase(BaseModel):
     title: str
@@ -208,6 +240,24 @@ class BlogResponse(BlogBase):
     author_id: Optional[int] = None
     view_count: int
     content: Optional[str] = None
+    featured_image_variants: Optional[Dict[str, Any]] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class BlogSummary(BaseModel):
+    """Blog list item without the content HTML (GET /api/blogs/?fields=summary)"""
+    id: int
+    title: str
+    slug: str
+    description: str
+    featured_image: Optional[str] = None
+    featured_image_variants: Optional[Dict[str, Any]] = None
+    is_published: bool
+    published_at: Optional[datetime] = None
+    created_at: datetime
+    view_count: int
 
     model_config = {
         "from_attributes": True
@@ -240,6 +290,23 @@ class FAQResponse(FAQBase):
         "from_attributes": True
     }
 
+# Search Schemas
+class SearchResult(BaseModel):
+    type: str  # "blog", "page" or "faq"
+    id: int
+    title: str
+    slug: Optional[str] = None
+    url: Optional[str] = None
+    category: Optional[str] = None
+    score: float
+    highlights: Dict[str, str] = {}  # field -> HTML snippet with <mark> around matches
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+    took_ms: float
+
 # Testimonial Schemas
 class TestimonialBase(BaseModel):
     name: str
@@ -299,6 +366,14 @@ class SEOResponse(SEOBase):
         "from_attributes": True
     }
 
+class SEOBatchRequest(BaseModel):
+    pages: List[str] = []
+    blogs: List[str] = []
+
+class SEOBatchResponse(BaseModel):
+    pages: Dict[str, Optional[SEOResponse]] = {}
+    blogs: Dict[str, Optional[SEOResponse]] = {}
+
 # Panchang Schemas
 class PanchangBase(BaseModel):
     date: datetime
@@ -435,13 +510,13 @@ class KundliResponse(KundliBase):
     tithi: Optional[str] = None
     yoga: Optional[str] = None
     karan: Optional[str] = None
-    planetary_positions: Optional[str] = None
-    house_positions: Optional[str] = None
-    aspects: Optional[str] = None
+    planetary_positions: Optional[Dict[str, Any]] = None
+    house_positions: Optional[Dict[str, Any]] = None
+    aspects: Optional[Any] = None
     mangal_dosha: bool = False
     kaal_sarp_dosha: bool = False
     shani_dosha: bool = False
-    report_data: Optional[str] = None
+    report_data: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -449,6 +524,30 @@ class KundliResponse(KundliBase):
         "from_attributes": True
     }
 
+class KundliSummary(BaseModel):
+    """Kundli list item without chart JSON or report data (GET /api/kundli/user)"""
+    id: int
+    user_id: Optional[int] = None
+    name: str
+    birth_date: datetime
+    birth_time: str
+    birth_place: str
+    gender: str
+    language: str = "en"
+    chart_type: str = "south_indian"
+    sun_sign: Optional[str] = None
+    moon_sign: Optional[str] = None
+    ascendant: Optional[str] = None
+    nakshatra: Optional[str] = None
+    mangal_dosha: bool = False
+    kaal_sarp_dosha: bool = False
+    shani_dosha: bool = False
+    created_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
+
 # Matching Schemas
 class MatchingBase(BaseModel):
     male_name: str
@@ -475,9 +574,9 @@ class MatchingResponse(MatchingBase):
     total_score: int = 0
     compatibility_percentage: float = 0.0
     compatibility_level: Optional[str] = None
-    detailed_analysis: Optional[str] = None
-    recommendations: Optional[str] = None
-    remedies: Optional[str] = None
+    detailed_analysis: Optional[Dict[str, Any]] = None
+    recommendations: Optional[List[Any]] = None
+    remedies: Optional[List[Any]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -587,10 +686,10 @@ class PanchangDetailBase(BaseModel):
     gulika_kaal_end: Optional[str] = None
     yamaganda_start: Optional[str] = None
     yamaganda_end: Optional[str] = None
-    dur_muhurta_timings: Optional[str] = None
-    shubh_muhurta_timings: Optional[str] = None
-    festivals: Optional[str] = None
-    vratas: Optional[str] = None
+    dur_muhurta_timings: Optional[List[Any]] = None
+    shubh_muhurta_timings: Optional[List[Any]] = None
+    festivals: Optional[List[Any]] = None
+    vratas: Optional[List[Any]] = None
     daily_prediction: Optional[str] = None
 
 class PanchangDetailCreate(PanchangDetailBase):
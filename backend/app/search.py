@@ -0,0 +1,327 @@
+"""
+Full-text search over blogs, pages and FAQs
+
+An in-process inverted index ranked with BM25F (BM25 with per-field weights),
+so results are the same on SQLite in development and MySQL in production.
+Only published blogs/pages and active FAQs are indexed. Saves through the
+blog/page/FAQ routers update the index incrementally; other workers (or
+edits made outside the API) are picked up by a cheap signature check
+(row counts and latest timestamps) at most every SEARCH_REFRESH_SECONDS.
+The last query term also matches as a prefix, for search-as-you-type.
+"""
+
+import html
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
+
+from app.models import Blog, FAQ, Page
+
+SEARCH_REFRESH_SECONDS = float(os.getenv("SEARCH_REFRESH_SECONDS", "30"))
+SEARCH_SNIPPET_WORDS = int(os.getenv("SEARCH_SNIPPET_WORDS", "30"))
+# Prefix expansion of the last term is capped so "a" does not match the whole vocabulary
+SEARCH_MAX_PREFIX_TERMS = int(os.getenv("SEARCH_MAX_PREFIX_TERMS", "50"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights per document type
+SEARCH_FIELDS = {
+    "blog": {"title": 3.0, "description": 2.0, "content": 1.0},
+    "page": {"title": 3.0, "content": 1.0},
+    "faq": {"question": 3.0, "answer": 1.0}
+}
+SEARCH_TYPES = list(SEARCH_FIELDS)
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "that", "the", "this", "to", "was", "with"
+}
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]+>", re.S | re.I)
+_WORD_RE = re.compile(r"\w+", re.U)
+
+DocKey = Tuple[str, int]
+
+
+def strip_html(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", text)).split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in (match.group().casefold() for match in _WORD_RE.finditer(text)) if word not in STOPWORDS]
+
+
+def _document_fields(doc_type: str, row) -> Dict[str, str]:
+    return {field: strip_html(getattr(row, field, None)) for field in SEARCH_FIELDS[doc_type]}
+
+
+def _document_meta(doc_type: str, row) -> Dict[str, Any]:
+    if doc_type == "blog":
+        return {"title": row.title, "slug": row.slug, "url": f"/blog/{row.slug}"}
+    if doc_type == "page":
+        return {"title": row.title, "slug": row.slug, "url": f"/{row.slug}"}
+    return {"title": row.question, "slug": None, "url": None, "category": row.category}
+
+
+def is_searchable(doc_type: str, row) -> bool:
+    return bool(row.is_active) if doc_type == "faq" else bool(row.is_published)
+
+
+class SearchIndex:
+    """Inverted index: term -> {doc: {field: term frequency}}"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._postings: Dict[str, Dict[DocKey, Dict[str, int]]] = defaultdict(dict)
+        self._doc_terms: Dict[DocKey, List[str]] = {}
+        self._doc_lengths: Dict[DocKey, Dict[str, int]] = {}
+        self._doc_text: Dict[DocKey, Dict[str, str]] = {}
+        self._doc_meta: Dict[DocKey, Dict[str, Any]] = {}
+        self._field_totals: Dict[str, int] = defaultdict(int)
+        self._field_counts: Dict[str, int] = defaultdict(int)
+        self._sorted_terms: Optional[List[str]] = None
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+
+    # -- maintenance ---------------------------------------------------------
+
+    def _add(self, key: DocKey, fields: Dict[str, str], meta: Dict[str, Any]) -> None:
+        lengths = {}
+        terms = set()
+        for field, text in fields.items():
+            tokens = tokenize(text)
+            lengths[field] = len(tokens)
+            self._field_totals[field] += len(tokens)
+            self._field_counts[field] += 1
+            for term, count in Counter(tokens).items():
+                self._postings[term].setdefault(key, {})[field] = count
+                terms.add(term)
+        self._doc_terms[key] = list(terms)
+        self._doc_lengths[key] = lengths
+        self._doc_text[key] = fields
+        self._doc_meta[key] = meta
+        self._sorted_terms = None
+
+    def _remove(self, key: DocKey) -> None:
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        for field, length in self._doc_lengths.pop(key).items():
+            self._field_totals[field] -= length
+            self._field_counts[field] -= 1
+        self._doc_text.pop(key, None)
+        self._doc_meta.pop(key, None)
+        self._sorted_terms = None
+
+    def rebuild(self, db: Session) -> int:
+        """Index every searchable blog, page and FAQ from scratch"""
+        signature = self._compute_signature(db)
+        documents = []
+        for doc_type, model in (("blog", Blog), ("page", Page), ("faq", FAQ)):
+            flag = model.is_active if doc_type == "faq" else model.is_published
+            query = db.query(model).filter(flag == True)
+            if doc_type != "faq":
+                query = query.options(undefer_group("content"))
+            for row in query.yield_per(200):
+                documents.append(((doc_type, row.id), _document_fields(doc_type, row), _document_meta(doc_type, row)))
+
+        with self._lock:
+            self._clear()
+            for key, fields, meta in documents:
+                self._add(key, fields, meta)
+            self._signature = signature
+            self._checked_at = time.monotonic()
+        return len(documents)
+
+    def update(self, db: Session, doc_type: str, row) -> None:
+        """Re-index one saved row (removes it if it is no longer published/active)"""
+        key = (doc_type, row.id)
+        searchable = is_searchable(doc_type, row)
+        fields = _document_fields(doc_type, row) if searchable else None
+        meta = _document_meta(doc_type, row) if searchable else None
+        if self._signature is None:
+            return  # not built yet; the first search builds it
+        signature = self._compute_signature(db)
+        with self._lock:
+            self._remove(key)
+            if searchable:
+                self._add(key, fields, meta)
+            self._signature = signature
+
+    def remove(self, db: Session, doc_type: str, doc_id: int) -> None:
+        if self._signature is None:
+            return
+        signature = self._compute_signature(db)
+        with self._lock:
+            self._remove((doc_type, doc_id))
+            self._signature = signature
+
+    def _compute_signature(self, db: Session) -> Tuple:
+        signature = []
+        for model in (Blog, Page, FAQ):
+            count, created, updated = db.query(
+                func.count(model.id), func.max(model.created_at), func.max(model.updated_at)
+            ).one()
+            signature.append((count, str(created), str(updated)))
+        return tuple(signature)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Build on first use; rebuild when another process changed the content"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < SEARCH_REFRESH_SECONDS:
+            return
+        if self._signature is None or self._compute_signature(db) != self._signature:
+            self.rebuild(db)
+        else:
+            self._checked_at = now
+
+    # -- querying ------------------------------------------------------------
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = []
+        index = bisect_left(self._sorted_terms, prefix)
+        while index < len(self._sorted_terms) and self._sorted_terms[index].startswith(prefix):
+            terms.append(self._sorted_terms[index])
+            if len(terms) >= SEARCH_MAX_PREFIX_TERMS:
+                break
+            index += 1
+        return terms
+
+    def _query_terms(self, query: str) -> List[List[str]]:
+        """One group of index terms per query word; the last word may expand as a prefix"""
+        words = tokenize(query)
+        groups = [[word] for word in words]
+        if words and not query[-1:].isspace():
+            expanded = self._expand_prefix(words[-1])
+            groups[-1] = list(dict.fromkeys([words[-1]] + expanded))
+        return groups
+
+    def search(
+        self,
+        query: str,
+        types: Optional[Iterable[str]] = None,
+        limit: int = 10,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        allowed = set(types or SEARCH_TYPES)
+        with self._lock:
+            groups = self._query_terms(query)
+            total_docs = max(len(self._doc_terms), 1)
+            averages = {
+                field: self._field_totals[field] / self._field_counts[field]
+                for field in self._field_totals if self._field_counts[field]
+            }
+
+            scores: Dict[DocKey, float] = defaultdict(float)
+            matched_terms: Dict[DocKey, set] = defaultdict(set)
+            for group in groups:
+                # A prefix group counts once per document, with its best-scoring term
+                best: Dict[DocKey, float] = {}
+                for term in group:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, field_counts in postings.items():
+                        if key[0] not in allowed:
+                            continue
+                        weights = SEARCH_FIELDS[key[0]]
+                        lengths = self._doc_lengths[key]
+                        tf = sum(
+                            weights[field] * count / (1 - BM25_B + BM25_B * lengths[field] / max(averages.get(field, 1), 1))
+                            for field, count in field_counts.items()
+                        )
+                        score = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1)
+                        if score > best.get(key, 0):
+                            best[key] = score
+                        matched_terms[key].add(term)
+                for key, score in best.items():
+                    scores[key] += score
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            results = []
+            for key, score in ranked[offset:offset + limit]:
+                terms = matched_terms[key]
+                results.append({
+                    "type": key[0],
+                    "id": key[1],
+                    **self._doc_meta[key],
+                    "score": round(score, 4),
+                    "highlights": {
+                        field: snippet
+                        for field, snippet in (
+                            (field, highlight(text, terms)) for field, text in self._doc_text[key].items()
+                        )
+                        if snippet
+                    }
+                })
+            return {"total": len(ranked), "results": results}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = Counter(doc_type for doc_type, _ in self._doc_terms)
+            return {
+                "documents": dict(counts),
+                "terms": len(self._postings),
+                "built": self._signature is not None
+            }
+
+
+def highlight(text: str, terms: Iterable[str], words: int = SEARCH_SNIPPET_WORDS) -> Optional[str]:
+    """The window of `words` words with the most matches, HTML-escaped with <mark> around hits"""
+    terms = set(terms)
+    matches = list(_WORD_RE.finditer(text))
+    hits = [i for i, match in enumerate(matches) if match.group().casefold() in terms]
+    if not hits:
+        return None
+
+    # Slide over the hit positions to find the densest window
+    best_start, best_count, left = hits[0], 0, 0
+    for right in range(len(hits)):
+        while hits[right] - hits[left] >= words:
+            left += 1
+        if right - left + 1 > best_count:
+            best_count, best_start = right - left + 1, hits[left]
+    start = max(0, min(best_start - words // 4, len(matches) - words))
+    end = min(len(matches), start + words)
+
+    hit_set = set(hits)
+    parts = []
+    cursor = matches[start].start()
+    for i in range(start, end):
+        match = matches[i]
+        parts.append(html.escape(text[cursor:match.start()]))
+        word = html.escape(match.group())
+        parts.append(f"<mark>{word}</mark>" if i in hit_set else word)
+        cursor = match.end()
+    snippet = "".join(parts).strip()
+    if start > 0:
+        snippet = "… " + snippet
+    if end < len(matches):
+        snippet += " …"
+    return snippet
+
+
+search_index = SearchIndex()
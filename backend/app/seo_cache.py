@@ -0,0 +1,130 @@
+"""
+Per-path SEO lookup cache
+
+Resolves the meta tags and JSON-LD blocks for a page URL from the seo_meta,
+seo_schemas and seo_urls tables and keeps the result in memory, so server
+side rendering does not pay a database query per page render. Writes made
+through the SEO admin invalidate the affected path; a TTL bounds staleness
+across workers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.models import SEOMeta, SEOSchema, SEOUrl
+from app.redirects import normalize_path
+from app.tracing import span
+
+SEO_CACHE_TTL_SECONDS = float(os.getenv("SEO_CACHE_TTL_SECONDS", "300"))
+SEO_CACHE_MAX_ENTRIES = int(os.getenv("SEO_CACHE_MAX_ENTRIES", "5000"))
+
+META_FIELDS = [
+    "title", "meta_description", "meta_keywords", "canonical_url", "robots",
+    "og_title", "og_description", "og_image"
+]
+
+
+def normalize_page_url(page_url: str) -> str:
+    """Normalize a page URL the same way for storage and lookup"""
+    return normalize_path(page_url)
+
+
+def parse_schema_data(value: Optional[str]) -> Any:
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def resolve_seo_for_path(db, page_url: str) -> Dict[str, Any]:
+    """Load meta and JSON-LD for a single path straight from the database"""
+    path = normalize_page_url(page_url)
+
+    meta_row = db.query(SEOMeta).filter(SEOMeta.page_url == path).first()
+    meta = {field: getattr(meta_row, field) for field in META_FIELDS} if meta_row else None
+
+    url_row = db.query(SEOUrl).filter(SEOUrl.page_url == path, SEOUrl.is_active == True).first()
+    if url_row and url_row.canonical_url:
+        meta = meta or {field: None for field in META_FIELDS}
+        meta["canonical_url"] = meta.get("canonical_url") or url_row.canonical_url
+
+    schemas: List[Any] = []
+    for schema in db.query(SEOSchema).filter(SEOSchema.page_url == path, SEOSchema.is_active == True).order_by(SEOSchema.id):
+        data = parse_schema_data(schema.schema_data)
+        if data is not None:
+            schemas.append(data)
+
+    return {"path": path, "meta": meta, "schemas": schemas}
+
+
+class SEOLookupCache:
+    """LRU + TTL cache of resolve_seo_for_path results, including misses"""
+
+    def __init__(self, ttl_seconds: float = SEO_CACHE_TTL_SECONDS, max_entries: int = SEO_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 1
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db, page_url: str) -> Dict[str, Any]:
+        path = normalize_page_url(page_url)
+        with span("cache.get", **{"cache.name": "seo_lookup"}) as current:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry and entry[0] > now:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    current.set_attribute("cache.hit", True)
+                    return entry[1]
+                self.misses += 1
+                version = self.version
+
+            current.set_attribute("cache.hit", False)
+            return self._resolve(db, path, now, version)
+
+    def _resolve(self, db, path: str, now: float, version: int) -> Dict[str, Any]:
+        payload = resolve_seo_for_path(db, path)
+        payload["etag"] = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        payload["version"] = version
+        with self._lock:
+            # An invalidation while resolving may mean this payload is already stale
+            if self.version != version:
+                return payload
+            self._entries[path] = (now + self.ttl_seconds, payload)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, page_url: Optional[str] = None) -> None:
+        """Drop one path, or everything when no path is given"""
+        with self._lock:
+            self.version += 1
+            if page_url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(normalize_page_url(page_url), None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "version": self.version,
+        }
+
+
+seo_lookup_cache = SEOLookupCache()
@@ -0,0 +1,190 @@
+"""
+Adaptive load shedding
+
+When the worker falls behind, answering some requests at once with 503 and
+Retry-After keeps latency bounded for the rest, instead of letting every
+request queue behind blocked handlers until clients time out.
+
+Two signals mark the worker as overloaded:
+
+- event-loop lag (app.loopmonitor) above LOAD_SHEDDING_LOOP_LAG_MS
+- mean DB pool checkout wait over the last few seconds above
+  LOAD_SHEDDING_POOL_WAIT_MS (instrument_pool)
+
+The fraction of requests shed rises by at most SHED_STEP per
+SHED_UPDATE_SECONDS while either signal is over its threshold and falls back at that pace
+once both recover, so a short spike sheds little and sustained overload
+converges on shedding just enough. The expensive routes (see
+app.ratelimit) are shed at twice that fraction before anything else is.
+Health checks, /metrics and the admin API are never shed.
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from starlette.responses import JSONResponse
+
+from app.loopmonitor import LoopLagMonitor, loop_monitor
+from app.metrics import Gauge, registry
+from app.ratelimit import DEFAULT_RULES, Rule, match_rule
+
+LOAD_SHEDDING_ENABLED = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+LOAD_SHEDDING_LOOP_LAG_MS = float(os.getenv("LOAD_SHEDDING_LOOP_LAG_MS", "500"))
+LOAD_SHEDDING_POOL_WAIT_MS = float(os.getenv("LOAD_SHEDDING_POOL_WAIT_MS", "1000"))
+LOAD_SHEDDING_RETRY_AFTER = int(os.getenv("LOAD_SHEDDING_RETRY_AFTER", "5"))
+
+SHED_STEP = 0.1
+SHED_UPDATE_SECONDS = 0.1
+# Always let some requests through so recovery is noticed
+SHED_MAX_FRACTION = 0.9
+POOL_WAIT_WINDOW_SECONDS = 5.0
+
+EXEMPT_PREFIXES = ("/health", "/api/health", "/metrics", "/api/admin")
+
+shed_requests_total = registry.counter(
+    "shed_requests_total", "Requests rejected with 503 by load shedding", ("class",)
+)
+
+
+class WindowedMean:
+    """Mean of the values observed in the current and previous window"""
+
+    def __init__(self, window: float = POOL_WAIT_WINDOW_SECONDS):
+        self.window = window
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._current = [0.0, 0]
+        self._previous = [0.0, 0]
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._started
+        if elapsed >= self.window:
+            self._previous = self._current if elapsed < 2 * self.window else [0.0, 0]
+            self._current = [0.0, 0]
+            self._started = now
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._rotate(time.monotonic())
+            self._current[0] += value
+            self._current[1] += 1
+
+    def mean(self) -> float:
+        with self._lock:
+            self._rotate(time.monotonic())
+            total = self._current[0] + self._previous[0]
+            count = self._current[1] + self._previous[1]
+        return total / count if count else 0.0
+
+
+pool_wait = WindowedMean()
+
+
+def instrument_pool(engine) -> None:
+    """Feed `engine`'s pool checkout waits into the shedding signal"""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            pool_wait.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+class LoadShedder:
+    """Tracks the overload signals and the fraction of requests to shed"""
+
+    def __init__(self, lag_threshold: float = LOAD_SHEDDING_LOOP_LAG_MS / 1000,
+                 pool_wait_threshold: float = LOAD_SHEDDING_POOL_WAIT_MS / 1000,
+                 monitor: LoopLagMonitor = loop_monitor, waits: WindowedMean = pool_wait):
+        self.lag_threshold = lag_threshold
+        self.pool_wait_threshold = pool_wait_threshold
+        self.monitor = monitor
+        self.waits = waits
+        self.fraction = 0.0
+        self.reason: Optional[str] = None
+        self._updated = time.monotonic()
+
+    def overload(self) -> Optional[str]:
+        if self.monitor.lag > self.lag_threshold:
+            return "loop_lag"
+        if self.waits.mean() > self.pool_wait_threshold:
+            return "pool_wait"
+        return None
+
+    def update(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        steps = int((now - self._updated) / SHED_UPDATE_SECONDS)
+        if steps:
+            self._updated += steps * SHED_UPDATE_SECONDS
+            self.reason = self.overload()
+            # Rise one step per update (a single long stall is one step), recover per elapsed step
+            change = SHED_STEP if self.reason else -SHED_STEP * steps
+            self.fraction = min(SHED_MAX_FRACTION, max(0.0, self.fraction + change))
+        return self.fraction
+
+    def should_shed(self, expensive: bool) -> bool:
+        fraction = self.update()
+        if not fraction:
+            return False
+        return random.random() < min(SHED_MAX_FRACTION, fraction * 2 if expensive else fraction)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "shed_fraction": round(self.fraction, 2),
+            "reason": self.reason,
+            "loop_lag_ms": round(self.monitor.lag * 1000, 2),
+            "pool_wait_ms": round(self.waits.mean() * 1000, 2),
+        }
+
+
+load_shedder = LoadShedder()
+
+
+def _collect_shedding():
+    fraction = Gauge("load_shed_fraction", "Fraction of requests currently shed")
+    fraction.set(load_shedder.fraction)
+    return [fraction]
+
+
+registry.add_collector(_collect_shedding)
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware answering 503 with Retry-After while the worker is overloaded"""
+
+    def __init__(self, app, enabled: bool = LOAD_SHEDDING_ENABLED, shedder: LoadShedder = load_shedder,
+                 expensive: List[Rule] = DEFAULT_RULES, retry_after: int = LOAD_SHEDDING_RETRY_AFTER):
+        self.app = app
+        self.enabled = enabled
+        self.shedder = shedder
+        self.expensive = expensive
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        expensive = match_rule(self.expensive, scope["method"], scope["path"]) is not None
+        if not self.shedder.should_shed(expensive):
+            await self.app(scope, receive, send)
+            return
+
+        shed_requests_total.inc("expensive" if expensive else "other")
+        # Spread retries so shed clients do not come back together
+        retry_after = math.ceil(self.retry_after * random.uniform(1.0, 1.5))
+        response = JSONResponse(
+            {"detail": "Server is busy, please retry later"},
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,556 @@
+"""
+Request tracing
+
+Spans follow the OpenTelemetry data model and are exported as OTLP/JSON, so
+any collector, Jaeger or Tempo can ingest them; no OpenTelemetry SDK is
+needed in the app.
+
+TracingMiddleware opens a root span per sampled request (continuing an
+incoming W3C `traceparent`) and sends X-Trace-Id on the response.
+instrument_routes() adds a span around each router handler,
+trace_queries() one per SQL statement, and `with span(...)` marks anything
+else: cache lookups, bcrypt, e-mail, the kundli and matching computations.
+Outside a sampled request span() is a no-op that costs one context variable
+lookup.
+
+Finished spans go through a bounded queue to a background thread which
+writes them in batches, according to TRACING_EXPORTER:
+
+- file: one OTLP ExportTraceServiceRequest per line in TRACING_FILE (the
+  format of the collector's file exporter and otlpjsonfile receiver)
+- otlp: POSTed to TRACING_OTLP_ENDPOINT (OTLP/HTTP with JSON encoding)
+
+Spans are dropped, not waited for, when the queue is full. The module is
+also a small toolkit for reading them:
+
+    python -m app.tracing collect --port 4318 --output traces.jsonl   # OTLP/HTTP collector stand-in
+    python -m app.tracing show traces.jsonl --route /api/kundli/generate --slowest 5
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.logs import current_request_id
+from app.metrics import route_label
+from app.querylog import fingerprint
+from app.serialization import dumps
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "file").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "astro-backend")
+TRACING_QUEUE_SIZE = int(os.getenv("TRACING_QUEUE_SIZE", "10000"))
+TRACING_BATCH_SIZE = int(os.getenv("TRACING_BATCH_SIZE", "512"))
+TRACING_FLUSH_SECONDS = float(os.getenv("TRACING_FLUSH_SECONDS", "2"))
+
+TRACE_ID_HEADER = "X-Trace-Id"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP enums
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+MAX_STATEMENT_CHARS = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation; a context manager that makes itself the current span"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes",
+                 "events", "status", "status_message", "start_ns", "end_ns", "_started", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._started = time.perf_counter_ns()
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        # HTTPExceptions below 500 are answers, not failures
+        if getattr(exc, "status_code", 500) < 500:
+            return
+        self.status = STATUS_ERROR
+        self.status_message = str(exc)[:200]
+        self.events.append({
+            "name": "exception",
+            "time_ns": time.time_ns(),
+            "attributes": {"exception.type": type(exc).__name__, "exception.message": str(exc)[:1000]},
+        })
+
+    def end(self) -> None:
+        if self.end_ns:
+            return
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._started
+        span_processor.submit(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+
+
+class _NoopSpan:
+    """Stands in for a span outside sampled requests"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any):
+    """Child of the current span, or a no-op when no trace is being recorded
+
+        with span("cache.get", **{"cache.name": "seo_lookup"}) as s:
+            ...
+            s.set_attribute("cache.hit", True)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, sample_rate: float = TRACING_SAMPLE_RATE,
+                **attributes: Any) -> Optional[Span]:
+    """Root span of a new (or continued) trace, or None when it is not sampled"""
+    match = _TRACEPARENT_RE.match(traceparent or "")
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        if not int(flags, 16) & 1:
+            return None
+    else:
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return None
+        trace_id, parent_id = secrets.token_hex(16), None
+    return Span(name, trace_id, parent_id, kind=KIND_SERVER, attributes=attributes)
+
+
+# OTLP/JSON encoding
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in values.items() if value is not None]
+
+
+def encode_span(item: Span) -> Dict[str, Any]:
+    encoded = {
+        "traceId": item.trace_id,
+        "spanId": item.span_id,
+        "name": item.name,
+        "kind": item.kind,
+        "startTimeUnixNano": str(item.start_ns),
+        "endTimeUnixNano": str(item.end_ns),
+        "attributes": _attributes(item.attributes),
+        "status": {"code": item.status, "message": item.status_message} if item.status_message else {"code": item.status},
+    }
+    if item.parent_id:
+        encoded["parentSpanId"] = item.parent_id
+    if item.events:
+        encoded["events"] = [
+            {"timeUnixNano": str(e["time_ns"]), "name": e["name"], "attributes": _attributes(e["attributes"])}
+            for e in item.events
+        ]
+    return encoded
+
+
+def otlp_payload(spans: List[Span], service_name: str = TRACING_SERVICE_NAME) -> Dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest holding `spans`"""
+    return {"resourceSpans": [{
+        "resource": {"attributes": _attributes({"service.name": service_name, "process.pid": os.getpid()})},
+        "scopeSpans": [{"scope": {"name": __name__}, "spans": [encode_span(item) for item in spans]}],
+    }]}
+
+
+# Exporters
+
+class FileExporter:
+    """Appends one ExportTraceServiceRequest per line"""
+
+    def __init__(self, path: str = TRACING_FILE):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "ab") as output:
+            output.write(dumps(otlp_payload(spans)) + b"\n")
+
+
+class OTLPHttpExporter:
+    """POSTs batches to an OTLP/HTTP endpoint with the JSON encoding"""
+
+    def __init__(self, endpoint: str = TRACING_OTLP_ENDPOINT, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint, data=dumps(otlp_payload(spans)), headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def make_exporter(kind: str = TRACING_EXPORTER):
+    if kind == "otlp":
+        return OTLPHttpExporter()
+    if kind == "file":
+        return FileExporter()
+    raise ValueError(f"TRACING_EXPORTER must be 'file' or 'otlp', not {kind!r}")
+
+
+class SpanProcessor:
+    """Bounded queue of finished spans drained in batches by a background thread"""
+
+    def __init__(self, exporter=None, queue_size: int = TRACING_QUEUE_SIZE,
+                 batch_size: int = TRACING_BATCH_SIZE, flush_seconds: float = TRACING_FLUSH_SECONDS):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.exporter is None:
+                self.exporter = make_exporter()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning("Span export failed: %s", e, extra={"spans": len(batch)})
+
+    def shutdown(self) -> None:
+        """Export what is queued and stop the thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self.queue.put(None)
+        thread.join(timeout=10)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": TRACING_ENABLED,
+            "queued": self.queue.qsize(),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+span_processor = SpanProcessor()
+
+
+def tracing_stats() -> Dict[str, Any]:
+    return span_processor.stats()
+
+
+# Instrumentation
+
+class TracingMiddleware:
+    """ASGI middleware recording a root span for sampled requests"""
+
+    def __init__(self, app, enabled: bool = TRACING_ENABLED, sample_rate: float = TRACING_SAMPLE_RATE):
+        self.app = app
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        root = start_trace(
+            scope["method"], headers.get("traceparent"), self.sample_rate,
+            **{"http.request.method": scope["method"], "url.path": scope["path"],
+               "request.id": current_request_id()}
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_trace_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[TRACE_ID_HEADER] = root.trace_id
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException as exc:
+            root.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            # The route template is only known once routing has run
+            route = route_label(scope, status_code)
+            root.name = f"{scope['method']} {route}"
+            root.attributes["http.route"] = route
+            root.attributes["http.response.status_code"] = status_code
+            if status_code >= 500:
+                root.status = STATUS_ERROR
+            root.end()
+
+
+def _traced_handler(app, name: str):
+    async def traced(scope, receive, send):
+        with span(f"handler {name}", **{"code.function": name}):
+            await app(scope, receive, send)
+    return traced
+
+
+def instrument_routes(app) -> None:
+    """Wrap every API route so its handler (dependencies included) gets a span"""
+    from fastapi.routing import APIRoute
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.app = _traced_handler(route.app, route.endpoint.__name__)
+
+
+def trace_queries(engine) -> None:
+    """One span per SQL statement `engine` runs inside a traced request"""
+    system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is None:
+            return
+        conn.info.setdefault("trace_spans", []).append(Span(
+            statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+            parent.trace_id, parent.span_id, kind=KIND_CLIENT,
+            attributes={"db.system": system, "db.statement": fingerprint(statement)[:MAX_STATEMENT_CHARS],
+                        "db.executemany": executemany or None},
+        ))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            item = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                item.set_attribute("db.rows", cursor.rowcount)
+            item.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+        if spans:
+            item = spans.pop()
+            item.record_exception(context.original_exception)
+            item.end()
+
+
+# Reading exported traces
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Spans from a file of OTLP/JSON lines, with plain-dict attributes"""
+    spans = []
+    with open(path, "rb") as source:
+        for line in source:
+            if not line.strip():
+                continue
+            for resource in json.loads(line).get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for item in scope.get("spans", []):
+                        item["attributes"] = {
+                            a["key"]: next(iter(a["value"].values()), None) for a in item.get("attributes", [])
+                        }
+                        item["start"] = int(item["startTimeUnixNano"])
+                        item["duration_ms"] = (int(item["endTimeUnixNano"]) - item["start"]) / 1e6
+                        spans.append(item)
+    return spans
+
+
+def format_trace(root: Dict[str, Any], children: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    lines = []
+
+    def walk(item, depth):
+        offset = (item["start"] - root["start"]) / 1e6
+        detail = item["attributes"].get("db.statement") or ""
+        if "cache.hit" in item["attributes"]:
+            detail = "hit" if item["attributes"]["cache.hit"] else "miss"
+        error = " ERROR" if item.get("status", {}).get("code") == STATUS_ERROR else ""
+        lines.append(f"{offset:9.2f} {item['duration_ms']:9.2f}  {'  ' * depth}{item['name']}{error}  {detail[:100]}".rstrip())
+        for child in sorted(children.get(item["spanId"], []), key=lambda c: c["start"]):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return lines
+
+
+def show(path: str, route: Optional[str] = None, slowest: int = 5) -> None:
+    spans = load_spans(path)
+    ids = {item["spanId"] for item in spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    roots = []
+    for item in spans:
+        parent = item.get("parentSpanId")
+        if parent and parent in ids:
+            children.setdefault(parent, []).append(item)
+        else:
+            roots.append(item)
+    if route:
+        roots = [item for item in roots if route in item["name"]]
+
+    for root in sorted(roots, key=lambda item: item["duration_ms"], reverse=True)[:slowest]:
+        print(f"trace {root['traceId']}  {root['name']}  {root['duration_ms']:.2f} ms")
+        print(f"{'start ms':>9} {'ms':>9}  span")
+        for line in format_trace(root, children):
+            print(line)
+        print()
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    output = TRACING_FILE
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/traces" or "json" not in self.headers.get("Content-Type", ""):
+            self.send_error(415 if self.path.rstrip("/") == "/v1/traces" else 404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with open(self.output, "ab") as output:
+            output.write(body.strip() + b"\n")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def collect(port: int, output: str) -> None:
+    """Receive OTLP/HTTP JSON exports and append them to `output`"""
+    handler = type("CollectorHandler", (_CollectorHandler,), {"output": output})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    print(f"Collecting spans on http://127.0.0.1:{port}/v1/traces into {output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect and inspect exported traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+    collect_parser = commands.add_parser("collect", help="run an OTLP/HTTP (JSON) collector stand-in")
+    collect_parser.add_argument("--port", type=int, default=4318)
+    collect_parser.add_argument("--output", default=TRACING_FILE, help="file to append exports to")
+    show_parser = commands.add_parser("show", help="print the slowest traces as span trees")
+    show_parser.add_argument("path", nargs="?", default=TRACING_FILE, help="file of OTLP/JSON lines")
+    show_parser.add_argument("--route", help="only traces whose root span name contains this")
+    show_parser.add_argument("--slowest", type=int, default=5, help="number of traces to print")
+    args = parser.parse_args()
+
+    if args.command == "collect":
+        collect(args.port, args.output)
+    else:
+        show(args.path, args.route, args.slowest)
@@ -0,0 +1,350 @@
+"""
+Astrology computation microbenchmarks
+
+Times every calculation helper in the kundli, calculators, matching and
+numerology routers, plus the full per-chart pipeline each endpoint runs
+(without the database). For each function it reports:
+
+    single_us   median latency of one call, timed individually (one chart)
+    batch_ops   calls per second over a batch of distinct charts (cold path)
+    hit_ops     calls per second with the same chart repeated (the path a
+                memoized function would hit; equal to batch_ops until one is)
+    alloc_kib   peak memory traced during one call
+
+--save writes the results as a JSON baseline; --compare exits non-zero
+when throughput drops or allocations grow by more than --tolerance, so CI
+can keep a baseline from the main branch and compare each change to it.
+Baselines are only comparable on the same machine.
+
+    cd backend && python -m benchmarks.compute --save benchmarks/baselines/compute.json
+    cd backend && python -m benchmarks.compute --quick --compare benchmarks/baselines/compute.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.routers import calculators, kundli, matching, numerology
+
+NAMES = ["Arup Shastri", "Priya Sharma", "Rahul Verma", "Ananya Iyer", "Vikram Singh", "Meera Nair"]
+PLACES = ["Kolkata", "Delhi", "Mumbai", "Chennai", "Bengaluru", "Varanasi"]
+# Alloc growth below this many KiB is noise, whatever the ratio
+ALLOC_NOISE_KIB = 0.25
+
+
+@dataclass
+class Chart:
+    """One set of birth details in every form the routers take"""
+    name: str
+    birth_date: datetime
+    birth_time: str
+    birth_place: str
+    gender: str
+    latitude: float
+    longitude: float
+
+    @property
+    def date_str(self) -> str:
+        return self.birth_date.strftime("%Y-%m-%d")
+
+    @property
+    def nakshatra(self) -> str:
+        return kundli.calculate_nakshatra(self.birth_date, self.birth_time)[0]
+
+    @property
+    def moon_sign(self) -> str:
+        return kundli.calculate_moon_sign(self.birth_date, self.birth_time)
+
+    @property
+    def details(self) -> calculators.BirthDetails:
+        return calculators.BirthDetails(
+            name=self.name, birth_date=self.date_str, birth_time=self.birth_time,
+            birth_place=self.birth_place, gender=self.gender
+        )
+
+
+def make_charts(count: int, seed: int = 45) -> List[Chart]:
+    rng = random.Random(seed)
+    return [
+        Chart(
+            name=rng.choice(NAMES),
+            birth_date=datetime(1950, 1, 1) + timedelta(days=rng.randint(0, 20000)),
+            birth_time=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            birth_place=rng.choice(PLACES),
+            gender=rng.choice(["male", "female"]),
+            latitude=rng.uniform(8, 35),
+            longitude=rng.uniform(68, 97),
+        )
+        for _ in range(count)
+    ]
+
+
+def run_coroutine(coroutine):
+    """Result of a coroutine that never awaits anything pending (no event loop needed)"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended; it needs an event loop")
+
+
+# Full pipelines, mirroring the endpoints minus the database
+
+def kundli_chart(chart: Chart) -> dict:
+    """What POST /api/kundli/generate computes"""
+    sun_sign = kundli.calculate_sun_sign(chart.birth_date)
+    moon_sign = kundli.calculate_moon_sign(chart.birth_date, chart.birth_time)
+    ascendant = kundli.calculate_ascendant(chart.birth_date, chart.birth_time, chart.latitude, chart.longitude)
+    nakshatra, pada = kundli.calculate_nakshatra(chart.birth_date, chart.birth_time)
+    data = {
+        "sun_sign": sun_sign, "moon_sign": moon_sign, "ascendant": ascendant,
+        "nakshatra": nakshatra, "nakshatra_pada": pada,
+        "tithi": kundli.calculate_tithi(chart.birth_date),
+        "yoga": kundli.calculate_yoga(chart.birth_date, chart.birth_time),
+        "karan": kundli.calculate_karan(chart.birth_date),
+        "doshas": kundli.check_doshas(chart.birth_date, chart.birth_time, chart.gender),
+    }
+    planets = kundli.generate_planetary_positions(chart.birth_date, chart.birth_time)
+    data["houses"] = kundli.generate_house_positions(planets, ascendant)
+    data["report"] = kundli.generate_kundli_report(data)
+    return data
+
+
+def ashtakoot(male_nakshatra: str, female_nakshatra: str, male_moon: str, female_moon: str) -> dict:
+    """What POST /api/matching/calculate computes for two stored kundlis"""
+    scores = {
+        "varna": matching.calculate_varna_score(male_nakshatra, female_nakshatra),
+        "vashya": matching.calculate_vashya_score(male_nakshatra, female_nakshatra),
+        "tara": matching.calculate_tara_score(male_nakshatra, female_nakshatra),
+        "yoni": matching.calculate_yoni_score(male_nakshatra, female_nakshatra),
+        "graha_maitri": matching.calculate_graha_maitri_score(male_moon, female_moon),
+        "gana": matching.calculate_gana_score(male_nakshatra, female_nakshatra),
+        "bhakoot": matching.calculate_bhakoot_score(male_moon, female_moon),
+        "nadi": matching.calculate_nadi_score(male_nakshatra, female_nakshatra),
+    }
+    return matching.generate_compatibility_analysis(scores, "Male", "Female")
+
+
+def numerology_profile(name: str, birth_date: datetime) -> dict:
+    """What POST /api/numerology/calculate computes"""
+    life_path = numerology.calculate_life_path_number(birth_date)
+    destiny = numerology.calculate_name_number(name)
+    return {
+        "life_path": life_path, "destiny": destiny,
+        "soul_urge": numerology.calculate_vowel_number(name),
+        "personality": numerology.calculate_consonant_number(name),
+        "birth_day": numerology.calculate_birth_day_number(birth_date),
+        "maturity": numerology.calculate_single_digit(life_path + destiny),
+        "lucky": numerology.get_lucky_elements(life_path, destiny),
+        "traits": numerology.get_personality_traits(life_path),
+        "career": numerology.get_career_guidance(life_path, destiny),
+        "relationships": numerology.get_relationship_compatibility(life_path),
+        "health": numerology.get_health_predictions(life_path),
+        "finance": numerology.get_financial_outlook(life_path, destiny),
+    }
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable
+    args: Callable[[Chart, Chart], tuple]  # (chart, partner chart) -> positional args
+
+
+def _life_path(chart: Chart) -> int:
+    return numerology.calculate_life_path_number(chart.birth_date)
+
+
+CASES = [
+    # kundli.py
+    Case("kundli.calculate_sun_sign", kundli.calculate_sun_sign, lambda c, p: (c.birth_date,)),
+    Case("kundli.calculate_moon_sign", kundli.calculate_moon_sign, lambda c, p: (c.birth_date, c.birth_time)),
+    Case("kundli.calculate_ascendant", kundli.calculate_ascendant, lambda c, p: (c.birth_date, c.birth_time, c.latitude, c.longitude)),
+    Case("kundli.calculate_nakshatra", kundli.calculate_nakshatra, lambda c, p: (c.birth_date, c.birth_time)),
+    Case("kundli.calculate_tithi", kundli.calculate_tithi, lambda c, p: (c.birth_date,)),
+    Case("kundli.calculate_yoga", kundli.calculate_yoga, lambda c, p: (c.birth_date, c.birth_time)),
+    Case("kundli.calculate_karan", kundli.calculate_karan, lambda c, p: (c.birth_date,)),
+    Case("kundli.check_doshas", kundli.check_doshas, lambda c, p: (c.birth_date, c.birth_time, c.gender)),
+    Case("kundli.generate_planetary_positions", kundli.generate_planetary_positions, lambda c, p: (c.birth_date, c.birth_time)),
+    Case("kundli.generate_house_positions", kundli.generate_house_positions,
+         lambda c, p: (kundli.generate_planetary_positions(c.birth_date, c.birth_time),
+                       kundli.calculate_ascendant(c.birth_date, c.birth_time))),
+    Case("kundli.generate_kundli_report", kundli.generate_kundli_report,
+         lambda c, p: ({key: value for key, value in kundli_chart(c).items() if key not in ("houses", "report")},)),
+    Case("kundli: full chart", kundli_chart, lambda c, p: (c,)),
+    # calculators.py
+    Case("calculators.get_zodiac_sign", calculators.get_zodiac_sign, lambda c, p: (c.birth_date.month, c.birth_date.day)),
+    Case("calculators.calculate_moon_sign", calculators.calculate_moon_sign, lambda c, p: (c.date_str, c.birth_time)),
+    Case("calculators.calculate_ascendant", calculators.calculate_ascendant, lambda c, p: (c.date_str, c.birth_time, c.birth_place)),
+    Case("calculators.calculate_doshas", calculators.calculate_doshas, lambda c, p: (c.date_str, c.birth_time)),
+    Case("calculators.get_nakshatra_details", calculators.get_nakshatra_details, lambda c, p: (c.date_str,)),
+    Case("calculators.calculate_dasha_periods", calculators.calculate_dasha_periods, lambda c, p: (c.date_str,)),
+    Case("calculators.identify_yogas", calculators.identify_yogas, lambda c, p: (c.date_str, c.birth_time)),
+    Case("calculators.get_detailed_predictions", calculators.get_detailed_predictions,
+         lambda c, p: (calculators.get_zodiac_sign(c.birth_date.month, c.birth_date.day),
+                       calculators.calculate_moon_sign(c.date_str, c.birth_time),
+                       calculators.calculate_ascendant(c.date_str, c.birth_time, c.birth_place))),
+    Case("calculators.get_gemstone_recommendations", calculators.get_gemstone_recommendations, lambda c, p: (c.date_str, c.birth_time)),
+    Case("calculators.get_rudraksha_recommendations", calculators.get_rudraksha_recommendations,
+         lambda c, p: (c.date_str, c.birth_time, ["stress", "career"])),
+    # Includes building and encoding the response, as the endpoint does
+    Case("calculators: full kundli (endpoint)", lambda details: run_coroutine(calculators.calculate_kundli(details)),
+         lambda c, p: (c.details,)),
+    # matching.py
+    Case("matching.calculate_varna_score", matching.calculate_varna_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.calculate_vashya_score", matching.calculate_vashya_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.calculate_tara_score", matching.calculate_tara_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.calculate_yoni_score", matching.calculate_yoni_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.calculate_graha_maitri_score", matching.calculate_graha_maitri_score, lambda c, p: (c.moon_sign, p.moon_sign)),
+    Case("matching.calculate_gana_score", matching.calculate_gana_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.calculate_bhakoot_score", matching.calculate_bhakoot_score, lambda c, p: (c.moon_sign, p.moon_sign)),
+    Case("matching.calculate_nadi_score", matching.calculate_nadi_score, lambda c, p: (c.nakshatra, p.nakshatra)),
+    Case("matching.generate_compatibility_analysis", matching.generate_compatibility_analysis,
+         lambda c, p: ({"varna": 1, "vashya": 2, "tara": 3, "yoni": 4, "graha_maitri": 5, "gana": 6, "bhakoot": 7,
+                        "nadi": 8 if c.gender == p.gender else 0}, c.name, p.name)),
+    Case("matching: full ashtakoot", ashtakoot, lambda c, p: (c.nakshatra, p.nakshatra, c.moon_sign, p.moon_sign)),
+    # numerology.py
+    Case("numerology.calculate_single_digit", numerology.calculate_single_digit, lambda c, p: (c.birth_date.toordinal(),)),
+    Case("numerology.calculate_name_number", numerology.calculate_name_number, lambda c, p: (c.name,)),
+    Case("numerology.calculate_vowel_number", numerology.calculate_vowel_number, lambda c, p: (c.name,)),
+    Case("numerology.calculate_consonant_number", numerology.calculate_consonant_number, lambda c, p: (c.name,)),
+    Case("numerology.calculate_life_path_number", numerology.calculate_life_path_number, lambda c, p: (c.birth_date,)),
+    Case("numerology.calculate_birth_day_number", numerology.calculate_birth_day_number, lambda c, p: (c.birth_date,)),
+    Case("numerology.get_lucky_elements", numerology.get_lucky_elements,
+         lambda c, p: (_life_path(c), numerology.calculate_name_number(c.name))),
+    Case("numerology.get_personality_traits", numerology.get_personality_traits, lambda c, p: (_life_path(c),)),
+    Case("numerology.get_career_guidance", numerology.get_career_guidance,
+         lambda c, p: (_life_path(c), numerology.calculate_name_number(c.name))),
+    Case("numerology.get_relationship_compatibility", numerology.get_relationship_compatibility, lambda c, p: (_life_path(c),)),
+    Case("numerology.get_health_predictions", numerology.get_health_predictions, lambda c, p: (_life_path(c),)),
+    Case("numerology.get_financial_outlook", numerology.get_financial_outlook,
+         lambda c, p: (_life_path(c), numerology.calculate_name_number(c.name))),
+    Case("numerology: full profile", numerology_profile, lambda c, p: (c.name, c.birth_date)),
+]
+
+
+# Measurement
+
+def batch_ops(fn: Callable, batch: List[tuple], rounds: int) -> float:
+    """Calls per second over `batch`, best median of `rounds` passes"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for args in batch:
+            fn(*args)
+        samples.append(time.perf_counter() - started)
+    elapsed = statistics.median(samples)
+    return len(batch) / elapsed if elapsed else float("inf")
+
+
+def single_us(fn: Callable, batch: List[tuple]) -> float:
+    """Median microseconds of one call, each timed on its own"""
+    samples = []
+    for args in batch:
+        started = time.perf_counter_ns()
+        fn(*args)
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    return statistics.median(samples)
+
+
+def alloc_kib(fn: Callable, batch: List[tuple]) -> float:
+    """Median peak KiB traced per call"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for args in batch:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            fn(*args)
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+def bench_case(case: Case, charts: List[Chart], rounds: int) -> Dict[str, float]:
+    # Arguments are built up front so only the function itself is timed
+    batch = [case.args(chart, charts[-index - 1]) for index, chart in enumerate(charts)]
+    repeated = [batch[0]] * len(batch)
+    for args in batch[:10]:
+        case.fn(*args)
+    return {
+        "single_us": round(single_us(case.fn, batch), 3),
+        "batch_ops": round(batch_ops(case.fn, batch, rounds)),
+        "hit_ops": round(batch_ops(case.fn, repeated, rounds)),
+        "alloc_kib": round(alloc_kib(case.fn, batch[:50]), 3),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Cases whose throughput fell or allocations grew by more than `tolerance`"""
+    regressions = []
+    print(f"\n{'function':<48}{'batch base':>12}{'batch now':>12}{'KiB base':>10}{'KiB now':>10}")
+    for name, result in results.items():
+        base = baseline.get("functions", {}).get(name)
+        if base is None:
+            continue
+        flags = []
+        for metric in ("batch_ops", "hit_ops"):
+            if base[metric] and result[metric] < base[metric] * (1 - tolerance):
+                flags.append(metric)
+        if result["alloc_kib"] > base["alloc_kib"] * (1 + tolerance) and result["alloc_kib"] - base["alloc_kib"] > ALLOC_NOISE_KIB:
+            flags.append("alloc_kib")
+        if flags:
+            regressions.append(f"{name} ({', '.join(flags)})")
+        print(f"{name:<48}{base['batch_ops']:>12,}{result['batch_ops']:>12,}{base['alloc_kib']:>10.2f}{result['alloc_kib']:>10.2f}"
+              f"{'  REGRESSED ' + ','.join(flags) if flags else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charts", type=int, default=2000, help="distinct charts per batch")
+    parser.add_argument("--rounds", type=int, default=5, help="timed passes over each batch")
+    parser.add_argument("--quick", action="store_true", help="smaller batches for CI (--charts 1000 --rounds 5)")
+    parser.add_argument("--filter", help="only functions whose name contains this")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+    if args.quick:
+        args.charts, args.rounds = 1000, 5
+
+    charts = make_charts(args.charts)
+    cases = [case for case in CASES if not args.filter or args.filter in case.name]
+    print(f"charts: {args.charts}, rounds: {args.rounds}, python: {platform.python_version()}")
+    print(f"{'function':<48}{'single us':>11}{'batch ops/s':>14}{'hit ops/s':>14}{'peak KiB':>10}")
+    results = {}
+    for case in cases:
+        result = results[case.name] = bench_case(case, charts, args.rounds)
+        print(f"{case.name:<48}{result['single_us']:>11.2f}{result['batch_ops']:>14,}{result['hit_ops']:>14,}{result['alloc_kib']:>10.2f}")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "meta": {"charts": args.charts, "rounds": args.rounds, "python": platform.python_version(),
+                     "machine": platform.machine(), "created": datetime.utcnow().isoformat(timespec="seconds") + "Z"},
+            "functions": results,
+        }
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"\nregressions beyond {args.tolerance:.0%}: {'; '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""
+Per-endpoint load test
+
+Runs the app in-process (httpx ASGI transport, lifespan included) against a
+seeded fixture database and drives a read/write mix from --concurrency async
+clients for --duration seconds. Reports throughput and p50/p95/p99 latency
+per endpoint, plus the peak memory traced per request, measured in a
+separate sequential pass so tracemalloc does not skew the latencies.
+
+The fixture volumes at --scale 1 are 10k users, 100k bookings, 10k blogs
+and 1M kundlis. Seeding only tops up missing rows, so a database file is
+reused between runs; --database takes any URL the app supports (a SQLite
+file or a MySQL server). Use --scale 0.01 for a quick run.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+--compare exits non-zero when an endpoint's p95 or throughput regresses by
+more than --tolerance.
+
+    cd backend && python -m benchmarks.load --scale 0.01 --duration 20 --save benchmarks/baselines/load.json
+    cd backend && python -m benchmarks.load --scale 0.01 --duration 20 --compare benchmarks/baselines/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+DEFAULT_DATABASE = "sqlite:///./benchmarks/load.db"
+
+# Rows at --scale 1
+VOLUMES = {"users": 10_000, "services": 20, "blogs": 10_000, "bookings": 100_000, "kundlis": 1_000_000}
+BATCH_SIZE = 5000
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio",
+         "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+PLACES = ["Kolkata", "Delhi", "Mumbai", "Chennai", "Bengaluru", "Varanasi"]
+PARAGRAPH = "<p>Planetary transits shape the houses of the birth chart and the dasha periods that follow. </p>"
+
+LOAD_USER = "loadtest-user"
+LOAD_ADMIN = "loadtest-admin"
+
+
+def load_app(database: str, verbose: bool = False):
+    """Import the app bound to `database` (the engine is created at import time)"""
+    os.environ["DATABASE_URL"] = database
+    if not verbose:
+        # Per-request info logs (unconfigured e-mail, httpx) would bury the report
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Every simulated client shares one address, and the point is to measure
+    # the endpoints at full load rather than the 429s and 503s guarding them
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("LOAD_SHEDDING_ENABLED", "false")
+    import main
+    return main
+
+
+# Seeding
+
+def _top_up(engine, table, target: int, make_row: Callable[[int], Dict]) -> int:
+    from sqlalchemy import func, select
+
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(table)).scalar()
+    for start in range(existing, target, BATCH_SIZE):
+        rows = [make_row(i) for i in range(start, min(start + BATCH_SIZE, target))]
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+    return max(target - existing, 0)
+
+
+def seed(engine, scale: float) -> Dict[str, int]:
+    """Insert missing fixture rows; returns rows added per table"""
+    from sqlalchemy import select
+
+    from app.auth import get_password_hash
+    from app.database import Base
+    from app.models import Blog, Booking, BookingStatus, Kundli, Service, ServiceType, User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    targets = {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+    password = get_password_hash("loadtest")
+    now = datetime.utcnow()
+    added = {}
+
+    def user_row(i):
+        username = {0: LOAD_ADMIN, 1: LOAD_USER}.get(i, f"loadtest-{i}")
+        return {
+            "email": f"{username}@example.com", "username": username, "hashed_password": password,
+            "full_name": f"Load Test {i}", "phone": "9000000000", "is_active": True, "is_verified": True,
+            "role": UserRole.ADMIN if i == 0 else UserRole.USER,
+        }
+
+    added["users"] = _top_up(engine, User.__table__, targets["users"] + 2, user_row)
+
+    service_types = list(ServiceType)
+    added["services"] = _top_up(engine, Service.__table__, targets["services"], lambda i: {
+        "name": f"Consultation {i}", "description": "Personal consultation", "is_active": True,
+        "service_type": service_types[i % len(service_types)], "price": 500.0 + 100 * i, "duration_minutes": 60,
+    })
+
+    added["blogs"] = _top_up(engine, Blog.__table__, targets["blogs"], lambda i: {
+        "title": f"Blog post {i}", "slug": f"load-blog-{i}", "description": "A short description " * 5,
+        "content": PARAGRAPH * 20, "is_published": i % 10 != 0, "published_at": now - timedelta(hours=i),
+        "created_at": now - timedelta(hours=i), "view_count": i % 1000,
+    })
+
+    with engine.connect() as conn:
+        user_ids = [row[0] for row in conn.execute(select(User.id))]
+        service_ids = [row[0] for row in conn.execute(select(Service.id))]
+    statuses = list(BookingStatus)
+    rng = random.Random(44)
+
+    added["bookings"] = _top_up(engine, Booking.__table__, targets["bookings"], lambda i: {
+        "user_id": rng.choice(user_ids), "service_id": rng.choice(service_ids),
+        "booking_date": now + timedelta(days=rng.randint(-365, 90)), "booking_time": f"{9 + i % 9:02d}:00",
+        "status": rng.choice(statuses), "customer_name": f"Customer {i}", "customer_email": f"customer{i}@example.com",
+        "customer_phone": "9000000000", "birth_place": rng.choice(PLACES),
+    })
+
+    added["kundlis"] = _top_up(engine, Kundli.__table__, targets["kundlis"], lambda i: {
+        "user_id": rng.choice(user_ids), "name": f"Chart {i}",
+        "birth_date": datetime(1950, 1, 1) + timedelta(days=rng.randint(0, 20000)),
+        "birth_time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}", "birth_place": rng.choice(PLACES),
+        "gender": rng.choice(["male", "female"]), "language": "en",
+        "sun_sign": rng.choice(SIGNS), "moon_sign": rng.choice(SIGNS), "ascendant": rng.choice(SIGNS),
+        "planetary_positions": {planet: rng.choice(SIGNS) for planet in PLANETS},
+        "house_positions": {str(house): SIGNS[(house + i) % 12] for house in range(1, 13)},
+        "mangal_dosha": rng.random() < 0.3, "chart_type": "south_indian",
+    })
+    return added
+
+
+@dataclass
+class Fixture:
+    """Ids the scenarios pick from"""
+    user_token: str
+    admin_token: str
+    blog_ids: List[int]
+    blog_slugs: List[str]
+    service_ids: List[int]
+    kundli_ids: List[int]
+    booking_ids: List[int]
+
+    @classmethod
+    def load(cls, session_factory) -> "Fixture":
+        from app.auth import create_access_token
+        from app.models import Blog, Booking, Kundli, Service, User
+
+        db = session_factory()
+        try:
+            user = db.query(User).filter(User.username == LOAD_USER).one()
+            blogs = db.query(Blog.id, Blog.slug).filter(Blog.is_published == True).order_by(Blog.id).limit(1000).all()
+            return cls(
+                user_token=create_access_token({"sub": LOAD_USER}),
+                admin_token=create_access_token({"sub": LOAD_ADMIN}),
+                blog_ids=[blog.id for blog in blogs],
+                blog_slugs=[blog.slug for blog in blogs],
+                service_ids=[row[0] for row in db.query(Service.id)],
+                kundli_ids=[row[0] for row in db.query(Kundli.id).filter(Kundli.user_id == user.id).limit(1000)] or [1],
+                booking_ids=[row[0] for row in db.query(Booking.id).filter(Booking.user_id == user.id).limit(1000)] or [1],
+            )
+        finally:
+            db.close()
+
+
+# Scenarios
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[random.Random, Fixture], str]
+    weight: int = 1
+    write: bool = False
+    auth: Optional[str] = None  # "user" or "admin"
+    body: Optional[Callable[[random.Random, Fixture], Dict]] = None
+
+    def request(self, rng: random.Random, fixture: Fixture) -> Dict:
+        headers = {"Accept-Encoding": "gzip, br"}
+        if self.auth:
+            token = fixture.admin_token if self.auth == "admin" else fixture.user_token
+            headers["Authorization"] = f"Bearer {token}"
+        request = {"method": self.method, "url": self.path(rng, fixture), "headers": headers}
+        if self.body is not None:
+            request["json"] = self.body(rng, fixture)
+        return request
+
+
+def _birth_details(rng: random.Random, fixture: Fixture) -> Dict:
+    return {
+        "name": "Load Test", "birth_date": f"{rng.randint(1950, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "birth_time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}", "birth_place": rng.choice(PLACES),
+        "gender": rng.choice(["male", "female"]),
+    }
+
+
+def _kundli(rng: random.Random, fixture: Fixture) -> Dict:
+    details = _birth_details(rng, fixture)
+    return dict(details, birth_date=details["birth_date"] + "T00:00:00")
+
+
+def _booking(rng: random.Random, fixture: Fixture) -> Dict:
+    return {
+        "service_id": rng.choice(fixture.service_ids),
+        "booking_date": (datetime.utcnow() + timedelta(days=rng.randint(1, 60))).isoformat(),
+        "booking_time": f"{rng.randint(9, 17):02d}:00", "customer_email": "load@example.com",
+        "customer_phone": "9000000000", "customer_name": "Load Test",
+    }
+
+
+SCENARIOS = [
+    Scenario("GET /api/blogs/", "GET", lambda rng, f: f"/api/blogs/?skip={rng.randrange(0, 200)}&limit=20", weight=10),
+    Scenario("GET /api/blogs/{blog_id}", "GET", lambda rng, f: f"/api/blogs/{rng.choice(f.blog_ids)}", weight=10),
+    Scenario("GET /api/blogs/slug/{slug}", "GET", lambda rng, f: f"/api/blogs/slug/{rng.choice(f.blog_slugs)}", weight=5),
+    Scenario("GET /api/services/", "GET", lambda rng, f: "/api/services/", weight=5),
+    Scenario("GET /api/search/", "GET", lambda rng, f: f"/api/search/?q={rng.choice(SIGNS)}", weight=3),
+    Scenario("GET /api/bookings/my-bookings", "GET", lambda rng, f: "/api/bookings/my-bookings", weight=4, auth="user"),
+    Scenario("GET /api/bookings/{booking_id}", "GET", lambda rng, f: f"/api/bookings/{rng.choice(f.booking_ids)}", weight=2, auth="user"),
+    Scenario("GET /api/admin/bookings", "GET", lambda rng, f: f"/api/admin/bookings?fields=summary&skip={rng.randrange(0, 1000)}&limit=50", weight=2, auth="admin"),
+    Scenario("GET /api/kundli/user", "GET", lambda rng, f: "/api/kundli/user", weight=4, auth="user"),
+    Scenario("GET /api/kundli/{kundli_id}", "GET", lambda rng, f: f"/api/kundli/{rng.choice(f.kundli_ids)}", weight=4, auth="user"),
+    Scenario("POST /api/calculators/kundli", "POST", lambda rng, f: "/api/calculators/kundli", weight=3, body=_birth_details),
+    Scenario("POST /api/bookings/", "POST", lambda rng, f: "/api/bookings/", weight=1, write=True, auth="user", body=_booking),
+    Scenario("POST /api/kundli/generate", "POST", lambda rng, f: "/api/kundli/generate", weight=2, write=True, auth="user", body=_kundli),
+]
+
+
+def pick_scenario(rng: random.Random, scenarios: List[Scenario], write_ratio: float) -> Scenario:
+    reads = [scenario for scenario in scenarios if not scenario.write]
+    writes = [scenario for scenario in scenarios if scenario.write]
+    pool = writes if writes and (not reads or rng.random() < write_ratio) else reads
+    return rng.choices(pool, weights=[scenario.weight for scenario in pool])[0]
+
+
+# Measurement
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    alloc_peak_kib: Optional[float] = None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_load(client: httpx.AsyncClient, scenarios: List[Scenario], fixture: Fixture, concurrency: int,
+                   duration: float, write_ratio: float, seed_value: int) -> Dict[str, EndpointStats]:
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed_value + index)
+        while time.perf_counter() < deadline:
+            scenario = pick_scenario(rng, scenarios, write_ratio)
+            entry = stats[scenario.name]
+            started = time.perf_counter()
+            try:
+                response = await client.request(**scenario.request(rng, fixture))
+                status = response.status_code
+            except Exception:
+                status = 599
+            entry.latencies.append((time.perf_counter() - started) * 1000)
+            entry.statuses[status] += 1
+            if status >= 400:
+                entry.errors += 1
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return stats
+
+
+async def measure_allocations(client: httpx.AsyncClient, scenarios: List[Scenario], fixture: Fixture,
+                              requests: int, seed_value: int) -> Dict[str, float]:
+    """Median peak KiB traced per request, one request at a time"""
+    rng = random.Random(seed_value)
+    results = {}
+    tracemalloc.start()
+    try:
+        for scenario in scenarios:
+            peaks = []
+            for _ in range(requests):
+                request = scenario.request(rng, fixture)
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                await client.request(**request)
+                peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+            results[scenario.name] = statistics.median(peaks)
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def summarize(stats: Dict[str, EndpointStats], elapsed: float) -> Dict:
+    endpoints = {}
+    for name, entry in sorted(stats.items()):
+        latencies = sorted(entry.latencies)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": entry.errors,
+            "statuses": {str(code): count for code, count in sorted(entry.statuses.items())},
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "alloc_peak_kib": None if entry.alloc_peak_kib is None else round(entry.alloc_peak_kib, 1),
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {"total": {"requests": total, "rps": round(total / elapsed, 2)}, "endpoints": endpoints}
+
+
+def print_report(report: Dict) -> None:
+    meta = report["meta"]
+    print(f"database: {meta['dialect']}, scale: {meta['scale']}, concurrency: {meta['concurrency']}, "
+          f"duration: {meta['duration']}s, write ratio: {meta['write_ratio']}")
+    print(f"{'endpoint':<36}{'reqs':>7}{'err':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+    for name, result in report["endpoints"].items():
+        alloc = "-" if result["alloc_peak_kib"] is None else f"{result['alloc_peak_kib']:.1f}"
+        print(f"{name:<36}{result['requests']:>7}{result['errors']:>6}{result['rps']:>9.1f}"
+              f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{alloc:>10}")
+    print(f"{'total':<36}{report['total']['requests']:>7}{'':>6}{report['total']['rps']:>9.1f}")
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Endpoints whose p95 grew or throughput fell by more than `tolerance`"""
+    regressions = []
+    print(f"\n{'endpoint':<36}{'p95 base':>10}{'p95 now':>10}{'rps base':>10}{'rps now':>10}")
+    for name, result in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if base is None:
+            continue
+        flags = []
+        if base["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            flags.append("p95")
+        if base["rps"] and result["rps"] < base["rps"] * (1 - tolerance):
+            flags.append("rps")
+        if flags:
+            regressions.append(f"{name} ({', '.join(flags)})")
+        print(f"{name:<36}{base['p95_ms']:>10.2f}{result['p95_ms']:>10.2f}{base['rps']:>10.1f}{result['rps']:>10.1f}"
+              f"{'  REGRESSED ' + ','.join(flags) if flags else ''}")
+    return regressions
+
+
+async def run(args) -> Dict:
+    main_module = load_app(args.database, args.verbose)
+    from app.database import SessionLocal, engine
+
+    started = time.perf_counter()
+    added = seed(engine, args.scale)
+    if any(added.values()):
+        print(f"seeded in {time.perf_counter() - started:.1f}s: {added}", file=sys.stderr)
+    fixture = Fixture.load(SessionLocal)
+
+    scenarios = [scenario for scenario in SCENARIOS if not args.endpoint or scenario.name in args.endpoint]
+    if args.write_ratio == 0:
+        scenarios = [scenario for scenario in scenarios if not scenario.write]
+
+    app = main_module.app
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            # Warm caches and connections before measuring
+            await run_load(client, scenarios, fixture, args.concurrency, min(args.duration, args.warmup), args.write_ratio, args.seed)
+            load_started = time.perf_counter()
+            stats = await run_load(client, scenarios, fixture, args.concurrency, args.duration, args.write_ratio, args.seed)
+            elapsed = time.perf_counter() - load_started
+            if args.alloc_requests:
+                allocations = await measure_allocations(client, scenarios, fixture, args.alloc_requests, args.seed)
+                for name, peak in allocations.items():
+                    stats[name].alloc_peak_kib = peak
+
+    report = summarize(stats, elapsed)
+    report["meta"] = {
+        "dialect": engine.dialect.name, "scale": args.scale, "concurrency": args.concurrency,
+        "duration": args.duration, "write_ratio": args.write_ratio, "seed": args.seed,
+        "python": platform.python_version(), "created": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default=os.getenv("LOAD_DATABASE_URL", DEFAULT_DATABASE))
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of the default fixture volumes")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of unmeasured load first")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="share of requests that write")
+    parser.add_argument("--endpoint", action="append", help="only this scenario (repeatable), e.g. 'GET /api/blogs/'")
+    parser.add_argument("--alloc-requests", type=int, default=20, help="requests per endpoint in the allocation pass; 0 skips it")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput regression, as a fraction")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's info logs")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.save}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"\nregressions beyond {args.tolerance:.0%}: {'; '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
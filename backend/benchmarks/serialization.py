@@ -0,0 +1,141 @@
+"""
+Response serialization benchmark
+
+Compares FastAPI's default path (ORM objects validated against the
+response_model, then encoded by JSONResponse) with the fast path (column
+rows or plain data encoded once by FastJSONResponse) for each router that
+uses it. List timings include loading the rows; the calculator timing is
+the serialization of a full kundli payload. Runs against an in-memory
+SQLite database seeded with --rows rows.
+
+    cd backend && python -m benchmarks.serialization --rows 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer_group
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Blog, Page
+from app.routers.blogs import blog_projection
+from app.routers.calculators import BirthDetails, CalculatorResponse, calculate_kundli, calculator_response
+from app.routers.pages import page_projection
+from app.schemas import BlogResponse, PageResponse
+from app.serialization import orjson
+
+loop = asyncio.new_event_loop()
+
+PARAGRAPH = "<p>Planetary transits shape the houses of the birth chart and the dasha periods that follow. </p>"
+
+
+def seed(rows: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    start = datetime(2024, 1, 1)
+    for i in range(rows):
+        db.add(Blog(
+            title=f"Blog post {i}", slug=f"blog-{i}", description="A short description " * 5,
+            content=PARAGRAPH * 40, is_published=True, published_at=start + timedelta(days=i),
+            created_at=start + timedelta(days=i), view_count=i
+        ))
+        db.add(Page(title=f"Page {i}", slug=f"page-{i}", content=PARAGRAPH * 40, excerpt="Excerpt", is_published=True))
+    db.commit()
+    return Session
+
+
+def default_path(schema) -> Callable:
+    field = create_response_field(name="Response", type_=List[schema])
+
+    def render(rows):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=rows))
+        return JSONResponse(content).body
+    return render
+
+
+def timed(fn: Callable, repeat: int) -> float:
+    """Median milliseconds per call"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_list(Session, model, schema, projection, repeat: int) -> Dict[str, float]:
+    render = default_path(schema)
+
+    def default():
+        db = Session()
+        rows = db.query(model).options(*(undefer_group(group) for group in projection.undefer)).order_by(model.id).all()
+        body = render(rows)
+        db.close()
+        return body
+
+    def fast():
+        db = Session()
+        rows = projection.select(db, None).order_by(model.id).all()
+        body = projection.rows_response(rows, None).body
+        db.close()
+        return body
+
+    assert json.loads(default()) == json.loads(fast()), "fast path output differs"
+    return {"default_ms": timed(default, repeat), "fast_ms": timed(fast, repeat)}
+
+
+def bench_calculator(repeat: int) -> Dict[str, float]:
+    details = BirthDetails(
+        name="Test", birth_date="1990-05-01", birth_time="10:30", birth_place="Kolkata", gender="male"
+    )
+    field = create_response_field(name="Response", type_=CalculatorResponse)
+
+    data = json.loads(loop.run_until_complete(calculate_kundli(details)).body)
+
+    def default():
+        response = CalculatorResponse(success=True, data=data["data"], message=data["message"])
+        content = loop.run_until_complete(serialize_response(field=field, response_content=response))
+        return JSONResponse(content).body
+
+    def fast():
+        return calculator_response(data["data"], data["message"]).body
+
+    assert json.loads(default()) == json.loads(fast()), "fast path output differs"
+    return {"default_ms": timed(default, repeat), "fast_ms": timed(fast, repeat)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    Session = seed(args.rows)
+    results = {
+        "blogs (GET /api/blogs/)": bench_list(Session, Blog, BlogResponse, blog_projection, args.repeat),
+        "pages (GET /api/pages/)": bench_list(Session, Page, PageResponse, page_projection, args.repeat),
+        "calculators (POST /api/calculators/kundli)": bench_calculator(args.repeat),
+    }
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}, rows: {args.rows}, repeat: {args.repeat}")
+    print(f"{'router':<44}{'default ms':>12}{'fast ms':>10}{'speedup':>10}")
+    for name, result in results.items():
+        speedup = result["default_ms"] / result["fast_ms"] if result["fast_ms"] else float("inf")
+        print(f"{name:<44}{result['default_ms']:>12.3f}{result['fast_ms']:>10.3f}{speedup:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+from app.querylog import query_budget as _query_budget
+
+
+@pytest.fixture
+def query_budget():
+    """Assert how many SQL statements a block may run, e.g.
+
+        with TestClient(app) as client, query_budget(max_queries=4, max_repeats=1):
+            client.get("/api/bookings/")
+    """
+    return _query_budget
@@ -3,12 +3,16 @@ FastAPI Backend for Astrology Website
 Main application entry point
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from typing import Optional
 import uvicorn
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -17,45 +21,100 @@ from datetime import datetime
 # Load environment variables from .env file
 load_dotenv()
 
-from app.database import engine, Base, get_db
+# Structured logging through a non-blocking queue (LOG_* env vars)
+from app.logs import configure_logging, shutdown_logging, logging_stats, RequestIdMiddleware
+configure_logging()
+logger = logging.getLogger(__name__)
+
+from app.database import engine, Base, get_db, add_missing_columns
 from app.models import User, Blog, Service
-from app.routers import auth, users, pages, blogs, bookings, seo, seo_admin, admin, services, faqs, testimonials, panchang, horoscopes, calculators, kundli, matching, numerology
+from app.redirects import RedirectMiddleware, redirect_resolver
+from app.compression import CompressionMiddleware, compressed_body_cache
+from app.metrics import MetricsMiddleware, instrument_engine, register_cache, metrics_response, METRICS_PATH
+from app.pagination import count_cache
+from app.querylog import QueryLogMiddleware, instrument_queries
+from app.profiling import ProfilerMiddleware
+from app.tracing import TracingMiddleware, instrument_routes, trace_queries, tracing_stats
+from app.ratelimit import RateLimitMiddleware
+from app.shedding import LoadSheddingMiddleware, instrument_pool, load_shedder
+from app.loopmonitor import LoopMonitorMiddleware, loop_monitor
+from app.seo_cache import seo_lookup_cache
+from app.images import VariantStaticFiles, IMAGE_CACHE_DIR, IMAGE_PUBLIC_PREFIX
+from app.assets import PrecompressedStaticFiles, ASSET_OUTPUT_DIR, ASSET_PUBLIC_PREFIX
+from app.search import search_index
+from app.serialization import FastJSONResponse, FAST_JSON_RESPONSES
+from app.routers import auth, users, pages, blogs, bookings, search, seo, seo_admin, profiler, event_loop, admin, services, faqs, testimonials, panchang, horoscopes, calculators, kundli, matching, numerology
 
 # Create database tables
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🔄 Creating database tables...", file=sys.stderr)
+    logger.info("Creating database tables...")
     try:
         Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created successfully", file=sys.stderr)
+        logger.info("Database tables created successfully")
+        added = add_missing_columns(engine)
+        if added:
+            logger.info("Added missing columns: %s", ", ".join(added))
 
         # Test database connection
         from app.database import get_db
         db = next(get_db())
         blog_count = db.query(Blog).count()
-        print(f"✅ Database connection verified: {blog_count} blogs found", file=sys.stderr)
+        logger.info("Database connection verified: %d blogs found", blog_count)
+
+        # Warm the redirect map so the first request does not pay for it
+        redirect_resolver.load(db)
+        logger.info("Redirects loaded", extra={"redirects": redirect_resolver.stats()})
+
+        # Build the search index up front as well
+        search_index.rebuild(db)
+        logger.info("Search index built", extra={"search_index": search_index.stats()})
         db.close()
 
     except Exception as e:
-        print(f"❌ Database initialization failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Database initialization failed: %s", e)
         raise
 
+    # Event-loop lag and stall monitor (also feeds load shedding)
+    loop_monitor.start()
+
     yield
     # Shutdown
-    print("🛑 Shutting down AstroArupShastri Backend", file=sys.stderr)
+    await loop_monitor.stop()
+    logger.info("Shutting down AstroArupShastri Backend")
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Astrology Website API",
     description="Backend API for astrology consultation website",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if FAST_JSON_RESPONSES else JSONResponse
 )
 
-# CORS middleware - configured for production
+# Redirect middleware - applies active Redirect/RedirectRule rows at request time
+app.add_middleware(RedirectMiddleware)
+
+# Compression - gzip/brotli for JSON, HTML and XML responses (sizes/types from COMPRESSION_* env vars)
+app.add_middleware(CompressionMiddleware)
+
+# SQL instrumentation - warns about likely N+1 requests (QUERY_LOG_* env vars)
+app.add_middleware(QueryLogMiddleware)
+instrument_queries(engine)
+
+# Profiling - requests with an admin-issued X-Profile-Token are sampled (off unless PROFILER_ENABLED=true)
+app.add_middleware(ProfilerMiddleware)
+
+# Rate limits - token buckets for login/registration/e-mail, kundli, matching and calculators (RATE_LIMIT_* env vars)
+app.add_middleware(RateLimitMiddleware)
+
+# Load shedding - 503 + Retry-After while event-loop lag or DB pool wait is too high (LOAD_SHEDDING_* env vars)
+app.add_middleware(LoadSheddingMiddleware)
+instrument_pool(engine)
+
+# CORS middleware - configured for production; outside rate limiting and load shedding
+# so their 429/503 responses carry CORS headers (and preflights never count against limits)
 allowed_origins = os.getenv(
     "ALLOWED_ORIGINS",
     "http://localhost:3000,http://localhost:3001,http://127.0.0.1:3000,http://127.0.0.1:3001,https://astroarupshastri.com,https://www.astroarupshastri.com"  # Default for development and production
@@ -69,6 +128,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Event-loop monitor - records which request each task serves, so stalls name their handler
+app.add_middleware(LoopMonitorMiddleware)
+
+# Metrics - outside the middleware above, so latency includes all of them
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+register_cache("seo_lookup", seo_lookup_cache.stats)
+register_cache("compressed_body", compressed_body_cache.stats)
+register_cache("pagination_count", count_cache.stats)
+
+# Tracing - root span per sampled request; SQL statements become child spans (TRACING_* env vars)
+app.add_middleware(TracingMiddleware)
+trace_queries(engine)
+
+# Request ids - outermost, so every log record of the request carries the id
+app.add_middleware(RequestIdMiddleware)
+
+# Optimized image variants (generated by app.images)
+IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+app.mount(IMAGE_PUBLIC_PREFIX, VariantStaticFiles(directory=IMAGE_CACHE_DIR), name="optimized-images")
+
+# Minified, precompressed CSS/JS bundles (built by app.assets)
+ASSET_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+app.mount(ASSET_PUBLIC_PREFIX, PrecompressedStaticFiles(directory=ASSET_OUTPUT_DIR), name="assets")
+
 # Security
 security = HTTPBearer()
 
@@ -80,9 +164,12 @@ app.include_router(blogs.router, prefix="/api/blogs", tags=["Blogs"])
 app.include_router(bookings.router, prefix="/api/bookings", tags=["Bookings"])
 app.include_router(seo.router, prefix="/api/seo", tags=["SEO"])
 app.include_router(seo_admin.router, prefix="/api/admin/seo", tags=["SEO Admin"])
+app.include_router(profiler.router, prefix="/api/admin/profiler", tags=["Profiler"])
+app.include_router(event_loop.router, prefix="/api/admin/event-loop", tags=["Event Loop"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 app.include_router(services.router, prefix="/api/services", tags=["Services"])
 app.include_router(faqs.router, prefix="/api/faqs", tags=["FAQs"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(testimonials.router, prefix="/api/testimonials", tags=["Testimonials"])
 app.include_router(panchang.router, prefix="/api/panchang", tags=["Panchang"])
 app.include_router(horoscopes.router, prefix="/api/horoscopes", tags=["Horoscopes"])
@@ -99,14 +186,26 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness probe - answers from the process alone, never touches the database"""
+    return {"status": "alive", "timestamp": datetime.now().isoformat()}
+
+@app.get(METRICS_PATH, include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus metrics (text exposition format)"""
+    return metrics_response(authorization)
+
 @app.get("/api/health")
 async def api_health_check(db: Session = Depends(get_db)):
     """Detailed health check for API endpoints"""
     try:
-        # Test database connection
-        blog_count = db.query(Blog).count()
-        user_count = db.query(User).count()
-        service_count = db.query(Service).count()
+        # Counts come from the pagination count cache, so frequent probes cost
+        # one cheap query instead of three full COUNT(*)s
+        db.execute(text("SELECT 1"))
+        blog_count = count_cache.count(db.query(Blog))
+        user_count = count_cache.count(db.query(User))
+        service_count = count_cache.count(db.query(Service))
 
         return {
             "status": "healthy",
@@ -116,6 +215,9 @@ async def api_health_check(db: Session = Depends(get_db)):
                 "services": service_count,
                 "connection": "ok"
             },
+            "logging": logging_stats(),
+            "tracing": tracing_stats(),
+            "load": load_shedder.stats(),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -125,12 +227,12 @@ async def api_health_check(db: Session = Depends(get_db)):
             "timestamp": datetime.now().isoformat()
         }
 
+# A span around each handler, dependencies included (after every route is registered)
+instrument_routes(app)
+
 if __name__ == "__main__":
     # Diagnostic logging for production debugging
-    import sys
-    print("🚀 Starting AstroArupShastri Backend...", file=sys.stderr)
-    print(f"Python version: {sys.version}", file=sys.stderr)
-    print(f"Working directory: {os.getcwd()}", file=sys.stderr)
+    logger.info("Starting AstroArupShastri Backend...", extra={"python": sys.version, "cwd": os.getcwd()})
 
     # Test database connection
     try:
@@ -138,17 +240,19 @@ if __name__ == "__main__":
         db = next(get_db())
         from app.models import Blog
         blog_count = db.query(Blog).count()
-        print(f"✅ Database connection successful: {blog_count} blogs found", file=sys.stderr)
+        logger.info("Database connection successful: %d blogs found", blog_count)
         db.close()
     except Exception as e:
-        print(f"❌ Database connection failed: {e}", file=sys.stderr)
+        logger.error("Database connection failed: %s", e)
+        shutdown_logging()
         sys.exit(1)
 
-    print("🎯 Starting uvicorn server...", file=sys.stderr)
+    logger.info("Starting uvicorn server...")
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        log_config=None  # uvicorn's loggers go through app.logs
     )
@@ -0,0 +1,9 @@
+-- Migration: Store the optimized-variant manifest of each service, page and
+-- blog image on the row, so listing them never reads the variant cache
+--
+-- Filled in when an image is (re-)optimized. The backend also adds these
+-- columns at startup (app.database.add_missing_columns).
+
+ALTER TABLE services ADD COLUMN image_manifest JSON;
+ALTER TABLE pages ADD COLUMN banner_image_manifest JSON;
+ALTER TABLE blogs ADD COLUMN featured_image_manifest JSON;
@@ -0,0 +1,22 @@
+-- Migration: Index links found in page/blog content for broken-link checking
+
+CREATE TABLE IF NOT EXISTS links (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_type VARCHAR(20) NOT NULL,
+    source_id INTEGER NOT NULL,
+    source_url VARCHAR(500) NOT NULL,
+    href VARCHAR(1000) NOT NULL,
+    target_url VARCHAR(1000) NOT NULL,
+    anchor_text VARCHAR(500),
+    is_internal BOOLEAN DEFAULT TRUE,
+    status VARCHAR(20) DEFAULT 'unchecked',
+    status_code INTEGER,
+    resolved_url VARCHAR(1000),
+    error TEXT,
+    last_checked_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_links_source ON links(source_type, source_id);
+CREATE INDEX IF NOT EXISTS ix_links_target_url ON links(target_url);
+CREATE INDEX IF NOT EXISTS ix_links_status ON links(status);
@@ -0,0 +1,29 @@
+-- Migration: Store SEO performance audit reports for history and regression tracking
+
+CREATE TABLE IF NOT EXISTS performance_reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id VARCHAR(36),
+    page_url VARCHAR(500) NOT NULL,
+    base_url VARCHAR(500),
+    is_mobile BOOLEAN DEFAULT FALSE,
+    status_code INTEGER,
+    load_time INTEGER,
+    ttfb INTEGER,
+    html_size INTEGER,
+    total_transfer_size INTEGER,
+    image_weight INTEGER,
+    script_weight INTEGER,
+    stylesheet_weight INTEGER,
+    request_count INTEGER,
+    render_blocking_count INTEGER,
+    performance_score INTEGER,
+    accessibility_score INTEGER,
+    best_practices_score INTEGER,
+    seo_score INTEGER,
+    error TEXT,
+    details TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_performance_reports_page_url ON performance_reports(page_url, is_mobile);
+CREATE INDEX IF NOT EXISTS idx_performance_reports_run_id ON performance_reports(run_id);
@@ -0,0 +1,16 @@
+-- Migration: Add redirect_rules table for pattern-based redirects
+-- Patterns use path segments, e.g. /blog/:slug -> /articles/:slug or /old-site/* -> /new-site/*
+
+CREATE TABLE IF NOT EXISTS redirect_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pattern VARCHAR(500) NOT NULL UNIQUE,
+    replacement VARCHAR(500) NOT NULL,
+    redirect_type INTEGER DEFAULT 301,
+    is_active BOOLEAN DEFAULT TRUE,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_redirects_is_active ON redirects(is_active);
+CREATE INDEX IF NOT EXISTS idx_redirect_rules_is_active ON redirect_rules(is_active);
@@ -0,0 +1,20 @@
+-- Migration: Track SEO admin images and their optimized variants
+
+CREATE TABLE IF NOT EXISTS seo_images (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_url VARCHAR(500) NOT NULL UNIQUE,
+    alt_text VARCHAR(500),
+    title_attribute VARCHAR(255),
+    caption VARCHAR(500),
+    page_url VARCHAR(500),
+    file_size INTEGER,
+    width INTEGER,
+    height INTEGER,
+    optimized_size INTEGER,
+    content_hash VARCHAR(64),
+    is_optimized BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_seo_images_page_url ON seo_images(page_url);
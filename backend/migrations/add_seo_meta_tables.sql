@@ -0,0 +1,64 @@
+-- Migration: Persist SEO admin data (meta tags, JSON-LD, URL overrides, sitemap entries, settings)
+
+CREATE TABLE IF NOT EXISTS seo_meta (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_url VARCHAR(500) NOT NULL UNIQUE,
+    title VARCHAR(255),
+    meta_description VARCHAR(500),
+    meta_keywords VARCHAR(500),
+    canonical_url VARCHAR(500),
+    robots VARCHAR(100) DEFAULT 'index, follow',
+    og_title VARCHAR(255),
+    og_description VARCHAR(500),
+    og_image VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS seo_schemas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_url VARCHAR(500) NOT NULL,
+    schema_type VARCHAR(100),
+    schema_data TEXT NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS seo_urls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_url VARCHAR(500) NOT NULL UNIQUE,
+    custom_slug VARCHAR(255),
+    canonical_url VARCHAR(500),
+    redirect_from TEXT,
+    redirect_to VARCHAR(500),
+    redirect_type INTEGER DEFAULT 301,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS sitemap_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url VARCHAR(500) NOT NULL UNIQUE,
+    last_modified TIMESTAMP,
+    change_frequency VARCHAR(20) DEFAULT 'weekly',
+    priority FLOAT DEFAULT 0.5,
+    page_type VARCHAR(50) DEFAULT 'page',
+    include_images BOOLEAN DEFAULT FALSE,
+    include_categories BOOLEAN DEFAULT FALSE,
+    include_tags BOOLEAN DEFAULT FALSE,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS seo_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key VARCHAR(100) NOT NULL UNIQUE,
+    value TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_seo_schemas_page_url ON seo_schemas(page_url);
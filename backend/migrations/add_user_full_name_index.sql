@@ -0,0 +1,3 @@
+-- Migration: Index users.full_name so admin user search can use prefix lookups
+
+CREATE INDEX IF NOT EXISTS ix_users_full_name ON users(full_name);
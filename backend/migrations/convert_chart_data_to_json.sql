@@ -0,0 +1,43 @@
+-- Migration: Store chart/analysis/panchang data as native JSON and add
+-- generated planet-in-sign columns on kundlis
+--
+-- Existing values are JSON text already, so the type change keeps them readable.
+-- MySQL (production):
+
+ALTER TABLE kundlis
+    MODIFY planetary_positions JSON,
+    MODIFY house_positions JSON,
+    MODIFY aspects JSON,
+    MODIFY report_data JSON;
+
+ALTER TABLE kundlis
+    ADD COLUMN mars_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Mars"'))),
+    ADD COLUMN mercury_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Mercury"'))),
+    ADD COLUMN jupiter_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Jupiter"'))),
+    ADD COLUMN venus_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Venus"'))),
+    ADD COLUMN saturn_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Saturn"'))),
+    ADD COLUMN rahu_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Rahu"'))),
+    ADD COLUMN ketu_sign VARCHAR(50) AS (json_unquote(json_extract(planetary_positions, '$."Ketu"')));
+
+CREATE INDEX ix_kundlis_mars_sign ON kundlis(mars_sign);
+CREATE INDEX ix_kundlis_mercury_sign ON kundlis(mercury_sign);
+CREATE INDEX ix_kundlis_jupiter_sign ON kundlis(jupiter_sign);
+CREATE INDEX ix_kundlis_venus_sign ON kundlis(venus_sign);
+CREATE INDEX ix_kundlis_saturn_sign ON kundlis(saturn_sign);
+CREATE INDEX ix_kundlis_rahu_sign ON kundlis(rahu_sign);
+CREATE INDEX ix_kundlis_ketu_sign ON kundlis(ketu_sign);
+
+ALTER TABLE matchings
+    MODIFY detailed_analysis JSON,
+    MODIFY recommendations JSON,
+    MODIFY remedies JSON;
+
+ALTER TABLE panchang_details
+    MODIFY dur_muhurta_timings JSON,
+    MODIFY shubh_muhurta_timings JSON,
+    MODIFY festivals JSON,
+    MODIFY vratas JSON;
+
+-- SQLite (development) keeps JSON as text; run
+-- convert_chart_data_to_json_sqlite.sql instead. The backend also adds the
+-- missing columns at startup (app.database.add_missing_columns).
@@ -0,0 +1,22 @@
+-- Migration: Generated planet-in-sign columns on kundlis (SQLite)
+--
+-- SQLite keeps JSON as text, so only the generated columns are new; see
+-- convert_chart_data_to_json.sql for MySQL. Needed by the checked-in
+-- astrology_website.db and any SQLite database created before the change.
+-- Run once: sqlite3 astrology_website.db < migrations/convert_chart_data_to_json_sqlite.sql
+
+ALTER TABLE kundlis ADD COLUMN mars_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Mars"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN mercury_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Mercury"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN jupiter_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Jupiter"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN venus_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Venus"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN saturn_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Saturn"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN rahu_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Rahu"')) VIRTUAL;
+ALTER TABLE kundlis ADD COLUMN ketu_sign VARCHAR(50) GENERATED ALWAYS AS (json_extract(planetary_positions, '$."Ketu"')) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS ix_kundlis_mars_sign ON kundlis(mars_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_mercury_sign ON kundlis(mercury_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_jupiter_sign ON kundlis(jupiter_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_venus_sign ON kundlis(venus_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_saturn_sign ON kundlis(saturn_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_rahu_sign ON kundlis(rahu_sign);
+CREATE INDEX IF NOT EXISTS ix_kundlis_ketu_sign ON kundlis(ketu_sign);
@@ -0,0 +1,77 @@
+"""
+API test fixtures: the app on a throwaway SQLite database with seeded rows
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Must be set before app.database is imported anywhere
+_fd, DB_PATH = tempfile.mkstemp(suffix=".db")
+os.close(_fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import pytest
+from fastapi.testclient import TestClient
+
+BOOKINGS = 30
+TESTIMONIALS = 10
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+    os.remove(DB_PATH)
+
+
+@pytest.fixture(scope="session")
+def seeded(client):
+    """An admin, a customer with bookings across several services, and testimonials
+
+    Returns auth headers per user and the number of rows seeded.
+    """
+    from app.auth import create_access_token, get_password_hash
+    from app.database import SessionLocal
+    from app.models import Booking, BookingStatus, Service, ServiceType, Testimonial, User, UserRole
+
+    db = SessionLocal()
+    try:
+        password = get_password_hash("password")
+        admin = User(email="admin@example.com", username="admin", full_name="Admin", hashed_password=password,
+                     role=UserRole.ADMIN, is_active=True, is_verified=True)
+        customer = User(email="customer@example.com", username="customer", full_name="Customer",
+                        hashed_password=password, role=UserRole.USER, is_active=True, is_verified=True)
+        services = [
+            Service(name=f"Service {i}", description="", service_type=service_type, price=100.0 * (i + 1))
+            for i, service_type in enumerate(list(ServiceType)[:3])
+        ]
+        db.add_all([admin, customer, *services])
+        db.flush()
+
+        statuses = list(BookingStatus)
+        for i in range(BOOKINGS):
+            db.add(Booking(
+                user_id=customer.id,
+                service_id=services[i % len(services)].id,
+                booking_date=datetime.now() + timedelta(days=i),
+                booking_time="10:00",
+                status=statuses[i % len(statuses)],
+                customer_name="Customer",
+                customer_email=customer.email,
+                customer_phone="5550100"
+            ))
+        for i in range(TESTIMONIALS):
+            db.add(Testimonial(user_id=customer.id, name="Customer", rating=5, content=f"Review {i}", is_approved=True))
+        db.commit()
+    finally:
+        db.close()
+
+    return {
+        "admin": {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"},
+        "customer": {"Authorization": f"Bearer {create_access_token({'sub': 'customer'})}"},
+        "bookings": BOOKINGS,
+        "testimonials": TESTIMONIALS,
+    }
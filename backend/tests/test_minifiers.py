@@ -0,0 +1,79 @@
+"""
+CSS/JS minifier tests (app.assets)
+"""
+
+import pytest
+
+from app.assets import minify_css, minify_js
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("a { color : red ; }", "a{color :red}"),
+    # A descendant :hover keeps its space, a:hover has none to drop
+    ("a :hover { color: red }", "a :hover{color:red}"),
+    ("a:hover{color:red}", "a:hover{color:red}"),
+    ("@media screen and (max-width: 600px) { .a { margin: 0 auto; } }",
+     "@media screen and (max-width:600px){.a{margin:0 auto}}"),
+    (".a > .b ~ .c , .d { top: 0 }", ".a>.b~.c,.d{top:0}"),
+])
+def test_minify_css(source, expected):
+    assert minify_css(source) == expected
+
+
+def test_minify_css_keeps_strings_urls_and_license_comments():
+    source = '/*! license */ .a { content: "  a  b "; background: url( "x y.png" ) } /* dropped */'
+    assert minify_css(source) == '/*! license */.a{content:"  a  b ";background:url("x y.png")}'
+
+
+@pytest.mark.parametrize("source, expected", [
+    # Line breaks that automatic semicolon insertion depends on are kept
+    ("let a = b\n(c)", "let a=b\n(c)"),
+    ("return\nx", "return\nx"),
+    ("a\n++b", "a\n++b"),
+    ("a = 1\nb = 2", "a=1\nb=2"),
+    # ... and the others dropped
+    ("a = 1;\nb = 2;", "a=1;b=2;"),
+    ("f(a,\n  b)", "f(a,b)"),
+    # Class fields named with private names
+    ("class A {\n  #a = 1\n  #b = 2\n}", "class A{#a=1\n#b=2}"),
+    ("class A { #a; m() { return this.#a } }", "class A{#a;m(){return this.#a}}"),
+])
+def test_minify_js_automatic_semicolon_insertion(source, expected):
+    assert minify_js(source) == expected
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("x = a / b / c", "x=a/b/c"),
+    ("x = (a) / 2 / (b)", "x=(a)/2/(b)"),
+    ("x = y++ / 2", "x=y++/2"),
+    ("x = a.replace(/\\/+ /g, '/')", "x=a.replace(/\\/+ /g,'/')"),
+    ("if (x) /a b/.test(y)", "if(x)/a b/.test(y)"),
+    ("t = typeof /a b/", "t=typeof/a b/"),
+    ("x = [/[/ ]/, 1]", "x=[/[/ ]/,1]"),
+])
+def test_minify_js_regex_versus_division(source, expected):
+    assert minify_js(source) == expected
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("x = 1 .toString()", "x=1 .toString()"),
+    ("x = 1_000 .toString()", "x=1_000 .toString()"),
+    ("x = 1.5 .toFixed(2)", "x=1.5.toFixed(2)"),
+    ("x = 0x1F .toString(16)", "x=0x1F.toString(16)"),
+    ("x = a . b", "x=a.b"),
+])
+def test_minify_js_member_access_on_numbers(source, expected):
+    assert minify_js(source) == expected
+
+
+def test_minify_js_keeps_operators_apart():
+    assert minify_js("a = b + +c; d = e - -f; g = h - --i") == "a=b+ +c;d=e- -f;g=h- --i"
+
+
+def test_minify_js_keeps_strings_templates_and_license_comments():
+    source = '/*! keep */\nvar s = "a  /* b */  c"; // dropped\nvar t = `x ${ {a: 1}.a } y`'
+    assert minify_js(source) == '/*! keep */ var s="a  /* b */  c";var t=`x ${ {a: 1}.a } y`'
+
+
+def test_minify_js_keeps_a_shebang_as_the_first_line():
+    assert minify_js("#!/usr/bin/env node\nvar x = 1") == "#!/usr/bin/env node\nvar x=1"
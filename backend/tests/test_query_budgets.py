@@ -0,0 +1,77 @@
+"""
+SQL statement budgets for the booking and admin endpoints
+
+The seeded database has bookings spread over several services, so a
+response that lazy-loads per row would blow these budgets.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize("user, path, max_queries", [
+    # One query for the current user, one for the rows
+    ("admin", "/api/bookings/", 2),
+    ("admin", "/api/bookings/?fields=summary", 2),
+    ("customer", "/api/bookings/my-bookings", 2),
+    ("admin", "/api/admin/bookings", 2),
+    ("admin", "/api/admin/bookings?fields=summary", 2),
+    ("admin", "/api/admin/reports/booking-summary", 2),
+    # The current user, nine counts, recent bookings and popular services
+    ("admin", "/api/admin/dashboard", 12),
+])
+def test_query_budget(client, seeded, query_budget, user, path, max_queries):
+    with query_budget(max_queries=max_queries):
+        response = client.get(path, headers=seeded[user])
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("user, path", [
+    ("admin", "/api/bookings/"),
+    ("customer", "/api/bookings/my-bookings"),
+    ("admin", "/api/admin/bookings"),
+])
+def test_booking_lists_return_every_row(client, seeded, user, path):
+    response = client.get(path, headers=seeded[user])
+    assert len(response.json()) == seeded["bookings"]
+    assert all(booking["service"]["name"] for booking in response.json())
+
+
+@pytest.mark.parametrize("user, path", [
+    ("admin", "/api/bookings/"),
+    ("customer", "/api/bookings/my-bookings"),
+    ("admin", "/api/bookings/1"),
+    ("admin", "/api/admin/bookings"),
+    ("admin", "/api/admin/dashboard"),
+    ("admin", "/api/admin/testimonials"),
+    (None, "/api/testimonials/"),
+    (None, "/api/testimonials/1"),
+])
+def test_loading_profiles_avoid_repeated_queries(client, seeded, query_budget, user, path):
+    """BOOKING_RESPONSE / TESTIMONIAL_RESPONSE (app.loading): no statement runs twice
+
+    A relationship the profile does not eager-load would be fetched once per
+    row; one raiseload'ed (Testimonial.user) fails the request if serialized.
+    """
+    with query_budget(max_repeats=1):
+        response = client.get(path, headers=seeded[user] if user else {})
+    assert response.status_code == 200
+
+
+def test_testimonial_list_does_not_load_users(client, seeded):
+    response = client.get("/api/testimonials/")
+    assert len(response.json()) == seeded["testimonials"]
+    assert all("user" not in testimonial for testimonial in response.json())
+
+
+def test_failed_statements_are_counted_and_release_their_timer(client, query_budget):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from app.database import engine
+
+    with query_budget() as budget, engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert not conn.info.get("query_started")
+        conn.execute(text("SELECT 1"))
+    assert budget.count == 2
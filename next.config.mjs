@@ -19,6 +19,11 @@ const nextConfig = {
         source: '/api/:path*',
         destination: `${apiUrl}/api/:path*`,
       },
+      {
+        // Optimized image variants generated by the backend image pipeline
+        source: '/static/optimized/:path*',
+        destination: `${apiUrl}/static/optimized/:path*`,
+      },
     ];
   },
   // Production optimizations - only apply in production
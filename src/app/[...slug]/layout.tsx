@@ -0,0 +1,26 @@
+import type { Metadata } from 'next';
+import JsonLd from '@/components/seo/JsonLd';
+import { seoResolveAPI, toMetadata } from '@/lib/api/seo-resolve';
+
+interface DynamicPageLayoutProps {
+  children: React.ReactNode;
+  params: { slug: string[] };
+}
+
+const pathFor = (params: { slug: string[] }) => `/${params.slug.join('/')}`;
+
+// The page itself renders on the client, so its meta tags and JSON-LD are resolved here on the server
+export async function generateMetadata({ params }: { params: { slug: string[] } }): Promise<Metadata> {
+  return toMetadata(await seoResolveAPI.resolve(pathFor(params)));
+}
+
+export default async function DynamicPageLayout({ children, params }: DynamicPageLayoutProps) {
+  const resolved = await seoResolveAPI.resolve(pathFor(params));
+
+  return (
+    <>
+      {resolved && <JsonLd schemas={resolved.schemas} />}
+      {children}
+    </>
+  );
+}
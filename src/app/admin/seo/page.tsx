@@ -159,6 +159,28 @@ export default function AdminSEOpage() {
     }
   };
 
+  const fetchSEOBatch = async (slugs: { pages?: string[]; blogs?: string[] }) => {
+    const empty = { pages: {} as Record<string, any>, blogs: {} as Record<string, any> };
+    try {
+      // Use relative path - will be proxied by Next.js rewrites
+      const response = await fetch('/api/seo/batch', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(slugs)
+      });
+
+      if (response.ok) {
+        return await response.json();
+      }
+    } catch (error) {
+      console.error('Failed to fetch SEO data');
+    }
+    return empty;
+  };
+
   const fetchPages = async () => {
     try {
       // Use relative path - will be proxied by Next.js rewrites
@@ -173,51 +195,24 @@ export default function AdminSEOpage() {
       if (response.ok) {
         const pagesData = await response.json();
 
-        // Fetch SEO data for each page
-        const pagesWithSEO = await Promise.all(
-          pagesData.map(async (page: any) => {
-            try {
-              // Use relative path - will be proxied by Next.js rewrites
-              const seoApiUrl = `/api/seo/page/${page.slug}`;
-
-              const seoResponse = await fetch(seoApiUrl, {
-                headers: {
-                  'Authorization': `Bearer ${token}`
-                }
-              });
-
-              let seoData = null;
-              if (seoResponse.ok) {
-                seoData = await seoResponse.json();
-              }
-
-              return {
-                id: page.id,
-                page_url: `/${page.slug}`,
-                title: seoData?.meta_title || page.title,
-                meta_description: seoData?.meta_description || '',
-                meta_keywords: seoData?.meta_keywords || '',
-                canonical_url: seoData?.canonical_url || `https://astroarupshastri.com/${page.slug}`,
-                schema_markup: seoData?.schema_markup || '',
-                is_published: page.is_published,
-                last_updated: page.updated_at || page.created_at
-              };
-            } catch (error) {
-              // Return page data without SEO
-              return {
-                id: page.id,
-                page_url: `/${page.slug}`,
-                title: page.title,
-                meta_description: '',
-                meta_keywords: '',
-                canonical_url: `https://astroarupshastri.com/${page.slug}`,
-                schema_markup: '',
-                is_published: page.is_published,
-                last_updated: page.updated_at || page.created_at
-              };
-            }
-          })
-        );
+        // Fetch SEO data for all pages in one batch request
+        const seoBatch = await fetchSEOBatch({ pages: pagesData.map((page: any) => page.slug) });
+
+        const pagesWithSEO = pagesData.map((page: any) => {
+          const seoData = seoBatch.pages[page.slug] || null;
+
+          return {
+            id: page.id,
+            page_url: `/${page.slug}`,
+            title: seoData?.meta_title || page.title,
+            meta_description: seoData?.meta_description || '',
+            meta_keywords: seoData?.meta_keywords || '',
+            canonical_url: seoData?.canonical_url || `https://astroarupshastri.com/${page.slug}`,
+            schema_markup: seoData?.schema_markup || '',
+            is_published: page.is_published,
+            last_updated: page.updated_at || page.created_at
+          };
+        });
 
         setPages(pagesWithSEO);
       }
@@ -240,53 +235,25 @@ export default function AdminSEOpage() {
       if (response.ok) {
         const blogsData = await response.json();
 
-        // Fetch SEO data for each blog
-        const blogsWithSEO = await Promise.all(
-          blogsData.map(async (blog: any) => {
-            try {
-              // Use relative path - will be proxied by Next.js rewrites
-              const seoApiUrl = `/api/seo/blog/${blog.slug}`;
-
-              const seoResponse = await fetch(seoApiUrl, {
-                headers: {
-                  'Authorization': `Bearer ${token}`
-                }
-              });
-
-              let seoData = null;
-              if (seoResponse.ok) {
-                seoData = await seoResponse.json();
-              }
-
-              return {
-                id: blog.id,
-                title: blog.title,
-                slug: blog.slug,
-                meta_title: seoData?.meta_title || `${blog.title} - AstroArupShastri`,
-                meta_description: seoData?.meta_description || blog.description.substring(0, 160),
-                meta_keywords: seoData?.meta_keywords || '',
-                canonical_url: seoData?.canonical_url || `https://astroarupshastri.com/blog/${blog.slug}`,
-                schema_markup: seoData?.schema_markup || '',
-                is_published: blog.is_published,
-                last_updated: blog.updated_at || blog.created_at
-              };
-            } catch (error) {
-              // Return blog data without SEO
-              return {
-                id: blog.id,
-                title: blog.title,
-                slug: blog.slug,
-                meta_title: `${blog.title} - AstroArupShastri`,
-                meta_description: blog.description.substring(0, 160),
-                meta_keywords: '',
-                canonical_url: `https://astroarupshastri.com/blog/${blog.slug}`,
-                schema_markup: '',
-                is_published: blog.is_published,
-                last_updated: blog.updated_at || blog.created_at
-              };
-            }
-          })
-        );
+        // Fetch SEO data for all blogs in one batch request
+        const seoBatch = await fetchSEOBatch({ blogs: blogsData.map((blog: any) => blog.slug) });
+
+        const blogsWithSEO = blogsData.map((blog: any) => {
+          const seoData = seoBatch.blogs[blog.slug] || null;
+
+          return {
+            id: blog.id,
+            title: blog.title,
+            slug: blog.slug,
+            meta_title: seoData?.meta_title || `${blog.title} - AstroArupShastri`,
+            meta_description: seoData?.meta_description || blog.description.substring(0, 160),
+            meta_keywords: seoData?.meta_keywords || '',
+            canonical_url: seoData?.canonical_url || `https://astroarupshastri.com/blog/${blog.slug}`,
+            schema_markup: seoData?.schema_markup || '',
+            is_published: blog.is_published,
+            last_updated: blog.updated_at || blog.created_at
+          };
+        });
 
         setBlogs(blogsWithSEO);
       }
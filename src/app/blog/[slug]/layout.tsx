@@ -0,0 +1,24 @@
+import type { Metadata } from 'next';
+import JsonLd from '@/components/seo/JsonLd';
+import { seoResolveAPI, toMetadata } from '@/lib/api/seo-resolve';
+
+interface BlogLayoutProps {
+  children: React.ReactNode;
+  params: { slug: string };
+}
+
+// The article renders on the client, so its meta tags and JSON-LD are resolved here on the server
+export async function generateMetadata({ params }: { params: { slug: string } }): Promise<Metadata> {
+  return toMetadata(await seoResolveAPI.resolve(`/blog/${params.slug}`));
+}
+
+export default async function BlogLayout({ children, params }: BlogLayoutProps) {
+  const resolved = await seoResolveAPI.resolve(`/blog/${params.slug}`);
+
+  return (
+    <>
+      {resolved && <JsonLd schemas={resolved.schemas} />}
+      {children}
+    </>
+  );
+}
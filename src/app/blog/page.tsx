@@ -30,7 +30,7 @@ export default function BlogPage() {
   useEffect(() => {
     const fetchBlogs = async () => {
       try {
-        const result = await apiClient.getBlogs();
+        const result = await apiClient.getBlogs('summary');
         if (result.success) {
           setBlogs(result.data as Blog[]);
         }
@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import { apiClient } from '../lib/api';
+import { ResponsiveImage, type ImageVariants } from './ResponsiveImage';
 
 interface Blog {
   id: number;
@@ -10,6 +11,7 @@ interface Blog {
   slug: string;
   description: string;
   featured_image?: string;
+  featured_image_variants?: ImageVariants | null;
   published_at: string;
   author_id: number;
   is_published?: boolean;
@@ -22,7 +24,7 @@ export function Blogs() {
   useEffect(() => {
     const fetchBlogs = async () => {
       try {
-        const result = await apiClient.getBlogs();
+        const result = await apiClient.getBlogs('summary');
         if (result.success && result.data) {
           const blogsData = Array.isArray(result.data) ? result.data : [];
           // Filter to only show published blogs and take first 3
@@ -80,9 +82,11 @@ export function Blogs() {
               <article className="bg-white rounded-2xl shadow-lg overflow-hidden hover:shadow-2xl transition-all duration-300 group cursor-pointer h-full flex flex-col">
                 <div className="relative overflow-hidden bg-gradient-to-br from-orange-200 to-red-300 h-48">
                   {blog.featured_image ? (
-                    <img
+                    <ResponsiveImage
                       src={blog.featured_image}
+                      variants={blog.featured_image_variants}
                       alt={blog.title}
+                      sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                       className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                     />
                   ) : (
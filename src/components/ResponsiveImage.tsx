@@ -0,0 +1,40 @@
+// Renders backend image variants (AVIF/WebP srcsets) with the original URL as fallback
+
+export interface ImageVariants {
+  src: string;
+  width: number;
+  height: number;
+  sizes: string;
+  sources: { type: string; srcset: string }[];
+}
+
+interface ResponsiveImageProps {
+  src: string;
+  alt: string;
+  variants?: ImageVariants | null;
+  sizes?: string;
+  className?: string;
+}
+
+export function ResponsiveImage({ src, alt, variants, sizes, className }: ResponsiveImageProps) {
+  if (!variants) {
+    return <img src={src} alt={alt} loading="lazy" decoding="async" className={className} />;
+  }
+
+  return (
+    <picture>
+      {variants.sources.map((source) => (
+        <source key={source.type} type={source.type} srcSet={source.srcset} sizes={sizes || variants.sizes} />
+      ))}
+      <img
+        src={variants.src}
+        alt={alt}
+        width={variants.width}
+        height={variants.height}
+        loading="lazy"
+        decoding="async"
+        className={className}
+      />
+    </picture>
+  );
+}
@@ -0,0 +1,18 @@
+interface JsonLdProps {
+  schemas: Record<string, unknown>[];
+}
+
+// JSON-LD script tags for schemas resolved on the server; "<" is escaped so content cannot close the tag
+export default function JsonLd({ schemas }: JsonLdProps) {
+  return (
+    <>
+      {schemas.map((schema, index) => (
+        <script
+          key={index}
+          type="application/ld+json"
+          dangerouslySetInnerHTML={{ __html: JSON.stringify(schema).replace(/</g, '\\u003c') }}
+        />
+      ))}
+    </>
+  );
+}
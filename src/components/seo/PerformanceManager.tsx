@@ -40,6 +40,13 @@ export default function PerformanceManager({ settings, token, onRefresh }: Perfo
     }
   };
 
+  const formatBytes = (bytes?: number) => {
+    if (bytes === undefined || bytes === null) return '-';
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / (1024 * 1024)).toFixed(2)} MB`;
+  };
+
   const runAudit = async () => {
     if (!token || !auditUrl) return;
     setAuditLoading(true);
@@ -365,14 +372,27 @@ export default function PerformanceManager({ settings, token, onRefresh }: Perfo
 
               <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
                 <div>
-                  <h5 className="font-semibold mb-2">Core Web Vitals</h5>
+                  <h5 className="font-semibold mb-2">Page Weight</h5>
                   <div className="space-y-2 text-sm">
-                    <div>Load Time: {auditResults.load_time}ms</div>
-                    <div>First Contentful Paint: {auditResults.first_contentful_paint}ms</div>
-                    <div>Largest Contentful Paint: {auditResults.largest_contentful_paint}ms</div>
-                    <div>Cumulative Layout Shift: {auditResults.cumulative_layout_shift}</div>
-                    <div>First Input Delay: {auditResults.first_input_delay}ms</div>
+                    <div>Load Time: {auditResults.load_time}ms (TTFB {auditResults.ttfb}ms)</div>
+                    <div>Total Transfer: {formatBytes(auditResults.total_transfer_size)} in {auditResults.request_count} requests</div>
+                    <div>Images: {formatBytes(auditResults.image_weight)}</div>
+                    <div>Scripts: {formatBytes(auditResults.script_weight)}</div>
+                    <div>Stylesheets: {formatBytes(auditResults.stylesheet_weight)}</div>
+                    <div>Render-blocking Resources: {auditResults.render_blocking_count}</div>
                   </div>
+                  {auditResults.regressions?.length > 0 && (
+                    <div className="mt-4">
+                      <h5 className="font-semibold mb-2 text-red-700">Regressions Since Last Audit</h5>
+                      <div className="space-y-1 text-sm text-red-700">
+                        {auditResults.regressions.map((regression: any) => (
+                          <div key={regression.metric}>
+                            {regression.metric.replace(/_/g, ' ')}: {regression.previous} → {regression.current}
+                          </div>
+                        ))}
+                      </div>
+                    </div>
+                  )}
                 </div>
                 <div>
                   <h5 className="font-semibold mb-2">Recommendations</h5>
@@ -383,7 +403,7 @@ export default function PerformanceManager({ settings, token, onRefresh }: Perfo
                         rec.type === 'warning' ? 'bg-yellow-100 text-yellow-800' :
                         'bg-blue-100 text-blue-800'
                       }`}>
-                        {rec.message}
+                        {rec.message}{rec.count ? ` (${rec.count})` : ''}
                       </div>
                     ))}
                   </div>
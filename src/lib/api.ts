@@ -336,8 +336,9 @@ class ApiClient {
   }
 
   // Blogs endpoints
-  async getBlogs() {
-    return this.request('/blogs/');
+  // fields: comma-separated field names or 'summary' (everything except the content HTML)
+  async getBlogs(fields?: string) {
+    return this.request(fields ? `/blogs/?fields=${encodeURIComponent(fields)}` : '/blogs/');
   }
 
   async getBlog(id: number) {
@@ -17,13 +17,31 @@ export interface PerformanceSettings {
   updated_at?: string;
 }
 
+export interface PerformanceRegression {
+  metric: string;
+  previous: number;
+  current: number;
+}
+
 export interface PerformanceReport {
+  id?: number;
+  run_id?: string;
   page_url: string;
+  status_code?: number;
   load_time: number;
-  first_contentful_paint: number;
-  largest_contentful_paint: number;
-  cumulative_layout_shift: number;
-  first_input_delay: number;
+  ttfb?: number;
+  html_size?: number;
+  total_transfer_size?: number;
+  image_weight?: number;
+  script_weight?: number;
+  stylesheet_weight?: number;
+  request_count?: number;
+  render_blocking_count?: number;
+  // Paint timings are not measured by the fetch-based audit
+  first_contentful_paint: number | null;
+  largest_contentful_paint: number | null;
+  cumulative_layout_shift: number | null;
+  first_input_delay: number | null;
   performance_score: number;
   accessibility_score: number;
   best_practices_score: number;
@@ -32,12 +50,16 @@ export interface PerformanceReport {
     type: 'error' | 'warning' | 'info';
     message: string;
     impact: 'high' | 'medium' | 'low';
+    count?: number;
+    urls?: string[];
   }>;
+  regressions?: PerformanceRegression[];
   mobile_performance: {
     load_time: number;
     performance_score: number;
     is_mobile_friendly: boolean;
-  };
+  } | null;
+  created_at?: string;
 }
 
 export const seoPerformanceAPI = {
@@ -187,10 +209,9 @@ export const seoPerformanceAPI = {
       description: string;
       severity: 'error' | 'warning';
     }>;
-    screenshots: {
-      desktop: string;
-      mobile: string;
-    };
+    load_time: number;
+    performance_score: number;
+    total_transfer_size: number;
   }> => {
     const response = await fetch(`${API_BASE_URL}/performance/mobile-test`, {
       method: 'POST',
@@ -208,6 +229,40 @@ export const seoPerformanceAPI = {
     return response.json();
   },
 
+  // Get historical reports for a page, newest first
+  getHistory: async (token: string, pageUrl: string): Promise<PerformanceReport[]> => {
+    const response = await fetch(`${API_BASE_URL}/performance/history/${encodeURIComponent(pageUrl)}`, {
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json'
+      }
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch performance history');
+    }
+
+    return response.json();
+  },
+
+  // Audit the home page plus every published page and blog post
+  runSiteAudit: async (token: string): Promise<{run_id: string, base_url: string, reports: PerformanceReport[], regression_count: number}> => {
+    const response = await fetch(`${API_BASE_URL}/performance/audit`, {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ all_pages: true })
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to run site audit');
+    }
+
+    return response.json();
+  },
+
   // Get performance recommendations
   getRecommendations: async (token: string, pageUrl: string): Promise<Array<{
     category: 'performance' | 'accessibility' | 'seo' | 'best_practices';
@@ -145,12 +145,11 @@ export const seoRedirectsAPI = {
     return response.json();
   },
 
-  // Export redirects
+  // Export redirects (the backend streams the file; hand back an object URL for download)
   export: async (token: string, format: 'csv' | 'json' = 'csv'): Promise<{download_url: string}> => {
     const response = await fetch(`${API_BASE_URL}/redirects/export?format=${format}`, {
       headers: {
-        'Authorization': `Bearer ${token}`,
-        'Content-Type': 'application/json'
+        'Authorization': `Bearer ${token}`
       }
     });
     
@@ -158,6 +157,36 @@ export const seoRedirectsAPI = {
       throw new Error('Failed to export redirects');
     }
     
+    const blob = await response.blob();
+    return { download_url: URL.createObjectURL(blob) };
+  },
+
+  // Bulk import redirects from a CSV, JSON or NDJSON file (streamed and upserted server-side)
+  bulkImportFile: async (token: string, file: File): Promise<{
+    success_count: number;
+    created_count: number;
+    updated_count: number;
+    failed_count: number;
+    errors: Array<{
+      row: number;
+      error: string;
+    }>;
+  }> => {
+    const formData = new FormData();
+    formData.append('file', file);
+
+    const response = await fetch(`${API_BASE_URL}/redirects/bulk-import/file`, {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${token}`
+      },
+      body: formData
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to bulk import redirects');
+    }
+
     return response.json();
   },
 
@@ -0,0 +1,168 @@
+// SEO Resolve API - public per-path meta + JSON-LD lookup used while rendering pages
+import type { Metadata } from 'next';
+
+const API_BASE_URL = 'https://astroarupshastri.com/api/seo';
+
+// How long a cached entry is served without revalidating against the backend
+const FRESH_MS = 60 * 1000;
+const MAX_ENTRIES = 1000;
+
+export interface ResolvedSEOMeta {
+  title: string | null;
+  meta_description: string | null;
+  meta_keywords: string | null;
+  canonical_url: string | null;
+  robots: string | null;
+  og_title: string | null;
+  og_description: string | null;
+  og_image: string | null;
+}
+
+export interface ResolvedSEO {
+  path: string;
+  meta: ResolvedSEOMeta | null;
+  schemas: Record<string, unknown>[];
+  etag: string;
+  version: number;
+}
+
+export interface SEORecord {
+  id: number;
+  page_id: number | null;
+  blog_id: number | null;
+  meta_title: string | null;
+  meta_description: string | null;
+  meta_keywords: string | null;
+  og_title: string | null;
+  og_description: string | null;
+  og_image: string | null;
+  canonical_url: string | null;
+  schema_markup: string | null;
+  created_at: string;
+  updated_at: string | null;
+}
+
+export interface SEOBatchResult {
+  pages: Record<string, SEORecord | null>;
+  blogs: Record<string, SEORecord | null>;
+}
+
+// Slugs per request for each of pages/blogs; together they stay under SEO_BATCH_MAX_SLUGS on the backend
+const BATCH_SIZE = 500;
+
+interface CacheEntry {
+  etag: string;
+  data: ResolvedSEO;
+  fetchedAt: number;
+}
+
+const cache = new Map<string, CacheEntry>();
+
+const normalizePath = (path: string): string => {
+  const clean = path.split('?')[0].split('#')[0];
+  const withSlash = clean.startsWith('/') ? clean : `/${clean}`;
+  return withSlash.length > 1 ? withSlash.replace(/\/+$/, '') : withSlash;
+};
+
+export const seoResolveAPI = {
+  // Resolve SEO data for a path; fresh entries skip the network, stale ones revalidate with If-None-Match
+  resolve: async (path: string): Promise<ResolvedSEO | null> => {
+    const key = normalizePath(path);
+    const cached = cache.get(key);
+
+    if (cached && Date.now() - cached.fetchedAt < FRESH_MS) {
+      return cached.data;
+    }
+
+    try {
+      const response = await fetch(`${API_BASE_URL}/resolve?path=${encodeURIComponent(key)}`, {
+        headers: cached ? { 'If-None-Match': `"${cached.etag}"` } : {},
+        // Freshness is handled by the cache above, not Next's data cache
+        cache: 'no-store'
+      });
+
+      if (response.status === 304 && cached) {
+        cached.fetchedAt = Date.now();
+        return cached.data;
+      }
+
+      if (!response.ok) {
+        return cached ? cached.data : null;
+      }
+
+      const data: ResolvedSEO = await response.json();
+      cache.delete(key);
+      cache.set(key, { etag: data.etag, data, fetchedAt: Date.now() });
+      if (cache.size > MAX_ENTRIES) {
+        const oldest = cache.keys().next().value;
+        if (oldest !== undefined) {
+          cache.delete(oldest);
+        }
+      }
+      return data;
+    } catch {
+      return cached ? cached.data : null;
+    }
+  },
+
+  // Fetch SEO records for many page/blog slugs, e.g. for the whole site during a static build
+  batch: async (slugs: { pages?: string[]; blogs?: string[] }): Promise<SEOBatchResult> => {
+    const result: SEOBatchResult = { pages: {}, blogs: {} };
+    const pages = slugs.pages || [];
+    const blogs = slugs.blogs || [];
+
+    for (let offset = 0; offset < Math.max(pages.length, blogs.length); offset += BATCH_SIZE) {
+      const response = await fetch(`${API_BASE_URL}/batch`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+          pages: pages.slice(offset, offset + BATCH_SIZE),
+          blogs: blogs.slice(offset, offset + BATCH_SIZE)
+        })
+      });
+
+      if (!response.ok) {
+        throw new Error('Failed to fetch SEO data batch');
+      }
+
+      const data: SEOBatchResult = await response.json();
+      Object.assign(result.pages, data.pages);
+      Object.assign(result.blogs, data.blogs);
+    }
+
+    return result;
+  },
+
+  // Drop cached entries, e.g. after saving SEO data from the admin UI
+  invalidate: (path?: string): void => {
+    if (path) {
+      cache.delete(normalizePath(path));
+    } else {
+      cache.clear();
+    }
+  }
+};
+
+// Next.js metadata for a resolved path; unset fields are left to the parent layout
+export const toMetadata = (resolved: ResolvedSEO | null): Metadata => {
+  const meta = resolved?.meta;
+  if (!meta) {
+    return {};
+  }
+
+  const metadata: Metadata = {};
+  if (meta.title) metadata.title = meta.title;
+  if (meta.meta_description) metadata.description = meta.meta_description;
+  if (meta.meta_keywords) metadata.keywords = meta.meta_keywords;
+  if (meta.canonical_url) metadata.alternates = { canonical: meta.canonical_url };
+  if (meta.robots) metadata.robots = meta.robots;
+  if (meta.og_title || meta.og_description || meta.og_image) {
+    metadata.openGraph = {};
+    if (meta.og_title) metadata.openGraph.title = meta.og_title;
+    if (meta.og_description) metadata.openGraph.description = meta.og_description;
+    if (meta.og_image) metadata.openGraph.images = [meta.og_image];
+  }
+  return metadata;
+};